@@ -1,14 +1,127 @@
 """
 Project entry point for mentor matching optimization.
+
+Unified CLI over the pipeline stages:
+
+    python main.py ingest      # workbooks → cleaned parquet, IPOD FUN artifact
+    python main.py clean       # participant IDs, codes and entity cleanup
+    python main.py features    # UTSA5 domain vectors
+    python main.py score       # mentor/mentee domain scoring
+    python main.py solve       # matching optimization (default)
+    python main.py serve       # local JSON API (src.service)
+
+Heavy dependencies (pandas, numpy, scikit-learn, cudf) are imported only
+inside the stage that needs them, so `--help` and config-only runs start
+instantly; GPU readers fall back to CPU when cudf is unavailable.
+
+The config is parsed and validated once (src.config) before any stage
+runs, so a typo'd key or unknown solver fails immediately.
 """
 
-from src.model import run_optimization
-from src.utils import load_config
+import argparse
+import os
+import sys
+
+DEFAULT_CONFIG = "config/default.yaml"
+
+# Stage → pipeline scripts run in order (as `python -m scripts.<name>`).
+STAGE_SCRIPTS = {
+    "ingest": ["ingest_mentor_student_xlsx", "ipod_build_fun_artifact_hybrid"],
+    "clean": ["clean_and_assign_ids", "final_clean_entities"],
+    "features": ["ipod_build_utsa5_domain_vectors"],
+    "score": ["mentor_ipod_domain_scoring", "score_first5_mentees_utsa5"],
+}
+
+
+def run_scripts(stage: str, only=None) -> None:
+    import runpy
+
+    from src.utils import span
+
+    names = STAGE_SCRIPTS[stage]
+    if only:
+        unknown = set(only) - set(names)
+        if unknown:
+            raise SystemExit(f"Unknown {stage} step(s) {sorted(unknown)}. Choose from: {names}")
+        names = [n for n in names if n in only]
+
+    for name in names:
+        print(f"\n=== {stage}: {name} ===")
+        with span(f"main.{stage}.{name}"):
+            runpy.run_module(f"scripts.{name}", run_name="__main__", alter_sys=True)
+
+
+def cmd_stage(args, cfg) -> None:
+    run_scripts(args.command, args.only)
+
+
+def cmd_solve(args, cfg) -> None:
+    from src.config import ConfigError, parse_config
+    from src.model import run_optimization
+    from src.utils import span
+
+    overrides = {k: v for k, v in (("solver", args.solver), ("workers", args.workers)) if v is not None}
+    if overrides:
+        # Re-validate so a bad --solver fails like a bad config value.
+        raw = {**cfg.raw, "optimize": {**(cfg.raw.get("optimize") or {}), **overrides}}
+        try:
+            cfg = parse_config(raw, cfg.source)
+        except ConfigError as exc:
+            raise SystemExit(f"Invalid option: {exc}")
+
+    with span("main.run_optimization"):
+        run_optimization(cfg)
+
+
+def cmd_serve(args, cfg) -> None:
+    from src.service import serve
+
+    serve(cfg, host=args.host, port=args.port)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Mentor matching optimization pipeline.")
+    p.add_argument("--config", default=os.environ.get("MENTOR_CONFIG", DEFAULT_CONFIG),
+                   help=f"YAML config (default: $MENTOR_CONFIG or {DEFAULT_CONFIG}).")
+    sub = p.add_subparsers(dest="command", metavar="COMMAND")
+
+    for stage, scripts in STAGE_SCRIPTS.items():
+        sp = sub.add_parser(stage, help=f"Run the {stage} stage: {', '.join(scripts)}.")
+        sp.add_argument("--only", nargs="+", metavar="STEP", help="Run only these steps.")
+        sp.set_defaults(func=cmd_stage)
+
+    sp = sub.add_parser("solve", help="Solve the matching (optimize section of the config).")
+    sp.add_argument("--solver", help="Override optimize.solver.")
+    sp.add_argument("--workers", type=int, help="Override optimize.workers.")
+    sp.set_defaults(func=cmd_solve)
+
+    sp = sub.add_parser("serve", help="Serve the local JSON API.")
+    sp.add_argument("--host")
+    sp.add_argument("--port", type=int)
+    sp.set_defaults(func=cmd_serve)
+
+    args = p.parse_args(argv)
+    if args.command is None:
+        # Bare `python main.py` keeps its original meaning.
+        args = p.parse_args([*(argv if argv is not None else sys.argv[1:]), "solve"])
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from src.config import ConfigError, get_config
+    from src.utils import configure_instrumentation
 
+    # Scripts pick the same config up through get_config() / get_tracer().
+    os.environ["MENTOR_CONFIG"] = args.config
+    try:
+        cfg = get_config(args.config)
+    except ConfigError as exc:
+        raise SystemExit(f"Invalid config {args.config}: {exc}")
+    configure_instrumentation(cfg.raw)
 
-def main():
-    cfg = load_config("config/default.yaml")
-    run_optimization(cfg)
+    args.func(args, cfg)
 
 
 if __name__ == "__main__":
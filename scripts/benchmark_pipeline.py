@@ -0,0 +1,104 @@
+"""
+Benchmark the matching pipeline on synthetic cohorts.
+
+Times cost build, D_idf, TF-IDF scoring, Hungarian, min-cost-flow,
+MILP, the auction solver, stable matching and bottleneck assignment at
+each requested scale and writes a JSON results file tagged with the
+current git commit, so regressions can be compared across commits.
+
+Run from the repo root:
+    python -m scripts.benchmark_pipeline --participants 100 1000 10000 --degrees 17 300 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import scipy
+
+from src.analyze.benchmark import STAGES, run_benchmarks
+
+OUT_DIR = Path("outputs/benchmarks")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--participants", type=int, nargs="+", default=[100, 1000, 5000])
+    p.add_argument("--degrees", type=int, nargs="+", default=[17, 300, 1000],
+                   help="Degree count per scale (paired with --participants).")
+    p.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    p.add_argument("--warmup", type=int, default=1)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--max-participants", nargs="*", default=[], metavar="STAGE=N",
+                   help="Override the per-stage size cap, e.g. milp=400.")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=Path, default=None)
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if len(args.participants) != len(args.degrees):
+        raise SystemExit("--participants and --degrees must have the same length.")
+
+    caps = {}
+    for item in args.max_participants:
+        stage, _, n = item.partition("=")
+        caps[stage] = int(n)
+
+    commit = git_commit()
+    started = datetime.now(timezone.utc)
+
+    print(f"Benchmarking commit {commit}")
+    records = run_benchmarks(
+        args.participants,
+        args.degrees,
+        stages=args.stages,
+        warmup=args.warmup,
+        repeat=args.repeat,
+        max_participants=caps,
+        seed=args.seed,
+    )
+
+    result = {
+        "meta": {
+            "commit": commit,
+            "started_utc": started.isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": records,
+    }
+
+    out = args.out or OUT_DIR / f"bench_{commit}_{started:%Y%m%dT%H%M%SZ}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2))
+    print(f"\nWrote: {out.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
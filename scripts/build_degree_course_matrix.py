@@ -0,0 +1,91 @@
+"""
+Build the degree–course incidence matrix X and course weights w from the
+crawled undergraduate catalog.
+
+Crawls the catalog (data.base_url, crawl rules from the config), saves
+the course records, then extracts course codes and writes X, w and the
+degree/course labels in one pass. Programs (the inventory page slugs)
+are mapped to the degree dictionary / D labels where they resolve.
+
+Run from the repo root:
+    python -m scripts.build_degree_course_matrix                  # crawl + build
+    python -m scripts.build_degree_course_matrix --from-records   # rebuild only
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Dict
+
+import pandas as pd
+
+from src.analyze.degree_matrix import build_degree_course_matrix
+from src.clean.entity_resolution import EntityResolver, degree_aliases
+from src.config import get_config
+
+CFG = get_config()
+
+RECORDS_PATH = CFG.paths.catalog_courses
+OUT_PATH = CFG.paths.degree_course_matrix
+DEGREE_DICTIONARY = CFG.paths.degree_dictionary
+DEGREE_DISTANCE = CFG.paths.degree_distance
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--from-records", action="store_true",
+                   help=f"Skip the crawl and rebuild from {RECORDS_PATH}.")
+    return p.parse_args()
+
+
+def program_labels(programs: pd.Series) -> Dict[str, str]:
+    """
+    Program slug → degree label via the degree resolver over the degree
+    dictionary and/or D's labels; empty when neither exists yet.
+    """
+    dictionary = pd.read_parquet(DEGREE_DICTIONARY) if DEGREE_DICTIONARY.exists() else None
+    labels = pd.read_parquet(DEGREE_DISTANCE).index if DEGREE_DISTANCE.exists() else None
+    if labels is None and dictionary is None:
+        print(f"No {DEGREE_DICTIONARY} or {DEGREE_DISTANCE}: degrees keep their program names.")
+        return {}
+
+    resolver = EntityResolver(
+        degree_aliases(labels, dictionary),
+        min_confidence=CFG.clean.min_confidence,
+        min_margin=CFG.clean.min_margin,
+        min_fuzzy_length=CFG.clean.min_fuzzy_length,
+        block_size=CFG.compute.similarity_block_size,
+    )
+    uniq = pd.Series(programs.dropna().astype(str).unique(), dtype=object)
+    res = resolver.resolve(uniq.str.replace("-", " ", regex=False))
+    mapped = res["label"].notna().to_numpy()
+    print(f"Programs mapped to degree labels: {int(mapped.sum())}/{len(uniq)}")
+    return dict(zip(uniq[mapped], res.loc[mapped, "label"]))
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.from_records:
+        if not RECORDS_PATH.exists():
+            raise FileNotFoundError(f"Missing course records: {RECORDS_PATH.resolve()}")
+        records = pd.read_parquet(RECORDS_PATH)
+    else:
+        from src.ingest.utsa_undergraduate_crawler import crawl_undergraduate_catalog
+
+        records = pd.DataFrame(crawl_undergraduate_catalog(CFG))
+        RECORDS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        records.to_parquet(RECORDS_PATH, index=False)
+        print("Saved course records:", RECORDS_PATH.resolve())
+
+    print("Course records:", len(records))
+
+    m = build_degree_course_matrix(records, degree_labels=program_labels(records["program"]))
+    m.save(OUT_PATH)
+
+    print(f"X: {m.shape[0]} degrees × {m.shape[1]} courses, nnz={m.X.nnz}")
+    print("Saved:", OUT_PATH.resolve())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,134 @@
-from pathlib import Path
+import sys
+from typing import Optional
+
 import pandas as pd
 
-BASE = Path("data/cleaned")
+from src.clean.encoding import CodeBook, degree_codebook, encode_columns
+from src.clean.entity_resolution import EntityResolver, code_aliases, degree_aliases
+from src.config import get_config
+from src.utils import file_size, span
+
+CFG = get_config()
+
+STUDENT_IN = CFG.paths.student_clean
+MENTOR_IN = CFG.paths.mentor_clean
+
+STUDENT_OUT = CFG.paths.student_ids
+MENTOR_OUT = CFG.paths.mentor_ids
+
+# Shared code → label maps for the encoded ID/degree columns.
+CODEBOOK_OUT = CFG.paths.codebook
+
+# Canonical degrees: dictionary names and the degree distance labels. Both
+# are written by the notebook (Appendix A.2 / D_idf); without either, IDs
+# are only normalized exactly (i1_ → i01) and names are not resolved.
+DEGREE_DICTIONARY = CFG.paths.degree_dictionary
+DEGREE_DISTANCE = CFG.paths.degree_distance
+RESOLUTION_CACHE = CFG.cache.entity_resolution
+
+
+def zero_pad_ids(prefix: str, count: int) -> pd.Series:
+    # prefix + 01, 02, ... count.
+    return prefix + pd.Series(range(1, count + 1)).astype(str).str.zfill(2)
+
+
+def degree_resolver(labels: Optional[pd.Index]) -> EntityResolver:
+    """
+    Fuzzy resolver over the degree dictionary and/or D's labels. On a fresh
+    pipeline (neither exists yet) it falls back to exact-key resolution of
+    the observed IDs, the former regex repair: i1_ → i01, names untouched.
+    """
+    dictionary = pd.read_parquet(DEGREE_DICTIONARY) if DEGREE_DICTIONARY.exists() else None
+    if labels is None and dictionary is None:
+        print(f"No {DEGREE_DICTIONARY} or {DEGREE_DISTANCE}: degree IDs are normalized exactly, "
+              "names are not resolved.")
+        observed = pd.concat([
+            pd.read_parquet(STUDENT_IN, columns=["standardized_major_id"]).iloc[:, 0],
+            pd.read_parquet(MENTOR_IN, columns=["standardized_degree"]).iloc[:, 0],
+        ])
+        return EntityResolver(code_aliases(observed), min_fuzzy_length=sys.maxsize)
+    return EntityResolver(
+        degree_aliases(labels, dictionary),
+        min_confidence=CFG.clean.min_confidence,
+        min_margin=CFG.clean.min_margin,
+        min_fuzzy_length=CFG.clean.min_fuzzy_length,
+        cache_path=RESOLUTION_CACHE,
+        block_size=CFG.compute.similarity_block_size,
+    )
 
-STUDENT_IN = BASE / "student_clean.parquet"
-MENTOR_IN = BASE / "mentor_clean.parquet"
 
-STUDENT_OUT = BASE / "student_clean_ids.parquet"
-MENTOR_OUT = BASE / "mentor_clean_ids.parquet"
+def resolve_degrees(df: pd.DataFrame, col: str, text_col: str, resolver: EntityResolver) -> pd.DataFrame:
+    """
+    Replace `col` with its canonical degree label, falling back to the
+    free-text `text_col` where the ID does not resolve. Unresolved rows
+    keep their original value; <col>_confidence and <col>_method record
+    how each row was matched.
+    """
+    res = resolver.resolve(df[col])
+    if text_col in df.columns:
+        retry = res["label"].isna()
+        if retry.any():
+            res = pd.concat([res[~retry], resolver.resolve(df.loc[retry, text_col])]).loc[df.index]
 
+    df[col] = res["label"].fillna(df[col].astype(str)).astype(str)
+    df[f"{col}_confidence"] = res["confidence"].where(res["label"].notna(), 0.0).astype("float32")
+    df[f"{col}_method"] = res["method"]
 
-def zero_pad(prefix: str, n: int) -> str:
-    return f"{prefix}{n:02d}"
+    unresolved = df.loc[res["label"].isna(), col]
+    if len(unresolved):
+        print(f"Unresolved {col}: {len(unresolved)} rows, values {sorted(unresolved.unique())[:10]}")
+    return df
 
 
 def main():
+    # Degree codes are D's row/column positions when D exists; labels not
+    # in D are appended after them.
+    labels = pd.read_parquet(DEGREE_DISTANCE).index if DEGREE_DISTANCE.exists() else None
+    codebook = degree_codebook(labels) if labels is not None else CodeBook()
+    resolver = degree_resolver(labels)
+
     # -----------------------
     # Students
     # -----------------------
-    students = pd.read_parquet(STUDENT_IN).copy()
+    with span("clean.assign_ids.students", bytes_read=file_size(STUDENT_IN)) as s:
+        students = pd.read_parquet(STUDENT_IN).copy()
 
-    students.insert(
-        0,
-        "student_id",
-        [zero_pad("s", i + 1) for i in range(len(students))]
-    )
+        students.insert(0, "student_id", zero_pad_ids("s", len(students)).to_numpy())
 
-    # Standardize domain IDs: i1_ → i01
-    students["standardized_major_id"] = (
-        students["standardized_major_id"]
-        .astype(str)
-        .str.replace("_", "", regex=False)
-        .str.replace(r"^i(\d)$", r"i0\1", regex=True)
-    )
+        # Resolve major IDs (i1_ → i01) or, failing that, the major name
+        students = resolve_degrees(students, "standardized_major_id", "standardized_major", resolver)
 
-    students.to_parquet(STUDENT_OUT, index=False)
+        # Dictionary-encode IDs and degrees (categorical + int32 code)
+        students = encode_columns(
+            students,
+            {"student_id": "student_id", "standardized_major_id": "degree"},
+            codebook,
+        )
+
+        students.to_parquet(STUDENT_OUT, index=False)
+        s.add(rows=len(students), bytes_written=file_size(STUDENT_OUT))
 
     # -----------------------
     # Mentors
     # -----------------------
-    mentors = pd.read_parquet(MENTOR_IN).copy()
+    with span("clean.assign_ids.mentors", bytes_read=file_size(MENTOR_IN)) as s:
+        mentors = pd.read_parquet(MENTOR_IN).copy()
 
-    mentors.insert(
-        0,
-        "mentor_id",
-        [zero_pad("m", i + 1) for i in range(len(mentors))]
-    )
+        mentors.insert(0, "mentor_id", zero_pad_ids("m", len(mentors)).to_numpy())
 
-    mentors["standardized_degree"] = (
-        mentors["standardized_degree"]
-        .astype(str)
-        .str.replace("_", "", regex=False)
-        .str.replace(r"^i(\d)$", r"i0\1", regex=True)
-    )
+        mentors = resolve_degrees(mentors, "standardized_degree", "1st Degree", resolver)
+
+        mentors = encode_columns(
+            mentors,
+            {"mentor_id": "mentor_id", "standardized_degree": "degree"},
+            codebook,
+        )
+
+        mentors.to_parquet(MENTOR_OUT, index=False)
+        s.add(rows=len(mentors), bytes_written=file_size(MENTOR_OUT))
 
-    mentors.to_parquet(MENTOR_OUT, index=False)
+    codebook.save(CODEBOOK_OUT)
+    resolver.save()
 
     # -----------------------
     # Sanity check
@@ -64,6 +138,10 @@ def main():
     print("\nStudent IDs:", students["student_id"].head().tolist())
     print("Mentor IDs :", mentors["mentor_id"].head().tolist())
     print("Domain IDs :", students["standardized_major_id"].unique()[:5])
+    print("Major resolution :", students["standardized_major_id_method"].value_counts().to_dict())
+    print("Degree resolution:", mentors["standardized_degree_method"].value_counts().to_dict())
+    print("Degree vocabulary:", len(codebook.labels("degree")), "labels")
+    print("Codebook  :", CODEBOOK_OUT)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,14 @@
-from pathlib import Path
 import pandas as pd
 import numpy as np
 import re
 
-BASE = Path("data/cleaned")
+from src.config import get_config
+from src.utils import file_size, span
 
-STUDENT_PATH = BASE / "student_clean_ids.parquet"
-MENTOR_PATH  = BASE / "mentor_clean_ids.parquet"
+CFG = get_config()
+
+STUDENT_PATH = CFG.paths.student_ids
+MENTOR_PATH  = CFG.paths.mentor_ids
 
 
 def normalize_strings(df: pd.DataFrame) -> pd.DataFrame:
@@ -30,18 +32,22 @@ def main():
     # ------------------
     # Students
     # ------------------
-    students = pd.read_parquet(STUDENT_PATH)
-    students = normalize_strings(students)
+    with span("clean.entities.students", bytes_read=file_size(STUDENT_PATH)) as s:
+        students = pd.read_parquet(STUDENT_PATH)
+        students = normalize_strings(students)
 
-    students.to_parquet(STUDENT_PATH, index=False)
+        students.to_parquet(STUDENT_PATH, index=False)
+        s.add(rows=len(students), bytes_written=file_size(STUDENT_PATH))
 
     # ------------------
     # Mentors
     # ------------------
-    mentors = pd.read_parquet(MENTOR_PATH)
-    mentors = normalize_strings(mentors)
+    with span("clean.entities.mentors", bytes_read=file_size(MENTOR_PATH)) as s:
+        mentors = pd.read_parquet(MENTOR_PATH)
+        mentors = normalize_strings(mentors)
 
-    mentors.to_parquet(MENTOR_PATH, index=False)
+        mentors.to_parquet(MENTOR_PATH, index=False)
+        s.add(rows=len(mentors), bytes_written=file_size(MENTOR_PATH))
 
     # ------------------
     # Sanity checks
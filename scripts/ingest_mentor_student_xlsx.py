@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from pathlib import Path
 import re
 import pandas as pd
 
-IN_PATH = Path("data/raw/Mentor_Student.xlsx")
-OUT_STUD = Path("data/cleaned/student_clean.parquet")
-OUT_MENT = Path("data/cleaned/mentor_clean.parquet")
+from src.config import get_config
+from src.ingest.workbook import read_workbook
+from src.utils import file_size, span
+
+CFG = get_config()
+
+IN_PATH = CFG.paths.mentor_student_xlsx
+OUT_STUD = CFG.paths.student_clean
+OUT_MENT = CFG.paths.mentor_clean
 
 def clean_columns(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
@@ -22,8 +27,11 @@ def main() -> None:
     if not IN_PATH.exists():
         raise FileNotFoundError(f"Missing: {IN_PATH.resolve()}")
 
-    student = pd.read_excel(IN_PATH, sheet_name="Student")
-    mentor = pd.read_excel(IN_PATH, sheet_name="Mentor")
+    # One workbook open for both sheets; served from the Parquet mirror
+    # when the workbook is unchanged since the last run.
+    sheets = read_workbook(IN_PATH, ["Student", "Mentor"], cache_dir=CFG.cache.excel_dir)
+    student = sheets["Student"]
+    mentor = sheets["Mentor"]
 
     student = clean_columns(student)
     mentor = clean_columns(mentor)
@@ -54,8 +62,10 @@ def main() -> None:
         mentor["degree_count"] = mentor[present].notna().sum(axis=1)
 
     OUT_STUD.parent.mkdir(parents=True, exist_ok=True)
-    student.to_parquet(OUT_STUD, index=False)
-    mentor.to_parquet(OUT_MENT, index=False)
+    with span("ingest.write_parquet", rows=len(student) + len(mentor)) as s:
+        student.to_parquet(OUT_STUD, index=False)
+        mentor.to_parquet(OUT_MENT, index=False)
+        s.add(bytes_written=file_size(OUT_STUD) + file_size(OUT_MENT))
 
     print("Wrote:")
     print(" ", OUT_STUD.resolve())
@@ -1,7 +1,8 @@
 """
 Build IPOD FUN-token artifact (hybrid GPU+CPU).
 
-- GPU (cuDF): fast CSV ingest
+- GPU (cuDF) when available: fast CSV ingest; falls back to pandas on
+  CPU-only nodes (see src.ingest.backends)
 - CPU (pandas): correct, simple FUN extraction (token/tag alignment)
 - Output: Parquet with columns:
     - processed_title (str)
@@ -12,17 +13,18 @@ Build IPOD FUN-token artifact (hybrid GPU+CPU).
 
 from __future__ import annotations
 
-import time
-from pathlib import Path
 from typing import List
 
-import cudf
 import pandas as pd
 
-IPOD_PATH = Path.home() / "workspace/datasets/IPOD/data/ipod_ner.csv"
+from src.config import get_config
+from src.ingest.backends import read_csv
+from src.utils import file_size, span
 
-# Use your existing folder structure: data/features
-OUT_PATH = Path("data/features/ipod_fun.parquet")
+CFG = get_config()
+
+IPOD_PATH = CFG.paths.ipod_csv
+OUT_PATH = CFG.paths.ipod_fun
 
 
 def extract_fun_tokens(processed_title: str, tag_a1: str) -> List[str]:
@@ -35,50 +37,42 @@ def extract_fun_tokens(processed_title: str, tag_a1: str) -> List[str]:
 
 
 def main() -> None:
-    t0 = time.perf_counter()
-
-    # 1) GPU ingest (fast)
-    t_load0 = time.perf_counter()
-    gdf = cudf.read_csv(IPOD_PATH, usecols=["Processed_Title", "Tag_A1"])
-    t_load1 = time.perf_counter()
-
-    # 2) Move needed columns to CPU
-    t_to_cpu0 = time.perf_counter()
-    pdf = gdf.to_pandas()
-    t_to_cpu1 = time.perf_counter()
-
-    # 3) CPU FUN extraction (correct)
-    t_ext0 = time.perf_counter()
-    pt = pdf["Processed_Title"].astype(str).tolist()
-    tg = pdf["Tag_A1"].astype(str).tolist()
-    fun_tokens = [extract_fun_tokens(a, b) for a, b in zip(pt, tg)]
-
-    pdf = pd.DataFrame(
-        {
-            "processed_title": pt,
-            "tag_a1": tg,
-            "fun_tokens": fun_tokens,
-            "fun_text": [" ".join(x) for x in fun_tokens],
-        }
-    )
-    t_ext1 = time.perf_counter()
-
-    # 4) Persist artifact
-    t_out0 = time.perf_counter()
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    pdf.to_parquet(OUT_PATH, index=False)
-    t_out1 = time.perf_counter()
-
-    t1 = time.perf_counter()
+    with span("ipod.build_fun_artifact") as total:
+        # 1) Ingest (GPU when available) into pandas
+        with span("ipod.read_csv", bytes_read=file_size(IPOD_PATH)) as t_load:
+            pdf, backend = read_csv(
+                IPOD_PATH, usecols=["Processed_Title", "Tag_A1"], backend=CFG.compute.csv_backend
+            )
+            t_load.add(rows=len(pdf), backend=backend)
+
+        # 2) CPU FUN extraction (correct)
+        with span("ipod.fun_extraction", rows=len(pdf)) as t_ext:
+            pt = pdf["Processed_Title"].astype(str).tolist()
+            tg = pdf["Tag_A1"].astype(str).tolist()
+            fun_tokens = [extract_fun_tokens(a, b) for a, b in zip(pt, tg)]
+
+            pdf = pd.DataFrame(
+                {
+                    "processed_title": pt,
+                    "tag_a1": tg,
+                    "fun_tokens": fun_tokens,
+                    "fun_text": [" ".join(x) for x in fun_tokens],
+                }
+            )
+
+        # 3) Persist artifact
+        with span("ipod.write_parquet", rows=len(pdf)) as t_out:
+            OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+            pdf.to_parquet(OUT_PATH, index=False)
+            t_out.add(bytes_written=file_size(OUT_PATH))
 
     print(pdf[["processed_title", "tag_a1", "fun_tokens"]].head(5))
     print("\nRows:", len(pdf))
     print("\nTiming (seconds):")
-    print(f"  GPU read_csv        : {t_load1 - t_load0:.3f}")
-    print(f"  to_pandas           : {t_to_cpu1 - t_to_cpu0:.3f}")
-    print(f"  FUN extraction (CPU): {t_ext1 - t_ext0:.3f}")
-    print(f"  write_parquet       : {t_out1 - t_out0:.3f}")
-    print(f"  total               : {t1 - t0:.3f}")
+    print(f"  read_csv ({backend:<6s})   : {t_load.duration:.3f}")
+    print(f"  FUN extraction (CPU): {t_ext.duration:.3f}")
+    print(f"  write_parquet       : {t_out.duration:.3f}")
+    print(f"  total               : {total.duration:.3f}")
     print(f"\nWrote: {OUT_PATH.resolve()}")
 
 
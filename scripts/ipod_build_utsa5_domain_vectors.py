@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict
 
-import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
 
-IN_PATH = Path("data/features/ipod_fun.parquet")
-OUT_PATH = Path("data/features/utsa5_domain_vectors.parquet")
+from src.analyze.domain_vectors import build_domain_vectors, stream_domain_vectors
+from src.config import get_config
+
+CFG = get_config()
+
+IN_PATH = CFG.paths.ipod_fun
+OUT_PATH = CFG.paths.domain_vectors
 
 # These are retrieval anchors, not the domain definition.
 DOMAIN_ANCHORS: Dict[str, set[str]] = {
@@ -43,73 +45,43 @@ GENERIC_STOP = {
     "assistant", "specialist", "analyst", "coordinator", "executive",
 }
 
-def require_anchor_hits(fun_text: str, anchors: set[str], min_hits: int) -> bool:
-    toks = fun_text.split()
-    hits = 0
-    for a in anchors:
-        if a in toks:
-            hits += 1
-            if hits >= min_hits:
-                return True
-    return False
-
-def build_domain_vector(
-    fun_text_series: pd.Series,
-    anchors: set[str],
-    *,
-    min_anchor_hits: int = 2,
-    min_df: int = 10,
-    max_df: float = 0.50,
-) -> Tuple[pd.DataFrame, int]:
-    # Seeded retrieval: subset of IPOD FUN texts relevant to this domain
-    mask = fun_text_series.fillna("").apply(lambda s: require_anchor_hits(s, anchors, min_anchor_hits))
-    sub = fun_text_series.loc[mask].fillna("")
-
-    # TF-IDF fit only on the subset; centroid becomes the domain vector.
-    vec = TfidfVectorizer(
-        lowercase=True,
-        token_pattern=r"(?u)\b\w+\b",
-        min_df=min_df,
-        max_df=max_df,
-    )
-    X = vec.fit_transform(sub.values)
-    centroid = np.asarray(X.mean(axis=0)).ravel()
-    vocab = vec.get_feature_names_out()
-
-    df_vec = pd.DataFrame({"term": vocab, "weight": centroid})
-    df_vec = df_vec.sort_values("weight", ascending=False)
-
-    # Clean: remove generic org boilerplate (keeps vector more diagnostic)
-    df_vec_clean = df_vec[~df_vec["term"].isin(GENERIC_STOP)].reset_index(drop=True)
-
-    return df_vec_clean, int(mask.sum())
-
 def main() -> None:
-    df = pd.read_parquet(IN_PATH)
-    fun_text = df["fun_text"].fillna("")
-
-    all_rows: List[pd.DataFrame] = []
-
-    print("Loaded IPOD FUN artifact rows:", len(df))
     print("Input:", IN_PATH.resolve())
-    print()
 
-    for domain, anchors in DOMAIN_ANCHORS.items():
-        vec_df, n_sub = build_domain_vector(fun_text, anchors, min_anchor_hits=2)
+    if CFG.compute.streaming:
+        # Out-of-core: two passes over Parquet batches, corpus never loaded.
+        print("Streaming in batches of", CFG.compute.read_batch_rows, "rows")
+        print()
+        out_all = stream_domain_vectors(
+            IN_PATH,
+            DOMAIN_ANCHORS,
+            min_anchor_hits=2,
+            stop_terms=GENERIC_STOP,
+            batch_rows=CFG.compute.read_batch_rows,
+        )
+    else:
+        df = pd.read_parquet(IN_PATH, columns=["fun_text"])
+        print("Loaded IPOD FUN artifact rows:", len(df))
+        print()
 
+        # One tokenization of the corpus, shared by all domain workers;
+        # output order follows DOMAIN_ANCHORS.
+        out_all = build_domain_vectors(
+            df["fun_text"].fillna(""),
+            DOMAIN_ANCHORS,
+            min_anchor_hits=2,
+            stop_terms=GENERIC_STOP,
+            workers=CFG.workers(),
+        )
+
+    for domain, vec_df in out_all.groupby("domain", sort=False):
         print(f"=== {domain} ===")
-        print("Seeded subset rows:", n_sub)
+        print("Seeded subset rows:", int(vec_df["subset_rows"].iloc[0]))
         print("Top terms:")
         for _, r in vec_df.head(20).iterrows():
             print(f"  {r['term']:<18s} {r['weight']:.6f}")
         print()
 
-        out = vec_df.copy()
-        out.insert(0, "domain", domain)
-        out.insert(1, "subset_rows", n_sub)
-        all_rows.append(out)
-
-    out_all = pd.concat(all_rows, ignore_index=True)
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     out_all.to_parquet(OUT_PATH, index=False)
 
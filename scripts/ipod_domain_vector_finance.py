@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from pathlib import Path
-import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
 
-IN_PATH = Path("data/features/ipod_fun.parquet")
+from src.analyze.domain_vectors import build_domain_vectors, stream_domain_vectors
+from src.config import get_config
+
+CFG = get_config()
+
+IN_PATH = CFG.paths.ipod_fun
 
 # Anchors are not the domain definition — they are just a retrieval filter.
 FINANCE_ANCHORS = {
@@ -14,32 +16,23 @@ FINANCE_ANCHORS = {
 }
 
 def main() -> None:
-    df = pd.read_parquet(IN_PATH)
-    fun_text = df["fun_text"].fillna("")
-
-    # Build a finance-relevant subset (seeded retrieval)
-    mask = fun_text.apply(lambda s: any(a in s.split() for a in FINANCE_ANCHORS))
-    sub = fun_text.loc[mask]
-
-    print("IPOD rows:", len(df))
-    print("Finance-seeded subset rows:", len(sub))
-
-    # TF-IDF on the subset; centroid is the "domain vector"
-    vec = TfidfVectorizer(
-        lowercase=True,
-        token_pattern=r"(?u)\b\w+\b",
-        min_df=10,
-        max_df=0.50
-    )
-    X = vec.fit_transform(sub.values)
-    centroid = np.asarray(X.mean(axis=0)).ravel()
-    vocab = vec.get_feature_names_out()
-
-    top_idx = np.argsort(-centroid)[:50]
+    # Finance-relevant subset (any single anchor), TF-IDF fit on the
+    # subset only; the centroid is the "domain vector".
+    params = dict(min_anchor_hits=1, min_df=10, max_df=0.50)
+    if CFG.compute.streaming:
+        vec = stream_domain_vectors(
+            IN_PATH, {"Finance": FINANCE_ANCHORS}, batch_rows=CFG.compute.read_batch_rows, **params
+        )
+    else:
+        df = pd.read_parquet(IN_PATH, columns=["fun_text"])
+        print("IPOD rows:", len(df))
+        vec = build_domain_vectors(df["fun_text"], {"Finance": FINANCE_ANCHORS}, workers=1, **params)
+
+    print("Finance-seeded subset rows:", int(vec["subset_rows"].iloc[0]))
+
     print("\nTop Finance-associated FUN terms (TF-IDF centroid):")
-    for i in top_idx:
-        print(f"{vocab[i]:20s} {centroid[i]:.6f}")
+    for term, weight in zip(vec["term"].head(50), vec["weight"].head(50)):
+        print(f"{term:20s} {weight:.6f}")
 
 if __name__ == "__main__":
     main()
-
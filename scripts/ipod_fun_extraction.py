@@ -1,12 +1,12 @@
 # scripts/ipod_fun_extraction.py
 
 import pandas as pd
-from pathlib import Path
+from src.config import get_config
 
 # ---------------------------
 # Paths
 # ---------------------------
-IPOD_PATH = Path.home() / "workspace/datasets/IPOD/data/ipod_ner.csv"
+IPOD_PATH = get_config().paths.ipod_csv
 
 # ---------------------------
 # Load IPOD
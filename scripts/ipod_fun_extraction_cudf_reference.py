@@ -1,38 +1,54 @@
 # scripts/ipod_fun_extraction_cudf.py
 
-import cudf
-from pathlib import Path
+# CSV ingest goes through src.ingest.backends (cuDF when usable, pandas
+# on CPU-only nodes) and the frame stays native. The reference extraction
+# is row-wise Python: apply_rows kernels cannot emit list columns, so on
+# cuDF the two columns are pulled to host and the result written back.
+from src.config import get_config
+from src.ingest.backends import read_csv
 import time
 
 # ---------------------------
 # Paths
 # ---------------------------
-IPOD_PATH = Path.home() / "workspace/datasets/IPOD/data/ipod_ner.csv"
+CFG = get_config()
+IPOD_PATH = CFG.paths.ipod_csv
 
 t0 = time.perf_counter()
 
 # ---------------------------
-# Load IPOD on GPU
+# Load IPOD (GPU when available)
 # ---------------------------
 t_load_start = time.perf_counter()
-gdf = cudf.read_csv(IPOD_PATH)
+gdf, backend = read_csv(
+    IPOD_PATH,
+    usecols=["Processed_Title", "Tag_A1"],
+    backend=CFG.compute.csv_backend,
+    to_pandas=False,
+)
 t_load_end = time.perf_counter()
 
 # ---------------------------
 # FUN token extraction
 # ---------------------------
-def extract_fun_tokens_gpu(processed, tags):
+def extract_fun_tokens(processed, tags):
     tokens = processed.split()
     tag_list = tags.split()
     return [t for t, g in zip(tokens, tag_list) if g == "FUN"]
 
 t_extract_start = time.perf_counter()
 
-gdf["fun_tokens"] = gdf.apply_rows(
-    lambda processed, tags: extract_fun_tokens_gpu(processed, tags),
-    incols=["Processed_Title", "Tag_A1"],
-    outcols=dict(fun_tokens=list),
-)
+if backend == "cudf":
+    import cudf
+
+    titles = gdf["Processed_Title"].astype(str).to_arrow().to_pylist()
+    tags = gdf["Tag_A1"].astype(str).to_arrow().to_pylist()
+    gdf["fun_tokens"] = cudf.Series([extract_fun_tokens(p, t) for p, t in zip(titles, tags)], index=gdf.index)
+else:
+    gdf["fun_tokens"] = [
+        extract_fun_tokens(p, t)
+        for p, t in zip(gdf["Processed_Title"].astype(str), gdf["Tag_A1"].astype(str))
+    ]
 
 t_extract_end = time.perf_counter()
 t1 = time.perf_counter()
@@ -47,6 +63,6 @@ print("\nTotal rows:", len(gdf))
 # Timing summary
 # ---------------------------
 print("\nTiming (seconds):")
-print(f"  Load CSV      : {t_load_end - t_load_start:.3f}")
+print(f"  Load CSV ({backend}): {t_load_end - t_load_start:.3f}")
 print(f"  FUN extraction: {t_extract_end - t_extract_start:.3f}")
 print(f"  Total runtime : {t1 - t0:.3f}")
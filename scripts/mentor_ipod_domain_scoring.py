@@ -1,93 +1,99 @@
 from __future__ import annotations
 
-from pathlib import Path
-import re
-import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-MENTOR_PATH = Path("data/cleaned/mentor_clean.parquet")
-DOMAIN_VEC_PATH = Path("data/features/utsa5_domain_vectors.parquet")
-OUT_PATH = Path("data/features/mentor_domain_profiles.parquet")
+from src.analyze.domain_docs import load_domain_docs
+from src.config import get_config
+from src.ingest.parsers import (
+    TokenCache,
+    normalize_series,
+    pretokenized_vectorizer,
+    tokenize_series,
+)
+from src.similarity import blocked_cosine_similarity
+
+CFG = get_config()
+
+MENTOR_PATH = CFG.paths.mentor_clean
+DOMAIN_VEC_PATH = CFG.paths.domain_vectors
+OUT_PATH = CFG.paths.mentor_domain_profiles
+TOKEN_CACHE_PATH = CFG.cache.token_cache
 
 DOMAINS = ["Accounting", "Economics", "Finance", "Management", "Marketing"]
 
-def normalize(s: str) -> str:
-    if not isinstance(s, str):
-        return ""
-    s = s.lower()
-    s = re.sub(r"[^a-z0-9\s]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+# Number of ranked domains kept per channel in the profile.
+TOP_K = 3
 
 def main() -> None:
     mentors = pd.read_parquet(MENTOR_PATH)
-    dv = pd.read_parquet(DOMAIN_VEC_PATH)
-
-    # --- Build domain documents ---
-    domain_docs = (
-        dv.sort_values(["domain", "weight"], ascending=[True, False])
-          .groupby("domain")
-          .head(80)
-          .groupby("domain")["term"]
-          .apply(lambda x: " ".join(x.tolist()))
-          .reset_index()
-    )
-    domain_docs["doc"] = domain_docs["term"].apply(normalize)
+
+    # --- Domain documents (cached per vector file and top_k) ---
+    docs = load_domain_docs(DOMAIN_VEC_PATH, CFG.scoring.domain_top_k, cache_dir=CFG.cache.domain_docs)
+    domain_docs = docs.frame()
 
     # --- Mentor text channels ---
-    mentors["structural_text"] = (
+    structural_text = (
         mentors["standardized_degree"].fillna("") + " " +
         mentors["Job Title"].fillna("") + " " +
         mentors["Current Role"].fillna("")
-    ).apply(normalize)
+    )
 
-    mentors["interest_text"] = (
+    interest_text = (
         mentors["Field of Interest"].fillna("") + " " +
         mentors["Program Goals"].fillna("")
-    ).apply(normalize)
+    )
 
-    # --- TF-IDF joint space ---
-    corpus = (
-        domain_docs["doc"].tolist() +
-        mentors["structural_text"].tolist() +
-        mentors["interest_text"].tolist()
+    # --- TF-IDF joint space (tokenized once, cached across runs) ---
+    cache = TokenCache(TOKEN_CACHE_PATH)
+    corpus = tokenize_series(
+        pd.concat([domain_docs["doc"], structural_text, interest_text], ignore_index=True),
+        min_token_len=2,
+        cache=cache,
     )
+    cache.save()
 
-    vec = TfidfVectorizer(min_df=2, max_df=0.85)
+    vec = pretokenized_vectorizer(min_df=2, max_df=0.85)
     X = vec.fit_transform(corpus)
 
     n_dom = len(domain_docs)
     n_men = len(mentors)
 
     X_dom = X[:n_dom]
+    if CFG.scoring.domain_weighting == "centroid":
+        X_dom = docs.matrix(vec.vocabulary_, vec.idf_)
     X_struct = X[n_dom : n_dom + n_men]
     X_interest = X[n_dom + n_men :]
 
-    # --- Similarities ---
-    sim_struct = cosine_similarity(X_struct, X_dom)
-    sim_interest = cosine_similarity(X_interest, X_dom)
-
-    results = []
-    for i, row in mentors.iterrows():
-        p_idx = int(np.argmax(sim_struct[i]))
-        s_idx = int(np.argmax(sim_interest[i]))
-
-        primary_domain = domain_docs.loc[p_idx, "domain"]
-        secondary_domain = domain_docs.loc[s_idx, "domain"]
-
-        results.append({
-            "First Name": row["First Name"],
-            "standardized_degree": row["standardized_degree"],
-            "primary_domain": primary_domain,
-            "primary_score": float(sim_struct[i, p_idx]),
-            "secondary_domain": secondary_domain,
-            "secondary_score": float(sim_interest[i, s_idx]),
-            "human_vs_model_agree": normalize(row["standardized_degree"]) == normalize(primary_domain)
-        })
-
-    out = pd.DataFrame(results)
+    # --- Similarities (top-k domains per mentor, best first) ---
+    k = min(TOP_K, n_dom)
+    p_idx, p_score = blocked_cosine_similarity(
+        X_struct, X_dom, top_k=k, block_size=CFG.compute.similarity_block_size
+    )
+    s_idx, s_score = blocked_cosine_similarity(
+        X_interest, X_dom, top_k=k, block_size=CFG.compute.similarity_block_size
+    )
+
+    # --- Profiles, assembled column-wise ---
+    domain_labels = domain_docs["domain"].to_numpy()
+    domain_norm = normalize_series(domain_docs["domain"]).to_numpy()
+    primary_domain = domain_labels[p_idx[:, 0]]
+
+    out = pd.DataFrame({
+        "First Name": mentors["First Name"].to_numpy(),
+        "standardized_degree": mentors["standardized_degree"].to_numpy(),
+        "primary_domain": primary_domain,
+        "primary_score": p_score[:, 0],
+        "secondary_domain": domain_labels[s_idx[:, 0]],
+        "secondary_score": s_score[:, 0],
+        "human_vs_model_agree": (
+            normalize_series(mentors["standardized_degree"]).to_numpy()
+            == domain_norm[p_idx[:, 0]]
+        ),
+        "primary_top_domains": list(domain_labels[p_idx]),
+        "primary_top_scores": list(p_score),
+        "secondary_top_domains": list(domain_labels[s_idx]),
+        "secondary_top_scores": list(s_score),
+    })
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     out.to_parquet(OUT_PATH, index=False)
 
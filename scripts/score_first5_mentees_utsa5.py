@@ -1,16 +1,21 @@
 from __future__ import annotations
 
-from pathlib import Path
-import re
+from functools import reduce
 import numpy as np
 import pandas as pd
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from src.analyze.domain_docs import load_domain_docs
+from src.config import get_config
+from src.ingest.parsers import TokenCache, pretokenized_vectorizer, tokenize_series
+from src.ingest.workbook import read_workbook
+from src.similarity import blocked_cosine_similarity
 
-MENTEE_XLSX = Path("data/raw/Mentee Data.xlsx")
-DOMAIN_VEC_PATH = Path("data/features/utsa5_domain_vectors.parquet")
-OUT_CSV = Path("outputs/utsa5_first5_scores.csv")
+CFG = get_config()
+
+MENTEE_XLSX = CFG.paths.mentee_xlsx
+DOMAIN_VEC_PATH = CFG.paths.domain_vectors
+OUT_CSV = CFG.paths.first5_scores
+TOKEN_CACHE_PATH = CFG.cache.token_cache
 
 # IMPORTANT: Your sheet has a trailing space in this column name.
 TEXT_COLS = [
@@ -20,54 +25,37 @@ TEXT_COLS = [
     "Additional Info to Consider ",
 ]
 
-def normalize_text(s: str) -> str:
-    s = (s or "").lower()
-    s = re.sub(r"[^a-z0-9\s]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-def build_narrative(row: pd.Series) -> str:
-    parts = []
-    for c in TEXT_COLS:
-        v = row.get(c, "")
-        if pd.notna(v):
-            parts.append(str(v))
-    return normalize_text(" ".join(parts))
+def build_narrative(df: pd.DataFrame) -> pd.Series:
+    cols = [c for c in TEXT_COLS if c in df.columns]
+    if not cols:
+        return pd.Series("", index=df.index, dtype="string")
+    return reduce(
+        lambda a, b: a + " " + b,
+        (df[c].astype("string").fillna("") for c in cols),
+    )
 
 def main() -> None:
-    # 1) Load domain vectors
-    if not DOMAIN_VEC_PATH.exists():
-        raise FileNotFoundError(f"Missing domain vectors: {DOMAIN_VEC_PATH.resolve()}")
-
-    dv = pd.read_parquet(DOMAIN_VEC_PATH)
-
-    # Build domain "documents" from top terms
-    top_k = 80
-    domain_docs = (
-        dv.sort_values(["domain", "weight"], ascending=[True, False])
-          .groupby("domain", as_index=False)
-          .head(top_k)
-          .groupby("domain")["term"]
-          .apply(lambda x: " ".join(x.tolist()))
-          .reset_index()
-          .rename(columns={"term": "doc"})
-    )
-    domain_docs["doc"] = domain_docs["doc"].apply(normalize_text)
+    # 1) Domain "documents" from top terms (cached per vector file and top_k)
+    docs = load_domain_docs(DOMAIN_VEC_PATH, CFG.scoring.domain_top_k, cache_dir=CFG.cache.domain_docs)
+    domain_docs = docs.frame()
 
     # 2) Load mentees
     if not MENTEE_XLSX.exists():
         raise FileNotFoundError(f"Missing mentee file: {MENTEE_XLSX.resolve()}")
 
-    df = pd.read_excel(MENTEE_XLSX)
+    df = read_workbook(MENTEE_XLSX, [0], cache_dir=CFG.cache.excel_dir)[0]
     df5 = df.head(5).copy()
-    df5["narrative"] = df5.apply(build_narrative, axis=1)
+    df5["narrative"] = build_narrative(df5)
 
-    # 3) Joint TF-IDF space (domains + mentees)
-    corpus = domain_docs["doc"].tolist() + df5["narrative"].tolist()
+    # 3) Joint TF-IDF space (domains + mentees), tokenized once
+    cache = TokenCache(TOKEN_CACHE_PATH)
+    corpus = tokenize_series(
+        pd.concat([domain_docs["doc"], df5["narrative"]], ignore_index=True),
+        cache=cache,
+    )
+    cache.save()
 
-    vec = TfidfVectorizer(
-        lowercase=True,
-        token_pattern=r"(?u)\b\w+\b",
+    vec = pretokenized_vectorizer(
         min_df=1,
         max_df=0.90,
     )
@@ -75,9 +63,11 @@ def main() -> None:
 
     X_dom = X[: len(domain_docs)]
     X_men = X[len(domain_docs):]
+    if CFG.scoring.domain_weighting == "centroid":
+        X_dom = docs.matrix(vec.vocabulary_, vec.idf_)
 
     # 4) Similarity
-    sims = cosine_similarity(X_men, X_dom)  # (5, num_domains)
+    sims = blocked_cosine_similarity(X_men, X_dom, block_size=CFG.compute.similarity_block_size)  # (5, num_domains)
 
     # 5) Output
     rows = []
@@ -0,0 +1,243 @@
+"""
+Benchmark harness for the matching pipeline.
+
+ANALYZE stage:
+- Generates synthetic mentors, mentees and degree–course matrices at a
+  configurable scale
+- Times each pipeline stage with warmups and repetitions
+- Returns flat records suitable for a machine-readable results file
+
+Timings are wall-clock (time.perf_counter) and platform-specific; compare
+them across commits on the same machine.
+"""
+
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.ingest.parsers import pretokenized_vectorizer, tokenize_series
+from src.model import build_cost_matrix, solve_assignment
+from src.similarity import blocked_cosine_similarity, course_weights, weighted_distance_matrix
+
+
+STAGES = ["cost_build", "d_idf", "tfidf_scoring", "hungarian", "min_cost_flow", "milp", "auction", "stable", "bottleneck"]
+
+# Stages that solve on the dense mentors × mentees cost matrix.
+SOLVER_STAGES = ("hungarian", "min_cost_flow", "milp", "auction", "stable", "bottleneck")
+
+# Largest participant count each stage is attempted at by default; beyond
+# this the stage is recorded as skipped (MILP and flow models build one
+# Python object per candidate pair).
+DEFAULT_MAX_PARTICIPANTS: Dict[str, int] = {
+    "cost_build": 50_000,
+    "d_idf": 50_000,
+    "tfidf_scoring": 50_000,
+    "hungarian": 5_000,
+    "min_cost_flow": 600,
+    "milp": 200,
+    "auction": 20_000,
+    "stable": 20_000,
+    "bottleneck": 5_000,
+}
+
+# Candidate mentors per mentee for the auction stage.
+AUCTION_K = 50
+
+_SUBJECTS = ["ACC", "ECO", "FIN", "MGT", "MKT", "IS", "STA", "CS", "HRM", "MOT"]
+
+_VOCAB = (
+    "finance accounting audit tax investment risk capital portfolio treasury "
+    "marketing brand digital advertising campaign customer content sales "
+    "management strategy leadership operations project planning program "
+    "economics policy trade markets research analysis data analytics "
+    "cyber security systems software cloud network engineering consulting"
+).split()
+
+
+@dataclass
+class SyntheticCohort:
+    """
+    A synthetic matching instance.
+
+    X is the degree–course incidence matrix (n_degrees × n_courses, int8);
+    mentor_degree / mentee_degree index rows of X.
+    """
+
+    X: np.ndarray
+    course_codes: np.ndarray
+    mentor_degree: np.ndarray
+    mentee_degree: np.ndarray
+    mentee_text: pd.Series
+    domain_text: pd.Series
+
+    @property
+    def n_participants(self) -> int:
+        return len(self.mentor_degree) + len(self.mentee_degree)
+
+
+def generate_cohort(
+    n_participants: int,
+    n_degrees: int,
+    *,
+    n_courses: Optional[int] = None,
+    mentor_share: float = 0.5,
+    core_courses: int = 20,
+    courses_per_degree: int = 40,
+    n_domains: int = 5,
+    seed: int = 0,
+) -> SyntheticCohort:
+    """
+    Generate a synthetic cohort with a realistic block structure.
+
+    Every degree requires a shared business core plus a random set of
+    specialized courses; course numbers span the 1000–4000 levels so the
+    λ tiers of level_weight are all exercised.
+    """
+
+    rng = np.random.default_rng(seed)
+    n_courses = n_courses or max(core_courses + courses_per_degree, 8 * n_degrees)
+
+    subjects = rng.choice(_SUBJECTS, n_courses)
+    numbers = rng.integers(1000, 5000, n_courses)
+    course_codes = np.array([f"{s} {n:04d}" for s, n in zip(subjects, numbers)])
+
+    X = np.zeros((n_degrees, n_courses), dtype=np.int8)
+    X[:, : min(core_courses, n_courses)] = 1
+    k = min(courses_per_degree, n_courses)
+    spec = np.argsort(rng.random((n_degrees, n_courses)), axis=1)[:, :k]
+    np.put_along_axis(X, spec, 1, axis=1)
+
+    n_mentors = int(round(n_participants * mentor_share))
+    n_mentees = n_participants - n_mentors
+
+    def narratives(n: int, lo: int, hi: int) -> pd.Series:
+        lengths = rng.integers(lo, hi, n)
+        words = rng.choice(_VOCAB, lengths.sum())
+        return pd.Series([" ".join(w) for w in np.split(words, np.cumsum(lengths)[:-1])])
+
+    return SyntheticCohort(
+        X=X,
+        course_codes=course_codes,
+        mentor_degree=rng.integers(0, n_degrees, n_mentors).astype(np.int32),
+        mentee_degree=rng.integers(0, n_degrees, n_mentees).astype(np.int32),
+        mentee_text=narratives(n_mentees, 10, 60),
+        domain_text=narratives(n_domains, 60, 80),
+    )
+
+
+def time_stage(fn: Callable[[], object], *, warmup: int = 1, repeat: int = 5) -> Dict[str, float]:
+    """
+    Call fn `warmup` times untimed, then `repeat` times timed.
+    """
+
+    for _ in range(warmup):
+        fn()
+
+    samples: List[float] = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+
+    return {
+        "repeat": len(samples),
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def _tfidf_scoring(cohort: SyntheticCohort) -> None:
+    corpus = tokenize_series(pd.concat([cohort.domain_text, cohort.mentee_text], ignore_index=True))
+    X = pretokenized_vectorizer(min_df=1, max_df=0.90).fit_transform(corpus)
+    n_dom = len(cohort.domain_text)
+    blocked_cosine_similarity(X[n_dom:], X[:n_dom], top_k=2)
+
+
+def run_benchmarks(
+    participants: Sequence[int],
+    degrees: Sequence[int],
+    *,
+    stages: Sequence[str] = STAGES,
+    warmup: int = 1,
+    repeat: int = 5,
+    max_participants: Optional[Dict[str, int]] = None,
+    seed: int = 0,
+    log: Callable[[str], None] = print,
+) -> List[Dict[str, object]]:
+    """
+    Time every requested stage for each (participants, degrees) scale.
+
+    Returns one flat record per (scale, stage).
+    """
+
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages {sorted(unknown)}. Choose from: {STAGES}")
+
+    caps = {**DEFAULT_MAX_PARTICIPANTS, **(max_participants or {})}
+    records: List[Dict[str, object]] = []
+
+    for n_part, n_deg in zip(participants, degrees):
+        cohort = generate_cohort(n_part, n_deg, seed=seed)
+        w = course_weights(cohort.X, cohort.course_codes)
+        D = weighted_distance_matrix(cohort.X, w)
+
+        # The dense C (8·n_mentors·n_mentees bytes) is built on first use
+        # by a solver stage under its cap, outside the timed region.
+        cost: Dict[str, np.ndarray] = {}
+
+        def C() -> np.ndarray:
+            if "C" not in cost:
+                cost["C"] = build_cost_matrix(cohort.mentor_degree, cohort.mentee_degree, D)
+            return cost["C"]
+
+        stage_fns: Dict[str, Callable[[], object]] = {
+            "cost_build": lambda: build_cost_matrix(cohort.mentor_degree, cohort.mentee_degree, D),
+            "d_idf": lambda: weighted_distance_matrix(
+                cohort.X, course_weights(cohort.X, cohort.course_codes)
+            ),
+            "tfidf_scoring": lambda: _tfidf_scoring(cohort),
+            "hungarian": lambda: solve_assignment(C(), "hungarian"),
+            "min_cost_flow": lambda: solve_assignment(C(), "min_cost_flow"),
+            "milp": lambda: solve_assignment(C(), "milp"),
+            "auction": lambda: solve_assignment(C(), "auction", k=AUCTION_K),
+            "stable": lambda: solve_assignment(C(), "stable"),
+            "bottleneck": lambda: solve_assignment(C(), "bottleneck"),
+        }
+
+        for stage in stages:
+            record: Dict[str, object] = {
+                "stage": stage,
+                "n_participants": n_part,
+                "n_mentors": len(cohort.mentor_degree),
+                "n_mentees": len(cohort.mentee_degree),
+                "n_degrees": n_deg,
+                "n_courses": cohort.X.shape[1],
+            }
+
+            if n_part > caps.get(stage, n_part):
+                record["status"] = "skipped"
+                log(f"  {stage:<14s} n={n_part:<6d} degrees={n_deg:<5d} skipped (> {caps[stage]})")
+            else:
+                try:
+                    if stage in SOLVER_STAGES:
+                        C()
+                    record.update(time_stage(stage_fns[stage], warmup=warmup, repeat=repeat))
+                    record["status"] = "ok"
+                    log(
+                        f"  {stage:<14s} n={n_part:<6d} degrees={n_deg:<5d} "
+                        f"median {record['median_s']:.4f}s"
+                    )
+                except ImportError as exc:
+                    record["status"] = f"unavailable: {exc}"
+                    log(f"  {stage:<14s} unavailable ({exc})")
+
+            records.append(record)
+
+    return records
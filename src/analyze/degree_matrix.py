@@ -0,0 +1,147 @@
+"""
+Degree–Course Incidence Matrix
+
+FEATURES stage (from crawled catalog records):
+- Extracts course codes from course titles column-wise
+  (src.ingest.parsers.extract_course_codes)
+- One row per degree program, one column per distinct course code
+- Emits the sparse binary incidence matrix X and the course weights
+  w = IDF × λ (src.similarity.course_weights) in one pass
+- Persists X, w and labels together (.npz); to_frame() gives the wide
+  "Course Code" × degree layout of degree_course_matrix.parquet
+
+Replaces the hand-maintained degree_reference.xlsx whenever the catalog
+is re-crawled.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.ingest.parsers import extract_course_codes
+from src.similarity import course_weights
+from src.utils import span
+
+
+COURSE_CODE_COL = "Course Code"
+
+
+@dataclass
+class DegreeCourseMatrix:
+    """
+    X (degrees × courses, binary int8 CSR), labels for both axes, and the
+    composite course weights w.
+    """
+
+    X: sp.csr_matrix
+    degrees: np.ndarray
+    courses: np.ndarray
+    w: np.ndarray
+
+    @property
+    def shape(self):
+        return self.X.shape
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Wide course × degree table (first column "Course Code"), as the
+        notebooks read it.
+        """
+        df = pd.DataFrame(self.X.T.toarray(), columns=list(self.degrees))
+        df.insert(0, COURSE_CODE_COL, self.courses)
+        return df
+
+    def save(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            data=self.X.data,
+            indices=self.X.indices,
+            indptr=self.X.indptr,
+            shape=np.array(self.X.shape),
+            degrees=self.degrees.astype(str),
+            courses=self.courses.astype(str),
+            w=self.w,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "DegreeCourseMatrix":
+        with np.load(path) as f:
+            X = sp.csr_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"]))
+            return cls(X=X, degrees=f["degrees"], courses=f["courses"], w=f["w"])
+
+
+def build_degree_course_matrix(
+    records: pd.DataFrame,
+    *,
+    degree_col: str = "program",
+    text_col: str = "title",
+    page_col: str = "source_url",
+    degree_labels: Optional[Mapping[str, str]] = None,
+) -> DegreeCourseMatrix:
+    """
+    Incidence matrix from crawled course records.
+
+    Parameters
+    ----------
+    records : pd.DataFrame
+        One row per course listing (e.g. crawl_undergraduate_catalog()
+        output), with a degree/program column and a title containing the
+        course code.
+    degree_col : str
+        Column naming the degree program a listing belongs to.
+    text_col : str
+        Column to extract the course code from.
+    page_col : str
+        Inventory page of each listing. Each page must carry its own
+        degree value; fewer distinct degrees than pages means the degree
+        column does not identify programs, and is rejected.
+    degree_labels : mapping, optional
+        Degree value → canonical degree label (e.g. the D / dictionary
+        label); unmapped values are kept as they are.
+
+    Rows without a code or a degree are dropped; repeated listings of a
+    course under one degree count once. Degrees and courses are sorted.
+    """
+
+    with span("features.degree_matrix", rows=len(records)) as s:
+        if page_col in records.columns:
+            per_page = records.dropna(subset=[degree_col]).groupby(page_col)[degree_col].first()
+            if per_page.nunique() < len(per_page):
+                dup = per_page[per_page.duplicated(keep=False)].sort_values()
+                raise ValueError(
+                    f"{len(per_page)} inventory pages collapse to {per_page.nunique()} "
+                    f"'{degree_col}' values, e.g. {dup.head(4).to_dict()}."
+                )
+
+        codes = extract_course_codes(records[text_col])["code"]
+        keep = (codes.notna() & records[degree_col].notna()).to_numpy()
+
+        degree = records.loc[keep, degree_col].astype(str)
+        if degree_labels is not None:
+            degree = degree.map(lambda d: degree_labels.get(d, d))
+        degrees = pd.Categorical(degree)
+        courses = pd.Categorical(codes[keep].astype(str))
+
+        X = sp.csr_matrix(
+            (np.ones(int(keep.sum()), dtype=np.int32), (degrees.codes, courses.codes)),
+            shape=(len(degrees.categories), len(courses.categories)),
+        )
+        X.data[:] = 1
+        X = X.astype(np.int8)
+
+        course_labels = courses.categories.to_numpy(dtype=str)
+        w = course_weights(X, course_labels)
+        s.add(degrees=X.shape[0], courses=X.shape[1], nnz=X.nnz)
+
+    return DegreeCourseMatrix(
+        X=X,
+        degrees=degrees.categories.to_numpy(dtype=str),
+        courses=course_labels,
+        w=w,
+    )
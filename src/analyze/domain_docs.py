@@ -0,0 +1,151 @@
+"""
+Domain Document Cache
+
+FEATURES → SCORE handoff:
+- Turns the domain-vector table (domain, term, weight) into one
+  "document" per domain: its top-k terms by centroid weight
+- Keeps the centroid weights alongside the text, so scorers can use the
+  weighted sparse vector instead of re-deriving term weights from text
+- Persists the result under a name keyed by (vector file hash, top_k);
+  later runs load it directly and skip the sort/groupby/join
+
+Domains are in sorted order, as the scorers have always produced them.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.ingest.workbook import file_sha256
+from src.utils import file_size, span
+
+
+DEFAULT_CACHE_DIR = Path("data/cache/domain_docs")
+
+
+@dataclass
+class DomainDocs:
+    """
+    Top-k terms per domain, as text and as weighted sparse vectors.
+    """
+
+    domains: List[str]
+    docs: List[str]
+    terms: List[np.ndarray]
+    weights: List[np.ndarray]
+    sha256: Optional[str] = None
+    top_k: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"domain": self.domains, "doc": self.docs})
+
+    def matrix(self, vocabulary: Mapping[str, int], idf: Optional[np.ndarray] = None) -> sp.csr_matrix:
+        """
+        Domain × vocabulary matrix of centroid weights (optionally scaled by
+        the vectorizer's IDF), rows L2-normalized. Terms outside the
+        vocabulary are dropped.
+        """
+
+        rows, cols, vals = [], [], []
+        for i, (terms, weights) in enumerate(zip(self.terms, self.weights)):
+            idx = np.fromiter((vocabulary.get(t, -1) for t in terms), dtype=np.int64, count=len(terms))
+            keep = idx >= 0
+            rows.append(np.full(int(keep.sum()), i, dtype=np.int64))
+            cols.append(idx[keep])
+            vals.append(np.asarray(weights, dtype=np.float64)[keep])
+
+        W = sp.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(len(self), len(vocabulary)),
+        )
+        if idf is not None:
+            W = W @ sp.diags(np.asarray(idf, dtype=np.float64))
+        norms = np.sqrt(np.asarray(W.multiply(W).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sp.csr_matrix(sp.diags(1.0 / norms) @ W)
+
+
+def build_domain_docs(dv: pd.DataFrame, top_k: int = 80) -> DomainDocs:
+    """
+    Top-k terms per domain from a domain-vector table.
+    """
+
+    top = (
+        dv.sort_values(["domain", "weight"], ascending=[True, False])
+          .groupby("domain", sort=True)
+          .head(top_k)
+    )
+    groups = top.groupby("domain", sort=True)
+    terms = [g["term"].astype(str).to_numpy() for _, g in groups]
+    return DomainDocs(
+        domains=[str(d) for d in groups.groups],
+        docs=[" ".join(t) for t in terms],
+        terms=terms,
+        weights=[g["weight"].to_numpy(dtype=np.float64) for _, g in groups],
+        top_k=top_k,
+    )
+
+
+def _cache_path(cache_dir: Path, sha256: str, top_k: int) -> Path:
+    return cache_dir / f"{sha256[:16]}_k{top_k}.parquet"
+
+
+def load_domain_docs(
+    vector_path: Union[str, Path],
+    top_k: int = 80,
+    *,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+) -> DomainDocs:
+    """
+    Domain documents for a domain-vector file, via the cache when fresh.
+
+    Parameters
+    ----------
+    vector_path : str or Path
+        utsa5_domain_vectors.parquet (domain, term, weight).
+    top_k : int
+        Terms kept per domain.
+    cache_dir : Path, optional
+        Artifact location; None disables the cache.
+    """
+
+    vector_path = Path(vector_path)
+    if not vector_path.exists():
+        raise FileNotFoundError(f"Missing domain vectors: {vector_path.resolve()}")
+
+    with span("domain_docs.load", path=str(vector_path), top_k=top_k) as s:
+        digest = file_sha256(vector_path)
+        cached = _cache_path(cache_dir, digest, top_k) if cache_dir is not None else None
+
+        if cached is not None and cached.exists():
+            df = pd.read_parquet(cached)
+            s.add(cache_hit=True, bytes_read=file_size(cached))
+            return DomainDocs(
+                domains=df["domain"].tolist(),
+                docs=df["doc"].tolist(),
+                terms=[np.asarray(t, dtype=object) for t in df["terms"]],
+                weights=[np.asarray(w, dtype=np.float64) for w in df["weights"]],
+                sha256=digest,
+                top_k=top_k,
+            )
+
+        docs = build_domain_docs(pd.read_parquet(vector_path), top_k)
+        docs.sha256 = digest
+        s.add(cache_hit=False, bytes_read=file_size(vector_path))
+
+        if cached is not None:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            pd.DataFrame({
+                "domain": docs.domains,
+                "doc": docs.docs,
+                "terms": [t.tolist() for t in docs.terms],
+                "weights": [w.tolist() for w in docs.weights],
+            }).to_parquet(cached, index=False)
+        return docs
@@ -0,0 +1,321 @@
+"""
+Domain Vector Build
+
+FEATURES stage (UTSA5 domain vectors):
+- Tokenizes the IPOD FUN corpus once into a sparse term-count matrix and
+  an anchor-presence matrix
+- Publishes both once in shared memory
+- Builds the domains in parallel worker processes: seeded subset (rows
+  hitting enough anchors), min_df/max_df pruning and TF-IDF fitted on
+  that subset only, centroid as the domain vector
+- Merges the vectors in anchor order, so the output does not depend on
+  the worker count
+
+Out-of-core mode (stream_domain_vectors) reads the FUN artifact in
+Parquet batches instead: pass 1 grows the vocabulary and each domain's
+subset document frequencies, pass 2 sums each seeded row's L2-normalized
+TF-IDF vector into per-domain centroid sums. Only one batch of the term
+matrix is ever in memory, so the corpus can outgrow RAM.
+
+Each vector matches fitting a TfidfVectorizer on the domain's seeded
+subset (to floating-point rounding): the global vocabulary is sorted
+like the subset's, and pruning and IDF use the subset's rows alone.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+
+from src.utils import ArraySpec, attach_arrays, share_arrays, span
+
+# Same tokenization as the original per-domain TfidfVectorizer.
+TOKEN_PATTERN = r"(?u)\b\w+\b"
+
+
+def _count_vectorizer(**kwargs) -> CountVectorizer:
+    return CountVectorizer(lowercase=True, token_pattern=TOKEN_PATTERN, dtype=np.int32, **kwargs)
+
+
+def _anchor_vectorizer(anchor_terms: Iterable[str]) -> CountVectorizer:
+    return CountVectorizer(
+        tokenizer=str.split,
+        token_pattern=None,
+        lowercase=False,
+        binary=True,
+        vocabulary=sorted(set(anchor_terms)),
+        dtype=np.int8,
+    )
+
+
+def corpus_matrices(
+    fun_text: pd.Series,
+    anchor_terms: Iterable[str],
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Tokenize the corpus once.
+
+    Returns the CSR parts of the term-count matrix (X_*) and of the binary
+    anchor-presence matrix (A_*), plus the vocabulary. Anchors match
+    whitespace-split tokens exactly, as the seeded retrieval always has.
+    """
+
+    docs = fun_text.fillna("").to_numpy(dtype=object)
+
+    vec = _count_vectorizer()
+    X = vec.fit_transform(docs)
+    A = _anchor_vectorizer(anchor_terms).transform(docs)
+
+    arrays = {
+        "X_data": X.data, "X_indices": X.indices, "X_indptr": X.indptr,
+        "A_data": A.data, "A_indices": A.indices, "A_indptr": A.indptr,
+        "shape": np.array([X.shape[0], X.shape[1], A.shape[1]], dtype=np.int64),
+    }
+    return arrays, vec.get_feature_names_out()
+
+
+def _matrices(arrays: Dict[str, np.ndarray]) -> Tuple[sp.csr_matrix, sp.csr_matrix]:
+    n_rows, n_terms, n_anchors = (int(v) for v in arrays["shape"])
+    X = sp.csr_matrix((arrays["X_data"], arrays["X_indices"], arrays["X_indptr"]), shape=(n_rows, n_terms), copy=False)
+    A = sp.csr_matrix((arrays["A_data"], arrays["A_indices"], arrays["A_indptr"]), shape=(n_rows, n_anchors), copy=False)
+    return X, A
+
+
+def _prune(df: np.ndarray, n_rows: int, min_df: int, max_df: float) -> np.ndarray:
+    keep = np.flatnonzero((df >= min_df) & (df <= max_df * n_rows))
+    if not len(keep):
+        raise ValueError(
+            f"No terms remain after pruning ({n_rows} seeded rows, min_df={min_df}, max_df={max_df})."
+        )
+    return keep
+
+
+def _anchor_columns(domain_anchors: Mapping[str, Set[str]]) -> Tuple[List[str], List[np.ndarray]]:
+    anchor_terms = sorted(set().union(*domain_anchors.values()))
+    col = {t: i for i, t in enumerate(anchor_terms)}
+    cols = [np.array(sorted(col[a] for a in anchors), dtype=np.int64) for anchors in domain_anchors.values()]
+    return anchor_terms, cols
+
+
+def _vector_frame(
+    domains: List[str],
+    vocab: np.ndarray,
+    results: List[Tuple[np.ndarray, np.ndarray, int]],
+    stop_terms: Iterable[str],
+) -> pd.DataFrame:
+    stop = set(stop_terms)
+    frames: List[pd.DataFrame] = []
+    for domain, (keep, weight, n_sub) in zip(domains, results):
+        vec = pd.DataFrame({"term": vocab[keep], "weight": weight})
+        vec = vec.sort_values("weight", ascending=False)
+        vec = vec[~vec["term"].isin(stop)].reset_index(drop=True)
+        vec.insert(0, "domain", domain)
+        vec.insert(1, "subset_rows", n_sub)
+        frames.append(vec)
+    return pd.concat(frames, ignore_index=True)
+
+
+def domain_centroid(
+    arrays: Dict[str, np.ndarray],
+    anchor_cols: np.ndarray,
+    *,
+    min_anchor_hits: int = 2,
+    min_df: int = 10,
+    max_df: float = 0.50,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    TF-IDF centroid of one domain's seeded subset.
+
+    Returns (term_idx, weight, subset_rows): vocabulary columns kept by the
+    subset's min_df/max_df pruning, in vocabulary order, and their weights.
+    """
+
+    X, A = _matrices(arrays)
+    hits = np.asarray(A[:, anchor_cols].sum(axis=1)).ravel()
+    rows = np.flatnonzero(hits >= min_anchor_hits)
+    sub = X[rows]
+
+    df = np.bincount(sub.indices, minlength=sub.shape[1])
+    keep = _prune(df, len(rows), min_df, max_df)
+
+    tfidf = TfidfTransformer().fit_transform(sub[:, keep])
+    centroid = np.asarray(tfidf.mean(axis=0)).ravel()
+    return keep, centroid, len(rows)
+
+
+# --- worker side (state set once per process) ---
+_SPEC: Optional[ArraySpec] = None
+
+
+def _init_worker(spec: ArraySpec) -> None:
+    global _SPEC
+    _SPEC = spec
+
+
+def _centroid_shared(anchor_cols: np.ndarray, kwargs: Dict) -> Tuple[np.ndarray, np.ndarray, int]:
+    return domain_centroid(attach_arrays(_SPEC), anchor_cols, **kwargs)
+
+
+def build_domain_vectors(
+    fun_text: pd.Series,
+    domain_anchors: Mapping[str, Set[str]],
+    *,
+    min_anchor_hits: int = 2,
+    min_df: int = 10,
+    max_df: float = 0.50,
+    stop_terms: Iterable[str] = (),
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Build every domain vector from one shared tokenization of the corpus.
+
+    Parameters
+    ----------
+    fun_text : pd.Series
+        FUN text per IPOD row (space-joined tokens).
+    domain_anchors : mapping of str → set of str
+        Retrieval anchors per domain; output follows this order.
+    min_anchor_hits : int
+        Distinct anchors a row must contain to join a domain's subset.
+    min_df, max_df : int, float
+        Vocabulary pruning, applied to each subset (as TfidfVectorizer).
+    stop_terms : iterable of str
+        Generic terms dropped from every vector after weighting.
+    workers : int, optional
+        Process count (default: os.cpu_count()); 1 builds in-process.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns domain, subset_rows, term, weight; each domain's terms
+        sorted by descending weight.
+    """
+
+    anchor_terms, tasks = _anchor_columns(domain_anchors)
+    with span("domain_vectors.tokenize", rows=len(fun_text)) as s:
+        arrays, vocab = corpus_matrices(fun_text, anchor_terms)
+        s.add(terms=len(vocab), nnz=len(arrays["X_data"]))
+
+    kwargs = {"min_anchor_hits": min_anchor_hits, "min_df": min_df, "max_df": max_df}
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    with span("domain_vectors.build", domains=len(tasks), workers=workers):
+        if workers <= 1:
+            results = [domain_centroid(arrays, cols, **kwargs) for cols in tasks]
+        else:
+            with share_arrays(arrays) as spec:
+                with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(spec,)) as pool:
+                    results = list(pool.map(_centroid_shared, tasks, [kwargs] * len(tasks)))
+
+    return _vector_frame(list(domain_anchors), vocab, results, stop_terms)
+
+
+# ------------------------------------------------------------
+# Out-of-core (streaming) build
+# ------------------------------------------------------------
+
+def iter_fun_text(path: Union[str, Path], batch_rows: int = 65_536, column: str = "fun_text") -> Iterator[np.ndarray]:
+    """
+    FUN texts of a Parquet artifact, one record batch at a time.
+    """
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(path)
+    for batch in pf.iter_batches(batch_size=batch_rows, columns=[column]):
+        yield batch.column(0).fill_null("").to_numpy(zero_copy_only=False)
+
+
+def stream_domain_vectors(
+    path: Union[str, Path],
+    domain_anchors: Mapping[str, Set[str]],
+    *,
+    min_anchor_hits: int = 2,
+    min_df: int = 10,
+    max_df: float = 0.50,
+    stop_terms: Iterable[str] = (),
+    batch_rows: int = 65_536,
+) -> pd.DataFrame:
+    """
+    build_domain_vectors over a Parquet file, in two streaming passes.
+
+    Parameters are as for build_domain_vectors; `batch_rows` bounds the
+    rows held in memory at once. Memory grows with the vocabulary and the
+    number of domains, not with the corpus.
+    """
+
+    domains = list(domain_anchors)
+    anchor_terms, anchor_cols = _anchor_columns(domain_anchors)
+    anchor_vec = _anchor_vectorizer(anchor_terms)
+
+    def seeded_rows(docs: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """
+        Rows seeded into any domain, and each domain's rows as positions
+        within them (only those rows are vectorized).
+        """
+        A = anchor_vec.transform(docs).tocsc()
+        hits = [np.asarray(A[:, cols].sum(axis=1)).ravel() >= min_anchor_hits for cols in anchor_cols]
+        union = np.flatnonzero(np.logical_or.reduce(hits))
+        return union, [np.flatnonzero(h[union]) for h in hits]
+
+    # Pass 1: vocabulary (ids in first-seen order) and per-domain DF.
+    term_id: Dict[str, int] = {}
+    df = np.zeros((len(domains), 0), dtype=np.int64)
+    n_sub = np.zeros(len(domains), dtype=np.int64)
+    with span("domain_vectors.stream_df", path=str(path)) as s:
+        n_rows = 0
+        for docs in iter_fun_text(path, batch_rows):
+            n_rows += len(docs)
+            union, rows = seeded_rows(docs)
+            if not len(union):
+                continue
+
+            vec = _count_vectorizer()
+            try:
+                X = vec.fit_transform(docs[union])
+            except ValueError:
+                continue  # batch without a single token
+            gid = np.fromiter(
+                (term_id.setdefault(t, len(term_id)) for t in vec.get_feature_names_out()),
+                dtype=np.int64,
+            )
+            if len(term_id) > df.shape[1]:
+                df = np.pad(df, ((0, 0), (0, len(term_id) - df.shape[1])))
+
+            for d, r in enumerate(rows):
+                n_sub[d] += len(r)
+                df[d] += np.bincount(gid[X[r].indices], minlength=df.shape[1])
+        s.add(rows=n_rows, terms=len(term_id))
+
+    # Sorted vocabulary, as a TfidfVectorizer fitted in memory would have.
+    vocab = np.array(sorted(term_id), dtype=object)
+    order = np.array([term_id[t] for t in vocab], dtype=np.int64)
+    df = df[:, order] if len(order) else df
+
+    keep = [_prune(df[d], int(n_sub[d]), min_df, max_df) for d in range(len(domains))]
+    # Smoothed IDF, as TfidfTransformer computes it on the subset.
+    idf = [np.log((1 + n_sub[d]) / (1 + df[d, k])) + 1.0 for d, k in enumerate(keep)]
+    sums = [np.zeros(len(k), dtype=np.float64) for k in keep]
+
+    # Pass 2: centroid sums of each seeded row's L2-normalized TF-IDF.
+    with span("domain_vectors.stream_centroids", path=str(path), domains=len(domains)):
+        counter = _count_vectorizer(vocabulary=vocab.tolist())
+        for docs in iter_fun_text(path, batch_rows):
+            union, rows = seeded_rows(docs)
+            if not len(union):
+                continue
+            X = counter.transform(docs[union])
+            for d, r in enumerate(rows):
+                if not len(r):
+                    continue
+                T = X[r][:, keep[d]].astype(np.float64) @ sp.diags(idf[d])
+                norms = np.sqrt(np.asarray(T.multiply(T).sum(axis=1)).ravel())
+                norms[norms == 0] = 1.0
+                sums[d] += np.asarray((sp.diags(1.0 / norms) @ T).sum(axis=0)).ravel()
+
+    results = [(keep[d], sums[d] / n_sub[d], int(n_sub[d])) for d in range(len(domains))]
+    return _vector_frame(domains, vocab, results, stop_terms)
@@ -0,0 +1,356 @@
+"""
+Monte Carlo Robustness of Assignments
+
+ANALYZE stage:
+- Draws B perturbed cost matrices: lognormal noise on each course's IDF,
+  on the four λ tier values, optional noise on the blend weight of a
+  text-similarity cost, and optional per-entry cost noise
+- Builds each batch of draws at once (one stacked weighted-gram product
+  for all D matrices, one gather for all cost matrices)
+- Solves the batches in parallel worker processes over the base
+  artifacts published once in shared memory
+- Reports how often each (mentor degree, mentee degree) pair survives
+  and the distribution of the objective across draws
+
+Every draw has its own seed (seed, draw index), so results do not depend
+on the batch size or worker count.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.model import build_cost_matrix, mentor_capacities, solve_assignment
+from src.similarity import LEVEL_TIERS, idf_weights, level_tiers, weighted_distance_matrix
+from src.utils import ArraySpec, attach_arrays, share_arrays, span
+
+
+@dataclass(frozen=True)
+class Perturbation:
+    """
+    Noise model. Sigmas are on the log scale for weights and costs
+    (a sigma of 0.1 is roughly ±10%); zero disables that source.
+    """
+
+    idf_sigma: float = 0.1
+    tier_sigma: float = 0.1
+    # Share of the text cost in the blend, and its (normal) noise; both
+    # ignored when no text cost is given.
+    blend: float = 0.0
+    blend_sigma: float = 0.0
+    cost_sigma: float = 0.0
+
+
+@dataclass
+class RobustnessReport:
+    """
+    pairs: every (mentor degree, mentee degree) pair assigned in the
+    baseline or any draw, with how much of its baseline count survives.
+    draws: one row per draw.
+    """
+
+    pairs: pd.DataFrame
+    draws: pd.DataFrame
+
+    def summary(self) -> Dict[str, float]:
+        base = self.pairs[self.pairs["baseline"]]
+        obj = self.draws["objective"]
+        return {
+            "draws": float(len(self.draws)),
+            "objective_mean": float(obj.mean()),
+            "objective_std": float(obj.std(ddof=1)) if len(obj) > 1 else 0.0,
+            "objective_p05": float(obj.quantile(0.05)),
+            "objective_p50": float(obj.quantile(0.50)),
+            "objective_p95": float(obj.quantile(0.95)),
+            "churn_mean": float(self.draws["churn"].mean()),
+            "baseline_stability_mean": (
+                float(np.average(base["stability"], weights=base["baseline_count"])) if len(base) else 0.0
+            ),
+            "baseline_stable_share": float((base["stability"] >= 0.9).mean()) if len(base) else 0.0,
+        }
+
+
+def batched_distances(X: np.ndarray, w: np.ndarray) -> np.ndarray:
+    """
+    weighted_distance_matrix(X, w[b]) for every row of w, as one stacked
+    gram product. Returns (B, n, n).
+    """
+
+    Xf = np.asarray(X, dtype=np.float64)
+    W2 = np.asarray(w, dtype=np.float64) ** 2
+    G = np.matmul(Xf[None, :, :] * W2[:, None, :], Xf.T)
+    sq = (W2 @ (Xf ** 2).T)
+
+    D_sq = sq[:, :, None] + sq[:, None, :] - 2.0 * G
+    D_sq = 0.5 * (D_sq + D_sq.transpose(0, 2, 1))
+    np.maximum(D_sq, 0.0, out=D_sq)
+    D = np.sqrt(D_sq)
+    idx = np.arange(D.shape[1])
+    D[:, idx, idx] = 0.0
+    return D
+
+
+def _blend(C: np.ndarray, text_cost: Optional[np.ndarray], alpha) -> np.ndarray:
+    if text_cost is None:
+        return C
+    alpha = np.asarray(alpha, dtype=np.float64)
+    if alpha.ndim:
+        alpha = alpha[:, None, None]
+    return (1.0 - alpha) * C + alpha * text_cost
+
+
+def perturbed_costs(
+    base: Dict[str, np.ndarray],
+    pert: Perturbation,
+    draws: Sequence[int],
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cost matrices (B, n_mentors, n_mentees) and blend weights (B,) for a
+    batch of draw indices.
+    """
+
+    n_courses = base["idf"].shape[0]
+    n_tiers = len(LEVEL_TIERS)
+    text_cost = base.get("text_cost")
+
+    z_idf = np.empty((len(draws), n_courses))
+    z_tier = np.empty((len(draws), n_tiers))
+    z_blend = np.empty(len(draws))
+    rngs = [np.random.default_rng([seed, int(d)]) for d in draws]
+    for b, rng in enumerate(rngs):
+        z_idf[b] = rng.standard_normal(n_courses)
+        z_tier[b] = rng.standard_normal(n_tiers)
+        z_blend[b] = rng.standard_normal()
+
+    idf = base["idf"] * np.exp(pert.idf_sigma * z_idf)
+    tiers = np.asarray(LEVEL_TIERS, dtype=np.float64) * np.exp(pert.tier_sigma * z_tier)
+    w = idf * tiers[:, base["tier"]]
+
+    D = batched_distances(base["X"], w)
+    C = D[:, base["mentor_degree"][:, None], base["mentee_degree"][None, :]]
+
+    alpha = np.clip(pert.blend + pert.blend_sigma * z_blend, 0.0, 1.0)
+    C = _blend(C, text_cost, alpha)
+
+    if pert.cost_sigma:
+        for b, rng in enumerate(rngs):
+            C[b] *= np.exp(pert.cost_sigma * rng.standard_normal(C.shape[1:]))
+    return C, alpha
+
+
+def _solve_batch(
+    base: Dict[str, np.ndarray],
+    pert: Perturbation,
+    method: str,
+    seed: int,
+    draws: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    t0 = time.perf_counter()
+    with span("robustness.batch", draws=len(draws)):
+        C, alpha = perturbed_costs(base, pert, draws, seed)
+
+        n_mentees = C.shape[2]
+        mentor_of = np.full((len(draws), n_mentees), -1, dtype=np.int64)
+        objective = np.empty(len(draws))
+        objective_base = np.empty(len(draws))
+        for b in range(len(draws)):
+            rows, cols = solve_assignment(C[b], method, base["capacity"])
+            mentor_of[b, cols] = rows
+            objective[b] = C[b][rows, cols].sum()
+            objective_base[b] = base["C"][rows, cols].sum()
+
+    return {
+        "draw": np.asarray(draws, dtype=np.int64),
+        "mentor_of": mentor_of,
+        "objective": objective,
+        "objective_base": objective_base,
+        "blend": alpha,
+        "seconds": np.full(len(draws), (time.perf_counter() - t0) / max(len(draws), 1)),
+    }
+
+
+_SPEC: Optional[ArraySpec] = None
+_ARGS: Optional[tuple] = None
+
+
+def _init_worker(spec: ArraySpec, args: tuple) -> None:
+    global _SPEC, _ARGS
+    _SPEC, _ARGS = spec, args
+
+
+def _run_shared(draws: np.ndarray) -> Dict[str, np.ndarray]:
+    return _solve_batch(attach_arrays(_SPEC), *_ARGS, draws)
+
+
+def _degree_pair_table(
+    base_of: np.ndarray,
+    mentor_of: np.ndarray,
+    mentor_degree: np.ndarray,
+    mentee_degree: np.ndarray,
+    D: np.ndarray,
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Stability per (mentor degree, mentee degree) pair, and churn per draw.
+
+    Participants with the same degree have identical costs, so swapping
+    them is free and solver tie-breaking would dominate a per-participant
+    comparison. Each draw is instead reduced to the multiset of degree
+    pairs it assigns (an unmatched mentee counts as mentor degree -1).
+    A pair's cost is its degree distance D, without any text blend.
+    """
+
+    B, n_mentees = mentor_of.shape
+    assigned = np.vstack([base_of[None, :], mentor_of])
+    m_deg = np.where(assigned >= 0, mentor_degree[np.maximum(assigned, 0)], -1)
+
+    n_deg = int(max(mentor_degree.max(initial=0), mentee_degree.max(initial=0))) + 1
+    keys = (m_deg + 1) * n_deg + mentee_degree[None, :]
+    uniq, inv = np.unique(keys, return_inverse=True)
+    inv = inv.reshape(keys.shape)
+    counts = np.zeros((B + 1, len(uniq)), dtype=np.int64)
+    np.add.at(counts, (np.repeat(np.arange(B + 1), n_mentees), inv.ravel()), 1)
+    base, draws = counts[0], counts[1:]
+
+    # Mentees whose degree pair is not covered by the baseline multiset.
+    overlap = np.minimum(draws, base).sum(axis=1)
+    churn = 1.0 - overlap / n_mentees if n_mentees else np.zeros(B)
+
+    mentor, mentee = np.divmod(uniq, n_deg)
+    mentor -= 1
+    in_base = base > 0
+    stability = np.zeros(len(uniq))
+    stability[in_base] = (np.minimum(draws[:, in_base], base[in_base]) / base[in_base]).mean(axis=0)
+
+    matched = mentor >= 0
+    cost = np.full(len(uniq), np.nan)
+    cost[matched] = D[mentor[matched], mentee[matched]]
+
+    seen = (draws > 0).any(axis=0) | in_base
+    alternatives = pd.Series(seen).groupby(mentee).transform("sum").to_numpy()
+
+    table = pd.DataFrame({
+        "mentor_degree": mentor,
+        "mentee_degree": mentee,
+        "cost": cost,
+        "baseline": in_base,
+        "baseline_count": base,
+        "mean_count": draws.mean(axis=0),
+        "stability": stability,
+        "presence": (draws > 0).mean(axis=0),
+        "mentee_alternatives": alternatives,
+    })
+    table = table[seen].sort_values(
+        ["baseline", "stability", "presence"], ascending=[False, False, False], kind="stable"
+    ).reset_index(drop=True)
+    return table, churn
+
+
+def run_robustness(
+    X,
+    course_codes: Sequence[str],
+    mentor_degree,
+    mentee_degree,
+    *,
+    n_draws: int = 200,
+    perturbation: Perturbation = Perturbation(),
+    text_cost: Optional[np.ndarray] = None,
+    method: str = "hungarian",
+    capacity: Union[int, np.ndarray] = 1,
+    batch_size: int = 16,
+    seed: int = 0,
+    workers: Optional[int] = None,
+) -> RobustnessReport:
+    """
+    Solve `n_draws` perturbed problems and measure how the pairing moves.
+
+    Parameters
+    ----------
+    X : array-like or sparse matrix, shape (n_degrees, n_courses)
+        Degree–course incidence matrix (e.g. DegreeCourseMatrix.X).
+    course_codes : sequence of str
+        Course code per column of X (drives the λ tier of each course).
+    mentor_degree, mentee_degree : array-like of int
+        Row of X for each mentor / mentee.
+    n_draws : int
+        Number of perturbed problems B.
+    perturbation : Perturbation
+        Noise model.
+    text_cost : ndarray, shape (n_mentors, n_mentees), optional
+        Text-based cost (e.g. 1 − domain-profile cosine similarity) on the
+        same scale as the degree cost, blended with weight
+        perturbation.blend.
+    method, capacity
+        Passed to solve_assignment for the baseline and every draw.
+    batch_size : int
+        Draws built and solved per task.
+    seed : int
+        Base seed; draw b uses (seed, b).
+    workers : int, optional
+        Process count (default: os.cpu_count()); 1 runs in-process.
+
+    Returns
+    -------
+    RobustnessReport
+        pairs: mentor_degree and mentee_degree (-1 = unmatched), cost
+        (baseline degree distance, without the text blend), whether the
+        pair is in the baseline and how often (baseline_count),
+        mean_count over draws, stability (mean share of the baseline
+        count kept per draw), presence (share of draws using the pair)
+        and the number of distinct mentor degrees the mentee degree saw. draws: per-draw objective (under the draw's own
+        costs), objective_base (same pairs priced at baseline costs),
+        churn (share of mentees whose degree pair is not covered by the
+        baseline's, so free swaps between same-degree participants do
+        not count) and blend weight.
+    """
+
+    if n_draws < 1:
+        raise ValueError(f"n_draws must be at least 1, got {n_draws}.")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}.")
+
+    X = np.asarray(X.toarray() if sp.issparse(X) else X, dtype=np.int8)
+    base = {
+        "X": X,
+        "idf": idf_weights(X),
+        "tier": level_tiers(list(map(str, course_codes))),
+        "mentor_degree": np.asarray(mentor_degree, dtype=np.int64),
+        "mentee_degree": np.asarray(mentee_degree, dtype=np.int64),
+    }
+    base["capacity"] = mentor_capacities(capacity, len(base["mentor_degree"]))
+    if text_cost is not None:
+        base["text_cost"] = np.asarray(text_cost, dtype=np.float64)
+
+    w = idf_weights(X) * np.asarray(LEVEL_TIERS)[base["tier"]]
+    D = weighted_distance_matrix(X, w)
+    C = build_cost_matrix(base["mentor_degree"], base["mentee_degree"], D)
+    base["C"] = _blend(C, base.get("text_cost"), perturbation.blend)
+
+    rows, cols = solve_assignment(base["C"], method, base["capacity"])
+    base_of = np.full(base["C"].shape[1], -1, dtype=np.int64)
+    base_of[cols] = rows
+
+    batches = [np.arange(s, min(s + batch_size, n_draws)) for s in range(0, n_draws, batch_size)]
+    workers = min(workers or os.cpu_count() or 1, len(batches))
+    args = (perturbation, method, seed)
+
+    with span("robustness.run", draws=n_draws, batches=len(batches), workers=workers):
+        if workers <= 1:
+            results: List[Dict[str, np.ndarray]] = [_solve_batch(base, *args, b) for b in batches]
+        else:
+            with share_arrays(base) as spec:
+                with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(spec, args)) as pool:
+                    results = list(pool.map(_run_shared, batches))
+
+    mentor_of = np.vstack([r.pop("mentor_of") for r in results])
+    draws = pd.DataFrame({k: np.concatenate([r[k] for r in results]) for k in results[0]})
+    pairs, draws["churn"] = _degree_pair_table(
+        base_of, mentor_of, base["mentor_degree"], base["mentee_degree"], D
+    )
+    return RobustnessReport(pairs=pairs, draws=draws)
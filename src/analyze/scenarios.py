@@ -0,0 +1,209 @@
+"""
+What-if Scenario Batch Runner
+
+ANALYZE stage:
+- Takes a grid of parameter variations: λ level tiers, top-k course
+  cuts, mentor capacity and solver
+- Publishes the unchanged base artifacts (X, IDF, course level tiers,
+  participant degrees, base cost matrix) once in shared memory
+- Solves the scenarios in parallel worker processes
+- Returns one comparison row per scenario: objective, distance stats and
+  assignment churn against the baseline
+
+Scenarios that only change capacity or solver reuse the shared base cost
+matrix directly; only weighting changes rebuild D (a degree-level
+computation) and the cost matrix.
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.model import build_cost_matrix, solve_assignment
+from src.similarity import LEVEL_TIERS, idf_weights, level_tier, weighted_distance_matrix
+from src.utils import ArraySpec, attach_arrays, share_arrays, span
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One parameter variation. Defaults reproduce the production setup.
+    """
+
+    name: str = "baseline"
+    level_tiers: Tuple[float, float, float, float] = LEVEL_TIERS
+    top_k_courses: Optional[int] = None
+    capacity: int = 1
+    method: str = "hungarian"
+
+    def __post_init__(self):
+        if self.top_k_courses is not None and self.top_k_courses < 1:
+            raise ValueError(f"top_k_courses must be at least 1 (or None for all), got {self.top_k_courses}.")
+
+    @property
+    def weighting(self) -> Tuple[Tuple[float, ...], Optional[int]]:
+        return tuple(self.level_tiers), self.top_k_courses
+
+    @property
+    def params(self) -> tuple:
+        # Everything that affects the solution (not the name).
+        return self.weighting, self.capacity, self.method
+
+
+def scenario_grid(
+    level_tiers: Sequence[Tuple[float, float, float, float]] = (LEVEL_TIERS,),
+    top_k_courses: Sequence[Optional[int]] = (None,),
+    capacity: Sequence[int] = (1,),
+    method: Sequence[str] = ("hungarian",),
+) -> List[Scenario]:
+    """
+    Cartesian product of the given variations, named by their parameters.
+    top_k_courses values must be ≥ 1 (None keeps every course).
+    """
+    out = []
+    for tiers, k, cap, m in itertools.product(level_tiers, top_k_courses, capacity, method):
+        name = f"λ={'/'.join(f'{t:g}' for t in tiers)} k={k or 'all'} cap={cap} {m}"
+        out.append(Scenario(name, tuple(tiers), k, cap, m))
+    return out
+
+
+def top_k_course_mask(W: np.ndarray, k: int) -> np.ndarray:
+    """
+    Boolean mask keeping each degree's k highest-weight courses.
+    """
+    k = min(k, W.shape[1])
+    keep = np.zeros(W.shape, dtype=bool)
+    top = np.argpartition(-W, k - 1, axis=1)[:, :k]
+    np.put_along_axis(keep, top, True, axis=1)
+    return keep & (W > 0)
+
+
+def scenario_cost(base: Dict[str, np.ndarray], sc: Scenario) -> np.ndarray:
+    """
+    Cost matrix for a scenario, built from the base artifacts.
+    """
+    X, idf = base["X"], base["idf"]
+    w = idf * np.asarray(sc.level_tiers, dtype=float)[base["tier"]]
+    if sc.top_k_courses is not None:
+        X = X * top_k_course_mask(X * w, sc.top_k_courses)
+
+    D = weighted_distance_matrix(X, w)
+    return build_cost_matrix(base["mentor_degree"], base["mentee_degree"], D)
+
+
+def _run_one(base: Dict[str, np.ndarray], sc: Scenario, baseline: Scenario) -> Dict[str, object]:
+    t0 = time.perf_counter()
+    with span("scenario.solve", scenario=sc.name):
+        # Same weighting as the baseline: reuse the shared cost matrix.
+        C = base["C"] if sc.weighting == baseline.weighting else scenario_cost(base, sc)
+        rows, cols = solve_assignment(C, sc.method, sc.capacity)
+
+    mentor_of = np.full(C.shape[1], -1, dtype=np.int64)
+    mentor_of[cols] = rows
+    dist = C[rows, cols]
+    return {
+        "pairs": len(rows),
+        "objective": float(dist.sum()),
+        "objective_base": float(base["C"][rows, cols].sum()),
+        "mean_distance": float(dist.mean()) if len(dist) else 0.0,
+        "max_distance": float(dist.max()) if len(dist) else 0.0,
+        "seconds": time.perf_counter() - t0,
+        "mentor_of": mentor_of,
+    }
+
+
+_SPEC: Optional[ArraySpec] = None
+_BASELINE: Optional[Scenario] = None
+
+
+def _init_worker(spec: ArraySpec, baseline: Scenario) -> None:
+    global _SPEC, _BASELINE
+    _SPEC, _BASELINE = spec, baseline
+
+
+def _run_shared(sc: Scenario) -> Dict[str, object]:
+    return _run_one(attach_arrays(_SPEC), sc, _BASELINE)
+
+
+def run_scenarios(
+    X,
+    course_codes: Sequence[str],
+    mentor_degree,
+    mentee_degree,
+    scenarios: Sequence[Scenario],
+    *,
+    baseline: Optional[Scenario] = None,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Solve every scenario and compare it with the baseline.
+
+    Parameters
+    ----------
+    X : array-like, shape (n_degrees, n_courses)
+        Degree–course incidence matrix.
+    course_codes : sequence of str
+        Course code per column of X (drives the λ tier of each course).
+    mentor_degree, mentee_degree : array-like of int
+        Row of X for each mentor / mentee.
+    scenarios : sequence of Scenario
+        Variations to run (see scenario_grid).
+    baseline : Scenario, optional
+        Reference for churn and objective_base (default: Scenario()).
+    workers : int, optional
+        Process count (default: os.cpu_count()); 1 runs in-process.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per distinct parameter set (baseline first; scenarios
+        repeating an earlier one's parameters are skipped). objective is the total
+        distance under the scenario's own weights; objective_base prices
+        the same pairs under the baseline weights; churn is the share of
+        mentees whose mentor differs from the baseline assignment.
+    """
+
+    X = np.asarray(X, dtype=np.int8)
+    baseline = baseline or Scenario()
+    base = {
+        "X": X,
+        "idf": idf_weights(X),
+        "tier": np.array([level_tier(str(c)) for c in course_codes], dtype=np.int8),
+        "mentor_degree": np.asarray(mentor_degree, dtype=np.int64),
+        "mentee_degree": np.asarray(mentee_degree, dtype=np.int64),
+    }
+    base["C"] = scenario_cost(base, baseline)
+
+    # One run per distinct parameter set; the baseline's comes first.
+    todo, seen = [], set()
+    for sc in [baseline, *scenarios]:
+        if sc.params not in seen:
+            seen.add(sc.params)
+            todo.append(sc)
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+
+    with span("scenario.batch", scenarios=len(todo), workers=workers):
+        if workers <= 1:
+            results = [_run_one(base, sc, baseline) for sc in todo]
+        else:
+            with share_arrays(base) as spec:
+                with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(spec, baseline)) as pool:
+                    results = list(pool.map(_run_shared, todo))
+
+    ref = results[0]["mentor_of"]
+    rows = []
+    for sc, res in zip(todo, results):
+        mentor_of = res.pop("mentor_of")
+        rows.append({
+            "scenario": sc.name,
+            **{k: v for k, v in asdict(sc).items() if k != "name"},
+            **res,
+            "churn": float((mentor_of != ref).mean()) if len(ref) else 0.0,
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,176 @@
+"""
+Compact Dictionary Encoding for Participant Tables
+
+CLEAN stage:
+- Turns participant IDs, degrees and domains into pandas categoricals
+  plus explicit int32 code columns
+- Keeps one code → label map per vocabulary (CodeBook), stored once
+  alongside the cleaned tables
+- Lets cost-matrix builders and solvers work purely on integer arrays
+
+A vocabulary can be shared by several columns (e.g. mentor degrees and
+student majors both use "degree"), so equal labels always get equal codes.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+UNKNOWN_CODE = -1
+
+
+def _as_labels(values) -> pd.Series:
+    # Labels are always stored as str; missing values stay missing.
+    s = pd.Series(np.asarray(values, dtype=object))
+    return s.where(s.isna(), s.astype(str))
+
+
+class CodeBook:
+    """
+    Code → label maps, one per named vocabulary. Code i is labels[i].
+    """
+
+    def __init__(self, vocabularies: Optional[Dict[str, Sequence[str]]] = None):
+        self._labels: Dict[str, pd.Index] = {
+            name: pd.Index(labels, dtype=object)
+            for name, labels in (vocabularies or {}).items()
+        }
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._labels
+
+    @property
+    def vocabularies(self) -> Dict[str, pd.Index]:
+        return dict(self._labels)
+
+    def labels(self, name: str) -> pd.Index:
+        return self._labels[name]
+
+    def extend(self, name: str, values: Iterable) -> pd.Index:
+        """
+        Append unseen labels to a vocabulary in first-appearance order, so
+        codes are deterministic for a given input order.
+        """
+        current = self._labels.get(name, pd.Index([], dtype=object))
+        incoming = pd.Index(pd.unique(_as_labels(values).dropna()), dtype=object)
+        new = incoming[~incoming.isin(current)]
+        if len(new):
+            current = current.append(new)
+        self._labels[name] = current
+        return current
+
+    def encode(self, name: str, values) -> np.ndarray:
+        """
+        int32 codes for values; unknown or missing values map to -1.
+        """
+        return self._labels[name].get_indexer(_as_labels(values)).astype(np.int32)
+
+    def decode(self, name: str, codes) -> np.ndarray:
+        codes = np.asarray(codes)
+        labels = self._labels[name].to_numpy()
+        out = np.empty(codes.shape, dtype=object)
+        known = codes >= 0
+        out[known] = labels[codes[known]]
+        out[~known] = None
+        return out
+
+    def categorical(self, name: str, values) -> pd.Categorical:
+        return pd.Categorical.from_codes(self.encode(name, values), categories=self._labels[name])
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.concat(
+            [
+                pd.DataFrame({
+                    "vocabulary": name,
+                    "code": np.arange(len(labels), dtype=np.int32),
+                    "label": labels.astype(str),
+                })
+                for name, labels in self._labels.items()
+            ],
+            ignore_index=True,
+        ) if self._labels else pd.DataFrame(columns=["vocabulary", "code", "label"])
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.to_frame().to_parquet(path, index=False)
+
+    @classmethod
+    def load(cls, path: Path) -> "CodeBook":
+        df = pd.read_parquet(path).sort_values(["vocabulary", "code"])
+        return cls({
+            name: g["label"].tolist()
+            for name, g in df.groupby("vocabulary", sort=False)
+        })
+
+
+def encode_columns(
+    df: pd.DataFrame,
+    columns: Dict[str, str],
+    codebook: CodeBook,
+    *,
+    suffix: str = "_code",
+) -> pd.DataFrame:
+    """
+    Dictionary-encode columns in place of their string values.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    columns : Dict[str, str]
+        Column name → vocabulary name in the codebook. Vocabularies are
+        extended with any labels not seen before.
+    codebook : CodeBook
+    suffix : str
+        Each column gets an int32 sibling named <column><suffix>.
+
+    Returns
+    -------
+    pd.DataFrame
+        Copy of df where each encoded column is a categorical sharing the
+        vocabulary's categories.
+    """
+
+    out = df.copy()
+    for col, vocab in columns.items():
+        codebook.extend(vocab, out[col])
+        codes = codebook.encode(vocab, out[col])
+        out[col] = pd.Categorical.from_codes(codes, categories=codebook.labels(vocab))
+        out[col + suffix] = codes
+    return out
+
+
+def degree_codebook(degree_labels: Sequence[str], name: str = "degree") -> CodeBook:
+    """
+    Codebook whose codes are the row/column positions of a degree distance
+    matrix, so encoded degrees index D directly in build_cost_matrix.
+    """
+    return CodeBook({name: list(map(str, degree_labels))})
+
+
+def code_positions(
+    codes,
+    codebook: CodeBook,
+    labels: Sequence[str],
+    name: str = "degree",
+) -> np.ndarray:
+    """
+    Position in `labels` (e.g. D's index) of each encoded value; -1 when
+    the code is unknown or its label is not in `labels`.
+
+    Codes from degree_codebook(labels) are returned as they are; any other
+    vocabulary is remapped with one lookup per label, never per row.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    vocab = codebook.labels(name)
+    labels = pd.Index(list(map(str, labels)), dtype=object)
+
+    n = len(labels)
+    if len(vocab) >= n and vocab[:n].equals(labels):
+        return np.where(codes < n, codes, -1)
+
+    remap = np.append(labels.get_indexer(vocab.astype(str)), -1)
+    return remap[codes]
@@ -0,0 +1,290 @@
+"""
+Degree Entity Resolution
+
+CLEAN stage:
+- Builds a character n-gram TF-IDF index over every alias of every
+  canonical degree (dictionary names, short names, variable names, codes
+  and the degree labels themselves)
+- Resolves a whole column at once: values are normalized to a compact
+  key, deduplicated, matched exactly where possible and otherwise by one
+  blocked sparse cosine product (src.similarity.blocked_cosine_similarity)
+- Keeps a confidence score per value and the margin over the best
+  different degree, so weak or ambiguous matches stay visible
+- Caches results by normalized key, optionally persisted as Parquet and
+  invalidated when the alias index changes
+
+Registration exports with thousands of spellings of the same 17 degrees
+then cost one sparse product over their distinct keys.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.ingest.parsers import normalize_series
+from src.similarity import blocked_cosine_similarity
+from src.utils import span
+
+
+# Degree dictionary columns (notebook Appendix A.2) used as aliases.
+DICTIONARY_ALIAS_COLS = ("Full_Name", "Short_Name", "Canonical_Name", "Variable_Name", "Degree_Code")
+DICTIONARY_INDEX_COL = "Kᵢ"
+
+METHODS = ("exact", "fuzzy", "unresolved")
+
+# Aliases compared per value; the best different degree among them gives
+# the margin.
+_CANDIDATES = 8
+
+
+def resolution_keys(s: pd.Series) -> pd.Series:
+    """
+    Compact match key: normalize_series(), leading zeros of numbers
+    dropped, spaces removed ("i1_" and "I01" → "i1"; "B.B.A. Degree in
+    Accounting" and "BBA_Degree_in_Accounting" → "bbadegreeinaccounting").
+    """
+    return (
+        normalize_series(s)
+        .str.replace(r"(?<![0-9])0+(?=[0-9])", "", regex=True)
+        .str.replace(" ", "", regex=False)
+    )
+
+
+def degree_label(k: int) -> str:
+    # Kᵢ → degree label, as in the degree distance matrix (1 → "i01").
+    return f"i{int(k):02d}"
+
+
+def degree_aliases(
+    labels: Optional[Sequence[str]] = None,
+    dictionary: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Alias table (alias, label) for the degree resolver.
+
+    Parameters
+    ----------
+    labels : sequence of str, optional
+        Canonical degree labels (e.g. the degree_distance index); each is
+        an alias of itself.
+    dictionary : pd.DataFrame, optional
+        Degree dictionary with a Kᵢ column and any of
+        DICTIONARY_ALIAS_COLS; every name becomes an alias of
+        degree_label(Kᵢ).
+    """
+
+    parts = []
+    if labels is not None:
+        labels = pd.Series(list(labels), dtype=object).astype(str)
+        parts.append(pd.DataFrame({"alias": labels, "label": labels}))
+
+    if dictionary is not None:
+        label = dictionary[DICTIONARY_INDEX_COL].map(degree_label)
+        for col in DICTIONARY_ALIAS_COLS:
+            if col in dictionary.columns:
+                parts.append(pd.DataFrame({"alias": dictionary[col].astype(str), "label": label}))
+
+    if not parts:
+        raise ValueError("degree_aliases needs labels, a dictionary, or both.")
+    return pd.concat(parts, ignore_index=True).dropna().drop_duplicates(ignore_index=True)
+
+
+def code_aliases(values) -> pd.DataFrame:
+    """
+    Alias table from observed values alone, labelled as the former regex
+    repair did: underscores dropped and single-digit codes zero-padded
+    ("i1_" → "i01"); names are kept as written ("Business Analytics").
+    Values sharing a key take the label of the first one seen. Used,
+    exact-only, when neither a degree dictionary nor a distance matrix
+    exists yet.
+    """
+    values = pd.Series(pd.unique(pd.Series(values, dtype=object).dropna().astype(str)), dtype=object)
+    table = pd.DataFrame({
+        "alias": values,
+        "label": values.str.replace("_", "", regex=False).str.replace(r"^i(\d)$", r"i0\1", regex=True),
+    })
+    keys = resolution_keys(values)
+    return table[(keys != "") & ~keys.duplicated()].reset_index(drop=True)
+
+
+class EntityResolver:
+    """
+    Batch resolver of free-text values to canonical labels.
+
+    Parameters
+    ----------
+    aliases : pd.DataFrame
+        Columns alias, label (e.g. degree_aliases()). Aliases whose keys
+        collide across labels are dropped as ambiguous.
+    min_confidence : float
+        Cosine score a fuzzy match needs to be accepted.
+    min_margin : float
+        Required lead over the best alias of a different label; closer
+        calls are left unresolved.
+    min_fuzzy_length : int
+        Keys shorter than this (codes such as "i1" or "zz") are only
+        matched exactly.
+    ngram_range : (int, int)
+        Character n-gram sizes of the index.
+    cache_path : Path, optional
+        Parquet file persisting resolutions across runs.
+    block_size : int
+        Query rows per block of the cosine product.
+    """
+
+    def __init__(
+        self,
+        aliases: pd.DataFrame,
+        *,
+        min_confidence: float = 0.6,
+        min_margin: float = 0.05,
+        min_fuzzy_length: int = 4,
+        ngram_range: Tuple[int, int] = (2, 4),
+        cache_path: Optional[Union[str, Path]] = None,
+        block_size: int = 4096,
+    ):
+        table = pd.DataFrame({
+            "key": resolution_keys(aliases["alias"]).to_numpy(),
+            "alias": aliases["alias"].astype(str).to_numpy(),
+            "label": aliases["label"].astype(str).to_numpy(),
+        })
+        table = table[table["key"] != ""]
+        clash = table.groupby("key")["label"].transform("nunique") > 1
+        table = table[~clash].drop_duplicates("key", ignore_index=True)
+        if table.empty:
+            raise ValueError("EntityResolver needs at least one unambiguous alias.")
+
+        self.aliases = table
+        self.min_confidence = min_confidence
+        self.min_margin = min_margin
+        self.min_fuzzy_length = min_fuzzy_length
+        self.block_size = block_size
+
+        self._exact: Dict[str, int] = dict(zip(table["key"], range(len(table))))
+        self._label_codes = pd.factorize(table["label"])[0]
+        self._vectorizer = TfidfVectorizer(analyzer="char", ngram_range=ngram_range, dtype=np.float32)
+        self._index = self._vectorizer.fit_transform(table["key"])
+        self.digest = hashlib.sha1(
+            "\n".join(table["key"] + "\t" + table["label"]).encode() + repr(ngram_range).encode()
+        ).hexdigest()
+
+        # key → (alias row, score, margin); thresholds are applied on read,
+        # so cached entries stay valid when they change.
+        self._cache: Dict[str, Tuple[int, float, float]] = {}
+        self._dirty = False
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        if self.cache_path is not None and self.cache_path.exists():
+            self._load_cache()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    # --------------------------------------------------------
+    # Cache
+    # --------------------------------------------------------
+
+    def _load_cache(self) -> None:
+        df = pd.read_parquet(self.cache_path)
+        df = df[df["index_digest"] == self.digest]
+        self._cache = {
+            k: (int(r), float(s), float(m))
+            for k, r, s, m in zip(df["key"], df["alias_row"], df["score"], df["margin"])
+        }
+
+    def save(self) -> None:
+        if self.cache_path is None or not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        df = pd.DataFrame(list(self._cache.values()), columns=["alias_row", "score", "margin"])
+        df.insert(0, "key", pd.Series(list(self._cache), dtype=object))
+        df["index_digest"] = self.digest
+        df.to_parquet(self.cache_path, index=False)
+        self._dirty = False
+
+    # --------------------------------------------------------
+    # Matching
+    # --------------------------------------------------------
+
+    def _match(self, keys: Sequence[str]) -> None:
+        """
+        Resolve uncached keys into the cache: exact lookups first, one
+        top-k cosine product for the rest.
+        """
+        fuzzy = []
+        for k in keys:
+            row = self._exact.get(k)
+            if row is not None:
+                self._cache[k] = (row, 1.0, 1.0)
+            elif len(k) >= self.min_fuzzy_length:
+                fuzzy.append(k)
+            else:
+                self._cache[k] = (-1, 0.0, 0.0)
+
+        if fuzzy:
+            k = min(_CANDIDATES, len(self.aliases))
+            idx, score = blocked_cosine_similarity(
+                self._vectorizer.transform(fuzzy), self._index,
+                top_k=k, block_size=self.block_size,
+            )
+            codes = self._label_codes[idx]
+            other = codes != codes[:, :1]
+            runner_up = np.where(other.any(axis=1), score[np.arange(len(fuzzy)), other.argmax(axis=1)], 0.0)
+            margin = score[:, 0] - runner_up
+            for key, row, s, m in zip(fuzzy, idx[:, 0], score[:, 0], margin):
+                # No shared n-gram: nothing to point at.
+                self._cache[key] = (int(row), float(s), float(m)) if s > 0 else (-1, 0.0, 0.0)
+
+        self._dirty = self._dirty or bool(len(keys))
+
+    def resolve(self, values: Union[pd.Series, Iterable]) -> pd.DataFrame:
+        """
+        Resolve every value; each distinct key is matched at most once.
+
+        Returns
+        -------
+        pd.DataFrame
+            Aligned with `values`:
+            label (accepted canonical label, missing when unresolved),
+            candidate (best label regardless of thresholds), match (the
+            alias it matched), confidence (cosine score; 1.0 for exact),
+            margin (lead over the best other label) and method
+            (exact / fuzzy / unresolved).
+        """
+
+        values = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+
+        with span("clean.resolve", rows=len(values)) as s:
+            keys = resolution_keys(values)
+            uniq = pd.unique(keys)
+            new = [k for k in uniq if k not in self._cache]
+            self._match(new)
+
+            hits = [self._cache[k] for k in uniq]
+            rows = np.fromiter((h[0] for h in hits), dtype=np.int64, count=len(uniq))
+            score = np.fromiter((h[1] for h in hits), dtype=np.float64, count=len(uniq))
+            margin = np.fromiter((h[2] for h in hits), dtype=np.float64, count=len(uniq))
+
+            found = rows >= 0
+            exact = np.fromiter((k in self._exact for k in uniq), dtype=bool, count=len(uniq))
+            accepted = exact | (found & (score >= self.min_confidence) & (margin >= self.min_margin))
+            method = np.where(exact, "exact", np.where(accepted, "fuzzy", "unresolved"))
+
+            safe = np.where(found, rows, 0)
+            candidate = np.where(found, self.aliases["label"].to_numpy()[safe], None)
+            per_key = pd.DataFrame({
+                "label": np.where(accepted, candidate, None),
+                "candidate": candidate,
+                "match": np.where(found, self.aliases["alias"].to_numpy()[safe], None),
+                "confidence": score,
+                "margin": margin,
+                "method": pd.Categorical(method, categories=METHODS),
+            })
+
+            pos = pd.Index(uniq).get_indexer(keys)
+            out = per_key.iloc[pos].set_index(values.index)
+            s.add(distinct=len(uniq), new=len(new), resolved=int(accepted[pos].sum()))
+        return out
@@ -0,0 +1,368 @@
+"""
+Typed, validated project configuration.
+
+The YAML config is parsed once into frozen dataclasses: every artifact
+path is resolved, solver names, worker counts, chunk sizes, ports and
+URLs are checked, and unknown keys are rejected. A misconfigured run
+fails at startup with a ConfigError naming the offending key.
+
+    from src.config import get_config
+
+    cfg = get_config()               # $MENTOR_CONFIG or config/default.yaml
+    df = pd.read_parquet(cfg.paths.mentor_ids)
+
+Sections missing from a config file take the defaults below, which
+mirror config/default.yaml.
+"""
+
+import os
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from src.utils import DEFAULT_CONFIG_PATH, load_config
+
+
+# Names accepted by src.model.solve_assignment (kept here so validating a
+# config does not import the numerical stack).
+SOLVER_NAMES = ("hungarian", "min_cost_flow", "milp", "auction", "stable", "bottleneck")
+
+CSV_BACKENDS = ("auto", "cudf", "pandas")
+
+# How scorers represent a domain: its top-k terms as text refit in the
+# joint TF-IDF space, or the stored centroid weights (× joint IDF).
+DOMAIN_WEIGHTINGS = ("text", "centroid")
+
+
+class ConfigError(ValueError):
+    """
+    Invalid or inconsistent configuration.
+    """
+
+
+@dataclass(frozen=True)
+class DataConfig:
+    catalog_scope: Optional[str] = None
+    base_url: Optional[str] = None
+    utsa_catalog_urls: Dict[str, str] = field(default_factory=dict)
+
+    def require_base_url(self) -> str:
+        if not self.base_url:
+            raise ConfigError("data.base_url is required for this crawl.")
+        return self.base_url
+
+
+@dataclass(frozen=True)
+class CrawlConfig:
+    """
+    Catalog discovery rules (src.ingest.frontier). Depth counts path
+    segments below the page a crawl starts from.
+    """
+
+    # Every crawl stays under this path prefix (None = under its seed only).
+    prefix: Optional[str] = "/undergraduate/"
+    max_depth: int = 1
+    max_pages: int = 2000
+    # Seed the frontier from this sitemap instead of following links.
+    sitemap_url: Optional[str] = None
+    timeout_s: float = 30.0
+
+
+@dataclass(frozen=True)
+class PathsConfig:
+    """
+    Pipeline artifacts, in stage order. Relative paths resolve against the
+    working directory (the project root); `~` expands to the home directory.
+    """
+
+    ipod_csv: Path = Path("~/workspace/datasets/IPOD/data/ipod_ner.csv")
+    mentor_student_xlsx: Path = Path("data/raw/Mentor_Student.xlsx")
+    mentee_xlsx: Path = Path("data/raw/Mentee Data.xlsx")
+    catalog_courses: Path = Path("data/raw/catalog_courses.parquet")
+
+    student_clean: Path = Path("data/cleaned/student_clean.parquet")
+    mentor_clean: Path = Path("data/cleaned/mentor_clean.parquet")
+    student_ids: Path = Path("data/cleaned/student_clean_ids.parquet")
+    mentor_ids: Path = Path("data/cleaned/mentor_clean_ids.parquet")
+    codebook: Path = Path("data/cleaned/codebook.parquet")
+
+    ipod_fun: Path = Path("data/features/ipod_fun.parquet")
+    domain_vectors: Path = Path("data/features/utsa5_domain_vectors.parquet")
+    mentor_domain_profiles: Path = Path("data/features/mentor_domain_profiles.parquet")
+    degree_course_matrix: Path = Path("data/features/degree_course_matrix.npz")
+    degree_dictionary: Path = Path("data/features/degree_dictionary.parquet")
+    degree_distance: Path = Path("data/features/degree_distance_idf.parquet")
+    degree_embedding: Path = Path("data/features/degree_embedding.npz")
+
+    pairings: Path = Path("outputs/pairings.parquet")
+    first5_scores: Path = Path("outputs/utsa5_first5_scores.csv")
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    excel_dir: Path = Path("data/cache/excel")
+    token_cache: Path = Path("data/features/token_cache.parquet")
+    domain_docs: Path = Path("data/cache/domain_docs")
+    entity_resolution: Path = Path("data/cache/entity_resolution.parquet")
+
+
+@dataclass(frozen=True)
+class ComputeConfig:
+    # Default process/thread count for parallel stages (None = all cores).
+    workers: Optional[int] = None
+    similarity_block_size: int = 4096
+    read_batch_rows: int = 65_536
+    csv_backend: str = "auto"
+    # Build domain vectors out-of-core, reading ipod_fun in batches.
+    streaming: bool = False
+
+    @property
+    def resolved_workers(self) -> int:
+        return self.workers or os.cpu_count() or 1
+
+
+@dataclass(frozen=True)
+class CleanConfig:
+    # Degree/major entity resolution (src.clean.entity_resolution).
+    min_confidence: float = 0.6
+    min_margin: float = 0.05
+    min_fuzzy_length: int = 4
+
+
+@dataclass(frozen=True)
+class OptimizeConfig:
+    mentor_degree_col: str = "standardized_degree"
+    mentee_degree_col: str = "standardized_major_id"
+    solver: str = "hungarian"
+    # Mentees per mentor: an integer, or a mentor column name.
+    capacity: Union[int, str] = 1
+    partition_key: Optional[str] = None
+    max_distance: Optional[float] = None
+    workers: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    domain_top_k: int = 80
+    domain_weighting: str = "text"
+
+
+@dataclass(frozen=True)
+class ReportConfig:
+    # Also write a capped .xlsx next to each Parquet result.
+    excel: bool = False
+    excel_max_rows: int = 5_000
+    excel_max_cols: int = 100
+    float_decimals: Optional[int] = 4
+
+
+@dataclass(frozen=True)
+class ServiceConfig:
+    host: str = "127.0.0.1"
+    port: int = 8765
+    domain_top_k: int = 80
+    reload_interval_s: float = 2.0
+    # LRU entries kept for /explain (per degree pair and per participant pair).
+    explain_cache_size: int = 4096
+
+
+@dataclass(frozen=True)
+class InstrumentationConfig:
+    enabled: bool = False
+    trace_path: Path = Path("outputs/trace.json")
+    sample_interval_s: float = 0.05
+    profile_stage: Optional[str] = None
+    profile_path: Optional[Path] = Path("outputs/profile.prof")
+
+
+@dataclass(frozen=True)
+class Config:
+    source: Optional[Path]
+    data: DataConfig
+    crawl: CrawlConfig
+    paths: PathsConfig
+    cache: CacheConfig
+    compute: ComputeConfig
+    clean: CleanConfig
+    optimize: OptimizeConfig
+    scoring: ScoringConfig
+    report: ReportConfig
+    service: ServiceConfig
+    instrumentation: InstrumentationConfig
+    # The parsed YAML, for consumers that still take the plain dict
+    # (e.g. configure_instrumentation).
+    raw: Dict[str, Any] = field(repr=False, default_factory=dict)
+
+    def workers(self, override: Optional[int] = None) -> int:
+        """
+        Worker count for a stage: explicit override, else compute.workers.
+        """
+        return override or self.compute.resolved_workers
+
+
+# ------------------------------------------------------------
+# Parsing and validation
+# ------------------------------------------------------------
+
+def _resolve(value: Any, where: str) -> Path:
+    if not isinstance(value, (str, Path)) or not str(value).strip():
+        raise ConfigError(f"{where} must be a path, got {value!r}.")
+    return Path(os.path.expandvars(str(value))).expanduser()
+
+
+def _section(cls, raw: Any, name: str, paths: tuple = ()):
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ConfigError(f"Section '{name}' must be a mapping.")
+
+    known = {f.name for f in fields(cls)}
+    unknown = set(raw) - known
+    if unknown:
+        raise ConfigError(f"Unknown key(s) in '{name}': {sorted(unknown)}. Allowed: {sorted(known)}")
+
+    values = dict(raw)
+    for key in paths:
+        value = values.get(key, getattr(cls, key))
+        if value is not None:
+            values[key] = _resolve(value, f"{name}.{key}")
+    return cls(**values)
+
+
+def _check(cond: bool, msg: str) -> None:
+    if not cond:
+        raise ConfigError(msg)
+
+
+def _positive_int(value: Any, where: str, optional: bool = False) -> None:
+    if optional and value is None:
+        return
+    _check(isinstance(value, int) and not isinstance(value, bool) and value > 0,
+           f"{where} must be a positive integer, got {value!r}.")
+
+
+def _validate(cfg: Config) -> None:
+    for name, url in cfg.data.utsa_catalog_urls.items():
+        _check(isinstance(url, str) and url.startswith(("http://", "https://")),
+               f"data.utsa_catalog_urls.{name} must be an http(s) URL, got {url!r}.")
+    if cfg.data.base_url is not None:
+        _check(str(cfg.data.base_url).startswith(("http://", "https://")),
+               f"data.base_url must be an http(s) URL, got {cfg.data.base_url!r}.")
+
+    cr = cfg.crawl
+    _check(cr.prefix is None or (isinstance(cr.prefix, str) and cr.prefix.startswith("/")),
+           f"crawl.prefix must be a URL path starting with '/', got {cr.prefix!r}.")
+    _positive_int(cr.max_depth, "crawl.max_depth")
+    _positive_int(cr.max_pages, "crawl.max_pages")
+    _check(cr.sitemap_url is None or str(cr.sitemap_url).startswith(("http://", "https://")),
+           f"crawl.sitemap_url must be an http(s) URL, got {cr.sitemap_url!r}.")
+    _check(isinstance(cr.timeout_s, (int, float)) and cr.timeout_s > 0,
+           f"crawl.timeout_s must be > 0, got {cr.timeout_s!r}.")
+
+    c = cfg.compute
+    _positive_int(c.workers, "compute.workers", optional=True)
+    _positive_int(c.similarity_block_size, "compute.similarity_block_size")
+    _positive_int(c.read_batch_rows, "compute.read_batch_rows")
+    _check(isinstance(c.streaming, bool), f"compute.streaming must be true or false, got {c.streaming!r}.")
+    _check(c.csv_backend in CSV_BACKENDS,
+           f"compute.csv_backend must be one of {CSV_BACKENDS}, got {c.csv_backend!r}.")
+
+    cl = cfg.clean
+    for key in ("min_confidence", "min_margin"):
+        value = getattr(cl, key)
+        _check(isinstance(value, (int, float)) and not isinstance(value, bool) and 0 <= value <= 1,
+               f"clean.{key} must be between 0 and 1, got {value!r}.")
+    _positive_int(cl.min_fuzzy_length, "clean.min_fuzzy_length")
+
+    o = cfg.optimize
+    _check(o.solver in SOLVER_NAMES, f"optimize.solver must be one of {SOLVER_NAMES}, got {o.solver!r}.")
+    _check(
+        isinstance(o.capacity, str) or (isinstance(o.capacity, int) and not isinstance(o.capacity, bool) and o.capacity >= 0),
+        f"optimize.capacity must be a non-negative integer or a column name, got {o.capacity!r}.",
+    )
+    _check(o.max_distance is None or (isinstance(o.max_distance, (int, float)) and o.max_distance >= 0),
+           f"optimize.max_distance must be a non-negative number, got {o.max_distance!r}.")
+    _positive_int(o.workers, "optimize.workers", optional=True)
+
+    sc = cfg.scoring
+    _positive_int(sc.domain_top_k, "scoring.domain_top_k")
+    _check(sc.domain_weighting in DOMAIN_WEIGHTINGS,
+           f"scoring.domain_weighting must be one of {DOMAIN_WEIGHTINGS}, got {sc.domain_weighting!r}.")
+
+    r = cfg.report
+    _check(isinstance(r.excel, bool), f"report.excel must be true or false, got {r.excel!r}.")
+    _positive_int(r.excel_max_rows, "report.excel_max_rows")
+    _positive_int(r.excel_max_cols, "report.excel_max_cols")
+    _check(r.float_decimals is None or (isinstance(r.float_decimals, int) and r.float_decimals >= 0),
+           f"report.float_decimals must be a non-negative integer, got {r.float_decimals!r}.")
+
+    s = cfg.service
+    _check(isinstance(s.port, int) and 0 < s.port < 65536, f"service.port must be 1–65535, got {s.port!r}.")
+    _positive_int(s.domain_top_k, "service.domain_top_k")
+    _positive_int(s.explain_cache_size, "service.explain_cache_size")
+    _check(isinstance(s.reload_interval_s, (int, float)) and s.reload_interval_s >= 0,
+           f"service.reload_interval_s must be ≥ 0, got {s.reload_interval_s!r}.")
+
+    i = cfg.instrumentation
+    _check(isinstance(i.sample_interval_s, (int, float)) and i.sample_interval_s > 0,
+           f"instrumentation.sample_interval_s must be > 0, got {i.sample_interval_s!r}.")
+
+
+def parse_config(raw: Optional[Dict[str, Any]], source: Optional[Path] = None) -> Config:
+    """
+    Build and validate a Config from a parsed YAML mapping.
+    """
+
+    raw = raw or {}
+    _check(isinstance(raw, dict), "Config root must be a mapping.")
+
+    sections = {f.name for f in fields(Config)} - {"source", "raw"}
+    unknown = set(raw) - sections
+    if unknown:
+        raise ConfigError(f"Unknown config section(s): {sorted(unknown)}. Allowed: {sorted(sections)}")
+
+    path_fields = tuple(f.name for f in fields(PathsConfig))
+    cfg = Config(
+        source=source,
+        data=_section(DataConfig, raw.get("data"), "data"),
+        crawl=_section(CrawlConfig, raw.get("crawl"), "crawl"),
+        paths=_section(PathsConfig, raw.get("paths"), "paths", path_fields),
+        cache=_section(CacheConfig, raw.get("cache"), "cache", ("excel_dir", "token_cache", "domain_docs", "entity_resolution")),
+        compute=_section(ComputeConfig, raw.get("compute"), "compute"),
+        clean=_section(CleanConfig, raw.get("clean"), "clean"),
+        optimize=_section(OptimizeConfig, raw.get("optimize"), "optimize"),
+        scoring=_section(ScoringConfig, raw.get("scoring"), "scoring"),
+        report=_section(ReportConfig, raw.get("report"), "report"),
+        service=_section(ServiceConfig, raw.get("service"), "service"),
+        instrumentation=_section(
+            InstrumentationConfig, raw.get("instrumentation"), "instrumentation",
+            ("trace_path", "profile_path"),
+        ),
+        raw=raw,
+    )
+    _validate(cfg)
+    return cfg
+
+
+def load(path: Union[str, Path, None] = None) -> Config:
+    """
+    Read and validate a YAML config file.
+    """
+    path = Path(path or os.environ.get("MENTOR_CONFIG", DEFAULT_CONFIG_PATH))
+    if not path.exists():
+        raise ConfigError(f"Config file not found: {path.resolve()}")
+    return parse_config(load_config(path), source=path)
+
+
+_CONFIGS: Dict[str, Config] = {}
+
+
+def get_config(path: Union[str, Path, None] = None) -> Config:
+    """
+    The validated config for `path` (default: $MENTOR_CONFIG or
+    config/default.yaml), parsed once per process.
+    """
+    key = str(path or os.environ.get("MENTOR_CONFIG", DEFAULT_CONFIG_PATH))
+    if key not in _CONFIGS:
+        _CONFIGS[key] = load(key)
+    return _CONFIGS[key]
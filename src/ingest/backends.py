@@ -0,0 +1,88 @@
+"""
+Optional DataFrame Backends
+
+INGEST stage:
+- Reads large CSVs through a pluggable backend: cuDF (GPU) when it is
+  installed and a device is usable, pandas (CPU, pyarrow engine when
+  available) otherwise
+- Backends are imported only when selected, so CPU-only nodes never
+  touch cudf and CLI startup stays fast
+
+Frames are converted to pandas unless the caller asks for the backend's
+native frame (to_pandas=False), e.g. to keep computing on the GPU.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+def _read_csv_cudf(path, usecols: Optional[Sequence[str]]):
+    import cudf
+
+    return cudf.read_csv(path, usecols=usecols)
+
+
+def _read_csv_pandas(path, usecols: Optional[Sequence[str]]) -> pd.DataFrame:
+    try:
+        import pyarrow  # noqa: F401
+        engine = "pyarrow"
+    except ImportError:
+        engine = "c"
+    return pd.read_csv(path, usecols=usecols, engine=engine)
+
+
+# Preference order for backend="auto".
+CSV_READERS: Dict[str, Callable] = {
+    "cudf": _read_csv_cudf,
+    "pandas": _read_csv_pandas,
+}
+
+
+def read_csv(
+    path,
+    usecols: Optional[Sequence[str]] = None,
+    *,
+    backend: str = "auto",
+    to_pandas: bool = True,
+) -> Tuple[Any, str]:
+    """
+    Read a CSV with the first working backend.
+
+    Parameters
+    ----------
+    backend : str
+        "auto" tries CSV_READERS in order and falls back on ImportError
+        or a GPU runtime error; a named backend is used as-is.
+    to_pandas : bool
+        Convert the frame to pandas; False keeps the backend's native
+        frame (a cudf.DataFrame for "cudf").
+
+    Returns
+    -------
+    (DataFrame, str)
+        The frame and the name of the backend that produced it.
+    """
+
+    def _out(df, name: str) -> Tuple[Any, str]:
+        if to_pandas and not isinstance(df, pd.DataFrame):
+            df = df.to_pandas()
+        return df, name
+
+    if backend != "auto":
+        if backend not in CSV_READERS:
+            raise ValueError(f"Unknown backend '{backend}'. Choose from: {sorted(CSV_READERS)}")
+        return _out(CSV_READERS[backend](path, usecols), backend)
+
+    errors: List[str] = []
+    for name, reader in CSV_READERS.items():
+        try:
+            return _out(reader(path, usecols), name)
+        except ImportError as exc:
+            errors.append(f"{name}: {exc}")
+        except (RuntimeError, MemoryError) as exc:
+            # e.g. cudf installed but no usable GPU / out of device memory
+            if name == "pandas":
+                raise
+            errors.append(f"{name}: {exc}")
+    raise ImportError("No CSV backend available (" + "; ".join(errors) + ")")
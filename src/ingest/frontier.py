@@ -0,0 +1,288 @@
+"""
+Catalog Frontier Crawler
+
+INGEST stage (discovery):
+- Breadth-first link discovery from a seed page, shared by every
+  catalog crawler
+- Normalized-URL seen-set: each distinct page is fetched at most once,
+  whatever slash, anchor or host-case variant links to it
+- Scope rules from config (crawl section): path prefix and maximum
+  depth below the seed
+- Optional sitemap seeding: in-scope <loc> entries enter the frontier
+  directly, without fetching the pages that link to them
+- Records each page's anchor links (e.g. #courseinventory), so
+  classifying a page never needs a second fetch
+
+Course-block extraction stays in the individual crawlers; they read
+page HTML through Frontier.page(), which serves already-fetched pages.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+from src.utils import span
+
+if TYPE_CHECKING:
+    from src.config import Config
+
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(href: str, base: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Canonical form of a link, and its fragment.
+
+    Absolute; lower-case scheme and host; no default port; repeated
+    slashes collapsed; trailing slash on extension-less paths; sorted
+    query; fragment removed (returned separately).
+    """
+
+    parts = urlsplit(urljoin(base, href) if base else href)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if not path.endswith("/") and "." not in path.rsplit("/", 1)[-1]:
+        path += "/"
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, "")), parts.fragment
+
+
+def path_depth(url: str) -> int:
+    """
+    Number of path segments in a (normalized) URL.
+    """
+    return len([p for p in urlsplit(url).path.split("/") if p])
+
+
+@dataclass
+class Page:
+    """
+    One distinct catalog page. status is None until the page is fetched
+    (0 when the request itself failed).
+    """
+
+    url: str
+    status: Optional[int] = None
+    html: str = ""
+    # Normalized http(s) links, in document order, without duplicates.
+    links: List[str] = field(default_factory=list)
+    # Fragment → normalized pages linked with it (e.g. "courseinventory").
+    anchors: Dict[str, Set[str]] = field(default_factory=dict)
+
+    @property
+    def fetched(self) -> bool:
+        return self.status is not None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(f"HTTP {self.status} fetching {self.url}")
+
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, "html.parser")
+
+    def has_anchor(self, fragment: str) -> bool:
+        return fragment in self.anchors
+
+
+class Frontier:
+    """
+    Memoized page store plus breadth-first discovery.
+
+    Parameters
+    ----------
+    prefix : str, optional
+        Path prefix every crawl must stay under (in addition to its seed).
+    max_depth : int
+        Default depth, in path segments below the seed.
+    max_pages : int
+        Cap on URLs admitted per crawl.
+    sitemap_url : str, optional
+        Seed crawls from this sitemap instead of following links.
+    timeout_s : float
+        Per-request timeout.
+    """
+
+    def __init__(
+        self,
+        *,
+        prefix: Optional[str] = None,
+        max_depth: int = 1,
+        max_pages: int = 2000,
+        sitemap_url: Optional[str] = None,
+        timeout_s: float = 30.0,
+        session: Optional[requests.Session] = None,
+    ):
+        self.prefix = prefix
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.sitemap_url = sitemap_url
+        self.timeout_s = timeout_s
+        self.session = session or requests.Session()
+        self.pages: Dict[str, Page] = {}
+        self.fetches = 0
+        self._sitemap: Optional[List[str]] = None
+
+    @classmethod
+    def from_config(cls, cfg: "Config", **overrides) -> "Frontier":
+        c = cfg.crawl
+        kw = dict(prefix=c.prefix, max_depth=c.max_depth, max_pages=c.max_pages,
+                  sitemap_url=c.sitemap_url, timeout_s=c.timeout_s)
+        kw.update(overrides)
+        return cls(**kw)
+
+    # --------------------------------------------------------
+    # Fetching
+    # --------------------------------------------------------
+
+    def _get(self, url: str) -> Tuple[int, str]:
+        with span("crawl.fetch", url=url) as s:
+            self.fetches += 1
+            try:
+                resp = self.session.get(url, timeout=self.timeout_s)
+            except requests.RequestException:
+                return 0, ""
+            s.add(bytes_read=len(resp.content), status=resp.status_code)
+            return resp.status_code, resp.text
+
+    def page(self, url: str) -> Page:
+        """
+        The page at `url`, fetched on first request only.
+        """
+
+        url, _ = normalize_url(url)
+        page = self.pages.setdefault(url, Page(url))
+        if page.fetched:
+            return page
+
+        page.status, page.html = self._get(url)
+        if not page.ok:
+            return page
+
+        seen: Set[str] = set()
+        for a in page.soup().select("a[href]"):
+            href = a["href"].strip()
+            if href.startswith(("mailto:", "tel:", "javascript:")):
+                continue
+            target, fragment = normalize_url(href, url)
+            if not target.startswith(("http://", "https://")):
+                continue
+            if target not in seen:
+                seen.add(target)
+                page.links.append(target)
+            if fragment:
+                page.anchors.setdefault(fragment, set()).add(target)
+        return page
+
+    def sitemap_urls(self) -> List[str]:
+        """
+        Normalized <loc> entries of the configured sitemap (following
+        sitemap indexes), read once.
+        """
+
+        if self._sitemap is not None:
+            return self._sitemap
+        if not self.sitemap_url:
+            return []
+
+        urls: List[str] = []
+        pending, visited = deque([self.sitemap_url]), set()
+        while pending:
+            sitemap = pending.popleft()
+            if sitemap in visited:
+                continue
+            visited.add(sitemap)
+            status, text = self._get(sitemap)
+            if status != 200:
+                continue
+            root = ET.fromstring(text.encode())
+            for el in root.iter():
+                if not el.tag.endswith("loc") or not el.text:
+                    continue
+                loc = el.text.strip()
+                if root.tag.endswith("sitemapindex"):
+                    pending.append(loc)
+                else:
+                    urls.append(normalize_url(loc)[0])
+
+        self._sitemap = list(dict.fromkeys(urls))
+        return self._sitemap
+
+    # --------------------------------------------------------
+    # Discovery
+    # --------------------------------------------------------
+
+    def _depth_below(self, url: str, seed: str, seed_depth: int) -> Optional[int]:
+        """
+        Depth of `url` below `seed`, or None when out of scope.
+        """
+        if urlsplit(url).netloc != urlsplit(seed).netloc:
+            return None
+        path = urlsplit(url).path
+        if not path.startswith(urlsplit(seed).path):
+            return None
+        if self.prefix and not path.startswith(self.prefix):
+            return None
+        return path_depth(url) - seed_depth
+
+    def crawl(self, seed: str, max_depth: Optional[int] = None) -> Dict[str, int]:
+        """
+        In-scope pages under `seed`, mapped to their depth below it
+        (the seed itself is 0).
+
+        Pages above the depth limit are fetched to read their links;
+        pages at the limit are only discovered, not fetched. An
+        unreachable seed raises requests.HTTPError. With a sitemap
+        configured, the sitemap is the frontier and no links are followed.
+        """
+
+        max_depth = self.max_depth if max_depth is None else max_depth
+        seed, _ = normalize_url(seed)
+        seed_depth = path_depth(seed)
+        found: Dict[str, int] = {seed: 0}
+
+        with span("crawl.frontier", seed=seed, max_depth=max_depth) as s:
+            if self.sitemap_url:
+                for url in self.sitemap_urls():
+                    d = self._depth_below(url, seed, seed_depth)
+                    if d is not None and 0 < d <= max_depth and len(found) < self.max_pages:
+                        found[url] = d
+            else:
+                self.page(seed).raise_for_status()
+                queue = deque([seed])
+                while queue:
+                    url = queue.popleft()
+                    if found[url] >= max_depth:
+                        continue
+                    for link in self.page(url).links:
+                        if link in found or len(found) >= self.max_pages:
+                            continue
+                        d = self._depth_below(link, seed, seed_depth)
+                        if d is not None and 0 < d <= max_depth:
+                            found[link] = d
+                            queue.append(link)
+
+            s.add(pages=len(found), fetches=self.fetches)
+
+        return found
+
+    def children(self, seed: str) -> List[str]:
+        """
+        Pages exactly one level below `seed`, sorted.
+        """
+        return sorted(u for u, d in self.crawl(seed, max_depth=1).items() if d == 1)
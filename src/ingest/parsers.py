@@ -3,12 +3,180 @@ Parsing utilities for catalog ingestion.
 
 CLEAN stage helpers:
 - Text normalization
+- Tokenization (column-wise, with a persistent token cache)
 - Course code extraction
 - Description cleanup
 """
 
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+_NON_ALNUM = r"[^a-z0-9\s]+"
+_WHITESPACE = r"\s+"
+
+_NON_ALNUM_RE = re.compile(_NON_ALNUM)
+_WHITESPACE_RE = re.compile(_WHITESPACE)
+
+# Catalog course code: 2–4 letter subject, optional space, 4-digit number
+# (e.g. "ACC 2013", "IS3003").
+COURSE_CODE_PATTERN = r"\b([A-Za-z]{2,4})[\s\u00a0]*(\d{4})\b"
+
+
 def clean_text(text: str) -> str:
     """
     Normalize whitespace and basic formatting.
     """
     return " ".join(text.split())
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase, replace non-alphanumerics with spaces, collapse whitespace.
+    """
+    if not isinstance(text, str):
+        return ""
+    text = _NON_ALNUM_RE.sub(" ", text.lower())
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def normalize_series(s: pd.Series) -> pd.Series:
+    """
+    Column-wise normalize_text(); missing values become "".
+    """
+    return (
+        s.astype("string").fillna("")
+         .str.lower()
+         .str.replace(_NON_ALNUM, " ", regex=True)
+         .str.replace(_WHITESPACE, " ", regex=True)
+         .str.strip()
+    )
+
+
+def extract_course_codes(s: pd.Series) -> pd.DataFrame:
+    """
+    Column-wise course code extraction: the first code in each text.
+
+    Returns a frame aligned with `s`: subject (upper case), number (Int64)
+    and code ("SUBJ 1234"), <NA> where a text has no code.
+    """
+    m = s.astype("string").str.extract(COURSE_CODE_PATTERN)
+    subject = m[0].str.upper()
+    return pd.DataFrame(
+        {
+            "subject": subject,
+            "number": pd.to_numeric(m[1], errors="coerce").astype("Int64"),
+            "code": subject + " " + m[1],
+        },
+        index=s.index,
+    )
+
+
+class TokenCache:
+    """
+    Token lists keyed by a 64-bit hash of the raw (un-normalized) text.
+
+    Optionally persisted as a Parquet file so repeated runs never
+    re-tokenize narratives that have not changed.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self._tokens: Dict[int, List[str]] = {}
+        self._dirty = False
+
+        if self.path is not None and self.path.exists():
+            df = pd.read_parquet(self.path)
+            self._tokens = {
+                int(h): list(t)
+                for h, t in zip(df["text_hash"].to_numpy(), df["tokens"])
+            }
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, key: int) -> bool:
+        return int(key) in self._tokens
+
+    def get_many(self, keys: Iterable[int]) -> List[List[str]]:
+        return [self._tokens[int(k)] for k in keys]
+
+    def update(self, keys: Iterable[int], tokens: Iterable[List[str]]) -> None:
+        for k, t in zip(keys, tokens):
+            self._tokens[int(k)] = t
+        self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({
+            "text_hash": np.fromiter(self._tokens.keys(), dtype=np.uint64, count=len(self._tokens)),
+            "tokens": list(self._tokens.values()),
+        }).to_parquet(self.path, index=False)
+        self._dirty = False
+
+
+def text_hashes(s: pd.Series) -> np.ndarray:
+    """
+    Vectorized 64-bit content hash of each text (index ignored).
+    """
+    return pd.util.hash_pandas_object(s.astype("string").fillna(""), index=False).to_numpy()
+
+
+def tokenize_series(
+    s: pd.Series,
+    *,
+    min_token_len: int = 1,
+    cache: Optional[TokenCache] = None,
+) -> List[List[str]]:
+    """
+    Normalize and whitespace-tokenize a whole column in one pass.
+
+    Parameters
+    ----------
+    s : pd.Series
+        Raw text column.
+    min_token_len : int
+        Drop tokens shorter than this. Use 2 to reproduce sklearn's default
+        token_pattern, 1 for r"(?u)\\b\\w+\\b".
+    cache : TokenCache, optional
+        Only texts whose hash is not already cached are tokenized.
+
+    Returns
+    -------
+    List[List[str]]
+        One token list per row, ready for pretokenized_vectorizer().
+    """
+
+    if cache is None:
+        tokens = normalize_series(s).str.split().tolist()
+    else:
+        keys = text_hashes(s)
+        missing = np.fromiter((k not in cache for k in keys), dtype=bool, count=len(keys))
+        if missing.any():
+            _, first = np.unique(keys[missing], return_index=True)
+            todo = s[missing].iloc[first]
+            cache.update(keys[missing][first], normalize_series(todo).str.split().tolist())
+        tokens = cache.get_many(keys)
+
+    if min_token_len > 1:
+        tokens = [[t for t in row if len(t) >= min_token_len] for row in tokens]
+    return tokens
+
+
+def _identity(tokens: List[str]) -> List[str]:
+    return tokens
+
+
+def pretokenized_vectorizer(**kwargs) -> TfidfVectorizer:
+    """
+    TfidfVectorizer that consumes token lists from tokenize_series()
+    instead of re-tokenizing raw strings.
+    """
+    return TfidfVectorizer(analyzer=_identity, **kwargs)
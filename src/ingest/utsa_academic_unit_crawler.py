@@ -8,51 +8,36 @@ INGEST stage:
 - Extracts structured course records
 """
 
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Set
+from typing import List, Dict, Optional
 
+from src.ingest.frontier import Frontier
+from src.utils import span
 
-def discover_subpages(unit_url: str) -> Set[str]:
+
+def discover_subpages(unit_url: str, frontier: Optional[Frontier] = None) -> List[str]:
     """
     Discover immediate subpages under an academic unit.
     """
 
-    resp = requests.get(unit_url, timeout=30)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    subpages: Set[str] = set()
-
-    for a in soup.select("a[href]"):
-        href = a["href"]
-
-        if not href.startswith(unit_url.replace("https://catalog.utsa.edu", "")):
-            continue
-
-        full = urljoin(unit_url, href.split("#")[0])
-        path = urlparse(full).path.rstrip("/")
+    return (frontier or Frontier()).children(unit_url)
 
-        # One level below the unit
-        if path.count("/") == 3:
-            subpages.add(full + "/")
 
-    return subpages
-
-
-def scrape_course_inventory(page_url: str, unit: str) -> List[Dict[str, str]]:
+def scrape_course_inventory(
+    page_url: str,
+    unit: str,
+    frontier: Optional[Frontier] = None,
+) -> List[Dict[str, str]]:
     """
     Attempt to scrape a course inventory from a page.
     """
 
     inventory_url = page_url.rstrip("/") + "/#courseinventory"
 
-    resp = requests.get(inventory_url, timeout=30)
-    if resp.status_code != 200:
+    page = (frontier or Frontier()).page(page_url)
+    if not page.ok:
         return []
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = page.soup()
 
     program = page_url.rstrip("/").split("/")[-1]
 
@@ -76,17 +61,25 @@ def scrape_course_inventory(page_url: str, unit: str) -> List[Dict[str, str]]:
     return courses
 
 
-def crawl_academic_unit(unit_url: str) -> List[Dict[str, str]]:
+def crawl_academic_unit(unit_url: str, frontier: Optional[Frontier] = None) -> List[Dict[str, str]]:
     """
     Crawl all course inventories under a single academic unit.
+
+    Pass a shared Frontier (e.g. Frontier.from_config(cfg)) to apply the
+    configured crawl rules and reuse pages across units.
     """
 
     unit = unit_url.rstrip("/").split("/")[-1]
-    subpages = discover_subpages(unit_url)
+    frontier = frontier or Frontier()
+
+    with span("crawl.academic_unit", unit=unit) as s:
+        subpages = discover_subpages(unit_url, frontier)
+
+        all_courses: List[Dict[str, str]] = []
 
-    all_courses: List[Dict[str, str]] = []
+        for page in subpages:
+            all_courses.extend(scrape_course_inventory(page, unit, frontier))
 
-    for page in sorted(subpages):
-        all_courses.extend(scrape_course_inventory(page, unit))
+        s.add(rows=len(all_courses), pages=len(subpages), fetches=frontier.fetches)
 
     return all_courses
@@ -10,53 +10,35 @@ INGEST stage:
 No assumptions about department names.
 """
 
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Set
+from typing import List, Dict, Optional
+
+from src.ingest.frontier import Frontier
+from src.utils import span
 
 
 BUSINESS_ROOT = "https://catalog.utsa.edu/undergraduate/business/"
 
 
-def discover_business_subpages() -> Set[str]:
+def discover_business_subpages(frontier: Optional[Frontier] = None) -> List[str]:
     """
     Discover all immediate sub-pages under Business.
     """
 
-    resp = requests.get(BUSINESS_ROOT, timeout=30)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    subpages: Set[str] = set()
-
-    for a in soup.select("a[href]"):
-        href = a["href"]
-
-        if href.startswith("/undergraduate/business/"):
-            # Normalize and strip anchors
-            full = urljoin(BUSINESS_ROOT, href.split("#")[0])
+    return (frontier or Frontier()).children(BUSINESS_ROOT)
 
-            # Only keep pages directly under business/
-            path = urlparse(full).path.rstrip("/")
-            if path.count("/") == 3:
-                subpages.add(full + "/")
 
-    return subpages
-
-
-def scrape_course_inventory(page_url: str) -> List[Dict[str, str]]:
+def scrape_course_inventory(page_url: str, frontier: Optional[Frontier] = None) -> List[Dict[str, str]]:
     """
     Attempt to scrape a course inventory from a page.
     """
 
     inventory_url = page_url.rstrip("/") + "/#courseinventory"
 
-    resp = requests.get(inventory_url, timeout=30)
-    if resp.status_code != 200:
+    page = (frontier or Frontier()).page(page_url)
+    if not page.ok:
         return []
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = page.soup()
 
     program = page_url.rstrip("/").split("/")[-1]
 
@@ -80,16 +62,21 @@ def scrape_course_inventory(page_url: str) -> List[Dict[str, str]]:
     return courses
 
 
-def crawl_business_catalog() -> List[Dict[str, str]]:
+def crawl_business_catalog(frontier: Optional[Frontier] = None) -> List[Dict[str, str]]:
     """
     Crawl Business catalog starting one level up.
     """
 
-    pages = discover_business_subpages()
+    frontier = frontier or Frontier()
+
+    with span("crawl.business") as s:
+        pages = discover_business_subpages(frontier)
+
+        all_courses: List[Dict[str, str]] = []
 
-    all_courses: List[Dict[str, str]] = []
+        for page in pages:
+            all_courses.extend(scrape_course_inventory(page, frontier))
 
-    for page in sorted(pages):
-        all_courses.extend(scrape_course_inventory(page))
+        s.add(rows=len(all_courses), pages=len(pages), fetches=frontier.fetches)
 
     return all_courses
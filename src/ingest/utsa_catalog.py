@@ -14,6 +14,8 @@ import requests
 from bs4 import BeautifulSoup
 from typing import List, Dict
 
+from src.utils import span
+
 
 def scrape_catalog(cfg) -> List[Dict[str, str]]:
     """
@@ -21,8 +23,9 @@ def scrape_catalog(cfg) -> List[Dict[str, str]]:
 
     Parameters
     ----------
-    cfg : dict
-        Project configuration dictionary.
+    cfg : Config
+        Validated project configuration (src.config); uses
+        data.utsa_catalog_urls.
 
     Returns
     -------
@@ -30,12 +33,14 @@ def scrape_catalog(cfg) -> List[Dict[str, str]]:
         Each dict contains: department, title, description
     """
 
-    urls = cfg["data"]["utsa_catalog_urls"]
+    urls = cfg.data.utsa_catalog_urls
     all_courses: List[Dict[str, str]] = []
 
     for department, url in urls.items():
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
+        with span("crawl.fetch", url=url) as s:
+            resp = requests.get(url, timeout=30)
+            resp.raise_for_status()
+            s.add(bytes_read=len(resp.content))
 
         soup = BeautifulSoup(resp.text, "html.parser")
 
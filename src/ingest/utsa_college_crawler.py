@@ -8,71 +8,47 @@ INGEST (discovery + classification):
 No course scraping yet.
 """
 
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Set
+from typing import List, Optional
+
+from src.ingest.frontier import Frontier
 
 
 UNDERGRAD_ROOT = "https://catalog.utsa.edu/undergraduate/"
 
 
-def discover_undergraduate_units() -> List[str]:
+def discover_undergraduate_units(frontier: Optional[Frontier] = None) -> List[str]:
     """
     Discover all first-level undergraduate units.
     """
 
-    resp = requests.get(UNDERGRAD_ROOT, timeout=30)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    units: Set[str] = set()
-
-    for a in soup.select("a[href]"):
-        href = a["href"]
-
-        if not href.startswith("/undergraduate/"):
-            continue
-
-        full = urljoin(UNDERGRAD_ROOT, href.split("#")[0])
-        path = urlparse(full).path.rstrip("/")
-
-        if path.count("/") == 2:
-            units.add(full + "/")
+    return (frontier or Frontier()).children(UNDERGRAD_ROOT)
 
-    return sorted(units)
 
-
-def unit_has_course_inventory(unit_url: str) -> bool:
+def unit_has_course_inventory(unit_url: str, frontier: Optional[Frontier] = None) -> bool:
     """
     Check whether a unit contains any course inventory links.
-    """
-
-    try:
-        resp = requests.get(unit_url, timeout=30)
-        resp.raise_for_status()
-    except Exception:
-        return False
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    Unreachable units count as having none.
+    """
 
-    return any(
-        "#courseinventory" in a.get("href", "")
-        for a in soup.select("a[href]")
-    )
+    return (frontier or Frontier()).page(unit_url).has_anchor("courseinventory")
 
 
-def discover_academic_units() -> List[str]:
+def discover_academic_units(frontier: Optional[Frontier] = None) -> List[str]:
     """
     Return only undergraduate units that actually expose course inventories.
+
+    Each unit page is fetched once; a crawler handed the same frontier
+    reuses it.
     """
 
-    units = discover_undergraduate_units()
+    frontier = frontier or Frontier()
+    units = discover_undergraduate_units(frontier)
 
     academic_units: List[str] = []
 
     for u in units:
-        if unit_has_course_inventory(u):
+        if unit_has_course_inventory(u, frontier):
             academic_units.append(u)
 
     return academic_units
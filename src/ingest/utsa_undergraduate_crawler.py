@@ -9,13 +9,14 @@ INGEST stage:
 This is a controlled, catalog-aware crawl.
 """
 
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Set
+from urllib.parse import urlparse
+from typing import List, Dict, Optional, Set
 
+from src.ingest.frontier import Frontier
+from src.utils import span
 
-def discover_program_pages(base_url: str) -> Set[str]:
+
+def discover_program_pages(base_url: str, frontier: Optional[Frontier] = None) -> List[str]:
     """
     Discover undergraduate program pages.
 
@@ -24,52 +25,38 @@ def discover_program_pages(base_url: str) -> Set[str]:
     /undergraduate/aicybercomputing/
     """
 
-    resp = requests.get(base_url, timeout=30)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    programs: Set[str] = set()
-
-    for a in soup.select("a[href]"):
-        href = a["href"]
-        if href.startswith("/undergraduate/") and href.count("/") == 2:
-            programs.add(urljoin(base_url, href))
+    return (frontier or Frontier()).children(base_url)
 
-    return programs
 
-
-def discover_course_inventory_links(program_url: str) -> Set[str]:
+def discover_course_inventory_links(program_url: str, frontier: Optional[Frontier] = None) -> List[str]:
     """
     Discover course inventory links from a program page.
     """
 
-    resp = requests.get(program_url, timeout=30)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    links: Set[str] = set()
+    targets = (frontier or Frontier()).page(program_url).anchors.get("courseinventory", ())
+    return sorted({f"{url}#courseinventory" for url in targets})
 
-    for a in soup.select("a[href]"):
-        href = a["href"]
-        if "#courseinventory" in href:
-            links.add(urljoin(program_url, href))
 
-    return links
+def inventory_program(url: str) -> str:
+    """
+    Program of a course inventory page: the page's own last path segment
+    (/undergraduate/business/accounting/#courseinventory → "accounting",
+    /undergraduate/business/#courseinventory → "business").
+    """
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    return parts[-1] if parts else "unknown"
 
 
-def scrape_course_inventory(url: str) -> List[Dict[str, str]]:
+def scrape_course_inventory(url: str, frontier: Optional[Frontier] = None) -> List[Dict[str, str]]:
     """
     Scrape a single course inventory page.
     """
 
-    resp = requests.get(url, timeout=30)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    parsed = urlparse(url)
-    parts = parsed.path.strip("/").split("/")
+    page = (frontier or Frontier()).page(url)
+    page.raise_for_status()
+    soup = page.soup()
 
-    program = parts[-2] if len(parts) >= 2 else "unknown"
+    program = inventory_program(url)
 
     courses: List[Dict[str, str]] = []
 
@@ -92,20 +79,31 @@ def scrape_course_inventory(url: str) -> List[Dict[str, str]]:
 
 def crawl_undergraduate_catalog(cfg) -> List[Dict[str, str]]:
     """
-    Crawl the full undergraduate catalog.
+    Crawl the full undergraduate catalog starting at data.base_url of the
+    validated config (src.config.Config), under its crawl rules.
+
+    Program pages are fetched once: discovery reads their inventory
+    links and scraping reuses the same HTML.
     """
 
-    base_url = cfg["data"]["base_url"]
+    base_url = cfg.data.require_base_url()
+    frontier = Frontier.from_config(cfg)
+
+    with span("crawl.undergraduate", base_url=base_url) as s:
+        with span("crawl.discover"):
+            programs = discover_program_pages(base_url, frontier)
 
-    programs = discover_program_pages(base_url)
+            inventory_links: Set[str] = set()
+            for program_url in programs:
+                inventory_links.update(discover_course_inventory_links(program_url, frontier))
 
-    inventory_links: Set[str] = set()
-    for program_url in programs:
-        inventory_links |= discover_course_inventory_links(program_url)
+        all_courses: List[Dict[str, str]] = []
 
-    all_courses: List[Dict[str, str]] = []
+        with span("crawl.scrape", pages=len(inventory_links)) as s_scrape:
+            for url in sorted(inventory_links):
+                all_courses.extend(scrape_course_inventory(url, frontier))
+            s_scrape.add(rows=len(all_courses))
 
-    for url in sorted(inventory_links):
-        all_courses.extend(scrape_course_inventory(url))
+        s.add(rows=len(all_courses), fetches=frontier.fetches)
 
     return all_courses
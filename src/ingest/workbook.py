@@ -0,0 +1,200 @@
+"""
+Excel Workbook Ingestion with a Parquet Mirror
+
+INGEST stage:
+- Opens each workbook once and reads every requested sheet in one pass
+- Prefers the fast read-only calamine engine, falls back to openpyxl
+- Mirrors each sheet to Parquet under a directory keyed by the file's
+  content hash, so later runs skip XLSX parsing until the workbook changes
+
+No cleaning or renaming happens here. Frames come back as
+pandas.read_excel returns them, with two changes that make them storable
+in Parquet: column labels are strings (a header of 2024 becomes "2024"),
+and mixed-type object columns become StringDtype. Both changes are
+applied on every read, so a cold read and a mirror read return identical
+frames.
+"""
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from src.utils import file_size, span
+
+
+DEFAULT_CACHE_DIR = Path("data/cache/excel")
+
+SheetKey = Union[str, int]
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Streaming SHA-256 of a file's contents.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def excel_engine() -> str:
+    """
+    Fastest available read engine: calamine (Rust) if installed, else openpyxl.
+    """
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return "openpyxl"
+
+
+def _load_manifest(cache_dir: Path) -> Dict[str, dict]:
+    path = cache_dir / "manifest.json"
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except json.JSONDecodeError:
+        return {}
+
+
+def _save_manifest(cache_dir: Path, manifest: Dict[str, dict]) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache_dir / "manifest.json").write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def _workbook_hash(path: Path, entry: Optional[dict]) -> str:
+    # Trust the recorded hash while size and mtime are unchanged.
+    st = path.stat()
+    if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+        return entry["sha256"]
+    return file_sha256(path)
+
+
+def _mirror_name(sheet: str) -> str:
+    return hashlib.sha1(sheet.encode("utf-8")).hexdigest()[:12] + ".parquet"
+
+
+def _storable(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The frame as it round-trips through the Parquet mirror: string column
+    labels, and mixed-type object columns (e.g. numbers and text in one
+    Excel column), which Arrow cannot store as-is, as strings.
+    """
+    import pyarrow as pa
+
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    for col in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col] = df[col].astype("string")
+    return df
+
+
+def read_workbook(
+    path: Union[str, Path],
+    sheets: Optional[Sequence[SheetKey]] = None,
+    *,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    engine: Optional[str] = None,
+) -> Dict[SheetKey, pd.DataFrame]:
+    """
+    Read several sheets of one workbook, via the Parquet mirror when fresh.
+
+    Parameters
+    ----------
+    path : str or Path
+        Workbook path.
+    sheets : sequence of str or int, optional
+        Sheet names or positions; all sheets when omitted.
+    cache_dir : Path, optional
+        Mirror location; None disables the mirror.
+    engine : str, optional
+        pandas Excel engine; defaults to excel_engine().
+
+    Returns
+    -------
+    Dict[str | int, pd.DataFrame]
+        Keyed exactly as requested in `sheets` (sheet names when omitted).
+    """
+
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Missing: {path.resolve()}")
+
+    key = str(path.resolve())
+    manifest = _load_manifest(cache_dir) if cache_dir is not None else {}
+    entry = manifest.get(key)
+
+    with span("ingest.workbook", path=str(path)) as s:
+        digest = _workbook_hash(path, entry)
+        fresh = entry is not None and entry.get("sha256") == digest
+
+        # Touched but unchanged: refresh the stat so the next run skips hashing.
+        st = path.stat()
+        if fresh and cache_dir is not None and entry.get("mtime_ns") != st.st_mtime_ns:
+            entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+            _save_manifest(cache_dir, manifest)
+
+        # Serve from the mirror when every requested sheet is present.
+        if fresh and cache_dir is not None:
+            names: List[str] = entry["sheet_names"]
+            wanted = list(sheets) if sheets is not None else list(names)
+            resolved = [names[k] if isinstance(k, int) else k for k in wanted]
+            mirror = cache_dir / digest
+            files = [mirror / _mirror_name(n) for n in resolved]
+
+            if all(n in names for n in resolved) and all(f.exists() for f in files):
+                out = {k: pd.read_parquet(f) for k, f in zip(wanted, files)}
+                s.add(
+                    rows=sum(len(df) for df in out.values()),
+                    bytes_read=sum(file_size(f) for f in files),
+                    source="parquet_mirror",
+                )
+                return out
+
+        # One workbook open; every needed sheet parsed from the same handle.
+        engine = engine or excel_engine()
+        with pd.ExcelFile(path, engine=engine) as xl:
+            names = list(xl.sheet_names)
+            wanted = list(sheets) if sheets is not None else list(names)
+            out = {k: _storable(xl.parse(k)) for k in wanted}
+
+        s.add(
+            rows=sum(len(df) for df in out.values()),
+            bytes_read=file_size(path),
+            source=f"xlsx:{engine}",
+        )
+
+        if cache_dir is not None:
+            # Drop the mirror of a previous version of this workbook.
+            if entry is not None and not fresh:
+                stale = entry.get("sha256")
+                if stale and all(e.get("sha256") != stale for k2, e in manifest.items() if k2 != key):
+                    shutil.rmtree(cache_dir / stale, ignore_errors=True)
+
+            mirror = cache_dir / digest
+            mirror.mkdir(parents=True, exist_ok=True)
+            for k, df in out.items():
+                df.to_parquet(mirror / _mirror_name(names[k] if isinstance(k, int) else k), index=False)
+
+            prev = entry if fresh else {}
+            manifest[key] = {
+                "sha256": digest,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "sheet_names": names,
+                "mirrored": sorted(set(prev.get("mirrored", [])) | {
+                    names[k] if isinstance(k, int) else k for k in out
+                }),
+            }
+            _save_manifest(cache_dir, manifest)
+
+    return out
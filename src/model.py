@@ -1,8 +1,956 @@
 """
 Optimization model for mentor–mentee matching.
+
+Every solver takes a cost matrix C (mentors × mentees) and returns the
+same pairing format: a pair of integer arrays (mentor_idx, mentee_idx),
+sorted by mentor, like scipy.optimize.linear_sum_assignment. Mentors may
+carry a capacity (max mentees each); each mentee is paired at most once,
+and as many mentees are paired as total capacity allows.
 """
 
-def run_optimization(cfg):
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linear_sum_assignment
+
+from src.utils import span
+
+if TYPE_CHECKING:
+    from src.config import Config
+
+
+Pairs = Tuple[np.ndarray, np.ndarray]
+
+
+def run_optimization(cfg: "Config"):
+    """
+    Solve the cohort described by the `optimize` config section (inputs
+    and output under `paths`) and write the pairings table.
+
+    The cohort is split into independent components (explicit
+    partition_key, or connected components under max_distance) that are
+    solved in a process pool; see src.optimize.decompose.
+    """
+    import pandas as pd
+
+    from src.clean.encoding import CodeBook, code_positions
+    from src.optimize.decompose import solve_partitioned
+    from src.report.export import export_pairings
+
+    opt, paths = cfg.optimize, cfg.paths
     print("Running mentor matching optimization...")
-    print(cfg)
-    # TODO: implement optimization logic
+
+    mentors = pd.read_parquet(paths.mentor_ids)
+    mentees = pd.read_parquet(paths.student_ids)
+    D_df = pd.read_parquet(paths.degree_distance)
+    codebook = CodeBook.load(paths.codebook)
+
+    # Degrees arrive as int32 codes from the clean stage (<col>_code).
+    m_col, e_col = opt.mentor_degree_col, opt.mentee_degree_col
+    mentor_degree = code_positions(mentors[m_col + "_code"], codebook, D_df.index)
+    mentee_degree = code_positions(mentees[e_col + "_code"], codebook, D_df.index)
+
+    # Participants whose degree is not in D cannot be costed.
+    m_ok, e_ok = mentor_degree >= 0, mentee_degree >= 0
+    if not m_ok.all() or not e_ok.all():
+        print("Warning: degrees missing from the distance matrix.")
+        print(" Unmapped mentors:", mentors.loc[~m_ok, m_col].unique().tolist())
+        print(" Unmapped mentees:", mentees.loc[~e_ok, e_col].unique().tolist())
+    mentors, mentees = mentors[m_ok].reset_index(drop=True), mentees[e_ok].reset_index(drop=True)
+    mentor_degree, mentee_degree = mentor_degree[m_ok], mentee_degree[e_ok]
+
+    capacity = opt.capacity
+    if isinstance(capacity, str):
+        capacity = mentors[capacity].to_numpy()
+
+    key = opt.partition_key
+    partition = (mentors[key].to_numpy(), mentees[key].to_numpy()) if key else None
+
+    rows, cols = solve_partitioned(
+        mentor_degree,
+        mentee_degree,
+        D_df.to_numpy(dtype=float),
+        capacity=capacity,
+        method=opt.solver,
+        max_distance=opt.max_distance,
+        partition=partition,
+        workers=cfg.workers(opt.workers),
+    )
+
+    D = D_df.to_numpy(dtype=float)
+    pairings = pd.DataFrame({
+        "mentor_id": mentors["mentor_id"].to_numpy()[rows],
+        "mentor_degree": mentors[m_col].astype(str).to_numpy()[rows],
+        "mentee_id": mentees["student_id"].to_numpy()[cols],
+        "mentee_degree": mentees[e_col].astype(str).to_numpy()[cols],
+        "distance": D[mentor_degree[rows], mentee_degree[cols]],
+    })
+
+    rep = cfg.report
+    out = export_pairings(
+        pairings,
+        paths.pairings,
+        excel=rep.excel,
+        max_rows=rep.excel_max_rows,
+        max_cols=rep.excel_max_cols,
+        decimals=rep.float_decimals,
+    )
+
+    print(f"Mentors: {len(mentors)} | Mentees: {len(mentees)} | Pairs: {len(pairings)}")
+    if len(pairings):
+        print(f"Total distance: {pairings['distance'].sum():.4f} | "
+              f"Average: {pairings['distance'].mean():.4f}")
+    print(f"Saved: {out.resolve()}")
+    return pairings
+
+
+def build_cost_matrix(mentor_degree, mentee_degree, D) -> np.ndarray:
+    """
+    C[i, j] = D[mentor_degree[i], mentee_degree[j]].
+
+    Parameters
+    ----------
+    mentor_degree, mentee_degree : array-like of int
+        Row/column index of each participant's degree in D: the int32
+        degree codes written by the clean stage (or code_positions() of
+        them).
+    D : array-like, shape (n_degrees, n_degrees)
+        Degree distance matrix (e.g. D_idf).
+    """
+    rows = np.asarray(mentor_degree, dtype=np.intp)
+    cols = np.asarray(mentee_degree, dtype=np.intp)
+    if (rows < 0).any() or (cols < 0).any():
+        raise ValueError("Unknown degree code (-1); drop unmapped participants first.")
+    return np.asarray(D)[np.ix_(rows, cols)]
+
+
+def mentor_capacities(capacity: Union[int, np.ndarray], n_mentors: int) -> np.ndarray:
+    """
+    Broadcast a scalar or per-mentor capacity to an int array.
+    """
+    cap = np.broadcast_to(np.asarray(capacity, dtype=np.int64), (n_mentors,)).copy()
+    if (cap < 0).any():
+        raise ValueError("Mentor capacities must be non-negative.")
+    return cap
+
+
+def _sorted_pairs(rows, cols) -> Pairs:
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order]
+
+
+def pairing_cost(C: np.ndarray, pairs: Pairs) -> float:
+    """
+    Total cost of a pairing.
+    """
+    rows, cols = pairs
+    return float(np.asarray(C)[rows, cols].sum())
+
+
+def solve_hungarian(C: np.ndarray, capacity: Union[int, np.ndarray] = 1) -> Pairs:
+    """
+    Exact assignment via scipy's linear_sum_assignment.
+
+    Mentors with capacity > 1 are expanded into that many identical rows.
+    """
+    C = np.asarray(C, dtype=np.float64)
+    cap = mentor_capacities(capacity, C.shape[0])
+
+    if (cap == 1).all():
+        return _sorted_pairs(*linear_sum_assignment(C))
+
+    slot_owner = np.repeat(np.arange(C.shape[0]), cap)
+    r, c = linear_sum_assignment(C[slot_owner])
+    return _sorted_pairs(slot_owner[r], c)
+
+
+def solve_min_cost_flow(
+    C: np.ndarray,
+    capacity: Union[int, np.ndarray] = 1,
+    *,
+    scale: float = 1e6,
+) -> Pairs:
+    """
+    Exact assignment as a min-cost flow (networkx network simplex).
+
+    source → mentee (cap 1) → mentor (cap 1) → sink (cap = mentor capacity).
+    Costs are scaled by `scale` and rounded, since network simplex needs
+    integer weights.
+    """
+    import networkx as nx
+
+    C = np.asarray(C, dtype=np.float64)
+    n_mentors, n_mentees = C.shape
+    cap = mentor_capacities(capacity, n_mentors)
+    flow = int(min(n_mentees, cap.sum()))
+
+    G = nx.DiGraph()
+    G.add_node("s", demand=-flow)
+    G.add_node("t", demand=flow)
+
+    W = np.rint(C * scale).astype(np.int64)
+    G.add_edges_from((("s", ("e", j), {"capacity": 1, "weight": 0}) for j in range(n_mentees)))
+    G.add_edges_from(
+        (("e", j), ("m", i), {"capacity": 1, "weight": int(W[i, j])})
+        for i in range(n_mentors)
+        for j in range(n_mentees)
+    )
+    G.add_edges_from(
+        (("m", i), "t", {"capacity": int(cap[i]), "weight": 0}) for i in range(n_mentors)
+    )
+
+    _, flow_dict = nx.network_simplex(G)
+
+    rows, cols = [], []
+    for j in range(n_mentees):
+        for (_, i), f in flow_dict[("e", j)].items():
+            if f > 0:
+                rows.append(i)
+                cols.append(j)
+    return _sorted_pairs(rows, cols)
+
+
+def solve_milp(
+    C: np.ndarray,
+    capacity: Union[int, np.ndarray] = 1,
+    *,
+    time_limit: Optional[float] = None,
+) -> Pairs:
+    """
+    Exact assignment as a binary integer program (PuLP + CBC).
+
+        minimize   Σᵢⱼ cᵢⱼ xᵢⱼ
+        subject to Σⱼ xᵢⱼ ≤ capᵢ   ∀ mentors i
+                   Σᵢ xᵢⱼ ≤ 1      ∀ mentees j
+                   Σᵢⱼ xᵢⱼ = min(#mentees, Σ capᵢ)
+    """
+    import pulp
+
+    C = np.asarray(C, dtype=np.float64)
+    n_mentors, n_mentees = C.shape
+    cap = mentor_capacities(capacity, n_mentors)
+    flow = int(min(n_mentees, cap.sum()))
+
+    model = pulp.LpProblem("MentorMenteeAssignment", pulp.LpMinimize)
+    x = pulp.LpVariable.dicts(
+        "x",
+        ((i, j) for i in range(n_mentors) for j in range(n_mentees)),
+        cat="Binary",
+    )
+
+    model += pulp.lpSum(C[i, j] * x[(i, j)] for i in range(n_mentors) for j in range(n_mentees))
+
+    for i in range(n_mentors):
+        model += pulp.lpSum(x[(i, j)] for j in range(n_mentees)) <= int(cap[i])
+    for j in range(n_mentees):
+        model += pulp.lpSum(x[(i, j)] for i in range(n_mentors)) <= 1
+    model += pulp.lpSum(x.values()) == flow
+
+    model.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+    if pulp.LpStatus[model.status] != "Optimal":
+        raise RuntimeError(f"MILP solve failed: {pulp.LpStatus[model.status]}")
+
+    rows, cols = [], []
+    for (i, j), var in x.items():
+        if var.value() is not None and var.value() > 0.5:
+            rows.append(i)
+            cols.append(j)
+    return _sorted_pairs(rows, cols)
+
+
+# ------------------------------------------------------------
+# Auction (ε-scaling) — approximate, certified
+# ------------------------------------------------------------
+
+@dataclass
+class AuctionResult:
+    """
+    Auction pairing plus its optimality certificate.
+
+    lower_bound is a dual bound on the optimal cost, so
+    cost - lower_bound (gap) bounds the suboptimality of `pairs`.
+    """
+
+    pairs: Pairs
+    cost: float
+    lower_bound: float
+    epsilon: float
+    phases: int
+    rounds: int
+
+    @property
+    def gap(self) -> float:
+        return max(self.cost - self.lower_bound, 0.0)
+
+    @property
+    def rel_gap(self) -> float:
+        return self.gap / max(abs(self.lower_bound), 1e-12)
+
+
+def _top_k_rows(C: np.ndarray, k: int, block_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    # (row, col) of each row's k cheapest columns; ties broken in a
+    # different column order per row.
+    n_rows, n_cols = C.shape
+    tie = 1e-9 * max(float(np.ptp(C)), 1.0) / n_cols
+    col = np.arange(n_cols)[None, :]
+
+    rows, cols = [], []
+    for start in range(0, n_rows, block_size):
+        block = C[start:start + block_size]
+        row = np.arange(start, start + block.shape[0])
+        key = block + tie * ((col - row[:, None]) % n_cols)
+        rows.append(np.repeat(row, k))
+        cols.append(np.argpartition(key, k - 1, axis=1)[:, :k].ravel())
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def candidate_edges(
+    C: np.ndarray,
+    k: Optional[int] = None,
+    *,
+    block_size: int = 4096,
+) -> sp.csr_matrix:
+    """
+    Sparse (mentors × mentees) cost matrix of candidate pairs: each
+    mentee's k cheapest mentors plus each mentor's k cheapest mentees
+    (all pairs when k is None).
+
+    Tied costs are broken in a different order per participant, so
+    participants with identical costs (same degree) spread over partners.
+    """
+    C = np.asarray(C, dtype=np.float64)
+    n_mentors, n_mentees = C.shape
+
+    if k is None or k >= min(n_mentors, n_mentees):
+        rows = np.repeat(np.arange(n_mentors), n_mentees)
+        cols = np.tile(np.arange(n_mentees), n_mentors)
+        return sp.csr_matrix((C.ravel(), (rows, cols)), shape=C.shape)
+
+    mentee_cols, mentee_rows = _top_k_rows(np.ascontiguousarray(C.T), k, block_size)
+    mentor_rows, mentor_cols = _top_k_rows(C, k, block_size)
+
+    flat = np.unique(np.concatenate((mentee_rows * n_mentees + mentee_cols,
+                                     mentor_rows * n_mentees + mentor_cols)))
+    rows, cols = np.divmod(flat, n_mentees)
+    return sp.csr_matrix((C[rows, cols], (rows, cols)), shape=C.shape)
+
+
+def _with_backup_pairs(cand: sp.csr_matrix, C: np.ndarray, cap: np.ndarray) -> sp.csr_matrix:
+    # Add one complete pairing (mentee j ↔ the j-th mentor slot) so the
+    # candidate graph always admits an assignment of full size.
+    n_mentees = C.shape[1]
+    slot_owner = np.repeat(np.arange(C.shape[0]), cap)
+    n = min(n_mentees, len(slot_owner))
+
+    coo = cand.tocoo()
+    flat = np.unique(np.concatenate((coo.row * n_mentees + coo.col, slot_owner[:n] * n_mentees + np.arange(n))))
+    rows, cols = np.divmod(flat, n_mentees)
+    return sp.csr_matrix((C[rows, cols], (rows, cols)), shape=C.shape)
+
+
+def _segments(starts: np.ndarray, lens: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Flat indices of the concatenated ranges [start, start + len), their
+    # segment ids, and each segment's offset into the flat array.
+    offsets = np.cumsum(lens) - lens
+    flat = np.repeat(starts - offsets, lens) + np.arange(lens.sum())
+    return flat, np.repeat(np.arange(len(lens)), lens), offsets
+
+
+def _first_per_segment(seg: np.ndarray) -> np.ndarray:
+    # Positions where a new segment begins in a sorted segment-id array.
+    starts = np.empty(len(seg), dtype=bool)
+    starts[:1] = True
+    np.not_equal(seg[1:], seg[:-1], out=starts[1:])
+    return np.flatnonzero(starts)
+
+
+def _auction(
+    indptr: np.ndarray,
+    edge_obj: np.ndarray,
+    edge_val: np.ndarray,
+    obj_cap: np.ndarray,
+    epsilons: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Jacobi ε-scaling auction for a square (maximization) problem.
+
+    Bidders b own CSR rows of candidate edges (edge_obj, edge_val); object
+    o has obj_cap[o] identical slots and Σ obj_cap == #bidders. All
+    unassigned bidders bid simultaneously each round; per object the
+    highest bid wins its cheapest slot.
+
+    Returns (slot of each bidder, final slot prices, rounds).
+    """
+
+    n_bidders = len(indptr) - 1
+    n_slots = int(obj_cap.sum())
+    slot_start = np.concatenate(([0], np.cumsum(obj_cap)[:-1]))
+    multi = obj_cap > 1
+
+    price = np.zeros(n_slots)
+    min_price = np.zeros(len(obj_cap))
+    min_slot = slot_start.copy()
+    second_price = np.where(multi, 0.0, np.inf)
+
+    span_ = float(edge_val.max() - edge_val.min()) if len(edge_val) else 0.0
+    # Feasible problems never push a price past this (Bertsekas' bound).
+    price_limit = (2 * n_bidders + 1) * (span_ + epsilons[0])
+
+    degree = np.diff(indptr)
+    if n_bidders and (degree == 0).any():
+        raise ValueError("Some participants have no candidate pairs; increase k.")
+
+    rounds = 0
+    for eps in epsilons:
+        holder = np.full(n_slots, -1, dtype=np.int64)
+        bidder_slot = np.full(n_bidders, -1, dtype=np.int64)
+        unassigned = np.arange(n_bidders)
+
+        while len(unassigned):
+            rounds += 1
+
+            # --- bidding (all unassigned bidders at once) ---
+            e, seg, offsets = _segments(indptr[unassigned], degree[unassigned])
+            obj = edge_obj[e]
+            val = edge_val[e] - min_price[obj]
+
+            best = np.maximum.reduceat(val, offsets)
+            is_best = np.flatnonzero(val == best[seg])
+            first = is_best[_first_per_segment(seg[is_best])]
+            best_obj = obj[first]
+
+            val[first] = -np.inf
+            second = np.maximum.reduceat(val, offsets)
+            # The best object's next-cheapest slot is also an alternative.
+            second = np.maximum(second, edge_val[e[first]] - second_price[best_obj])
+            second = np.where(np.isfinite(second), second, best - span_ - eps)
+
+            bid = edge_val[e[first]] - second + eps
+
+            # --- assignment: highest bid per object takes its cheapest slot ---
+            order = np.lexsort((-bid, best_obj))
+            win = order[_first_per_segment(best_obj[order])]
+            won_obj = best_obj[win]
+            winners = unassigned[win]
+            slots = min_slot[won_obj]
+
+            displaced = holder[slots]
+            displaced = displaced[displaced >= 0]
+            bidder_slot[displaced] = -1
+            holder[slots] = winners
+            bidder_slot[winners] = slots
+            price[slots] = bid[win]
+
+            # --- refresh cheapest / second-cheapest slot of touched objects ---
+            single = won_obj[~multi[won_obj]]
+            min_price[single] = price[slot_start[single]]
+
+            touched = won_obj[multi[won_obj]]
+            if len(touched):
+                s, sseg, _ = _segments(slot_start[touched], obj_cap[touched])
+                o2 = np.lexsort((price[s], sseg))
+                s, sseg = s[o2], sseg[o2]
+                head = _first_per_segment(sseg)
+                min_slot[touched] = s[head]
+                min_price[touched] = price[s[head]]
+                second_price[touched] = price[s[head + 1]]
+
+            if price[slots].max(initial=0.0) > price_limit:
+                raise ValueError(
+                    "Candidate graph has no complete assignment; increase k "
+                    "or pass the dense cost matrix."
+                )
+
+            keep = np.ones(len(unassigned), dtype=bool)
+            keep[win] = False
+            unassigned = np.concatenate((unassigned[keep], displaced))
+
+    return bidder_slot, price, rounds
+
+
+def auction_assignment(
+    C,
+    capacity: Union[int, np.ndarray] = 1,
+    *,
+    k: Optional[int] = None,
+    epsilon: Optional[float] = None,
+    theta: float = 5.0,
+) -> AuctionResult:
+    """
+    Approximate assignment via the ε-scaling auction algorithm.
+
+    Parameters
+    ----------
+    C : np.ndarray or scipy.sparse matrix, shape (n_mentors, n_mentees)
+        Costs. A sparse matrix restricts pairs to its stored entries.
+    capacity : int or array-like
+        Mentor capacities.
+    k : int, optional
+        With a dense C, only bid over each participant's k cheapest
+        partners (see candidate_edges). The certificate still covers all pairs.
+        Sparse C must itself admit a complete assignment.
+    epsilon : float, optional
+        Final bid increment; the cost is within about n·ε of optimal.
+        Defaults to (cost range) / (10·n).
+    theta : float
+        ε reduction factor between scaling phases.
+
+    Returns
+    -------
+    AuctionResult
+        Pairs (as solve_hungarian) with cost and a certified lower bound.
+        For sparse C the bound is relative to the candidate pairs only.
+    """
+
+    dense = None if sp.issparse(C) else np.asarray(C, dtype=np.float64)
+    cap = mentor_capacities(capacity, C.shape[0])
+    if dense is not None:
+        cand = candidate_edges(dense, k)
+        scale = float(np.ptp(cand.data)) if cand.nnz else 0.0
+        if cand.nnz < dense.size:
+            cand = _with_backup_pairs(cand, dense, cap)
+    else:
+        cand = sp.csr_matrix(C, dtype=np.float64)
+        cand.sum_duplicates()
+        scale = float(np.ptp(cand.data)) if cand.nnz else 0.0
+
+    n_mentors, n_mentees = cand.shape
+    n_slots = int(cap.sum())
+
+    # Square the problem with one zero-benefit filler object: either mentees
+    # bid on mentor slots + "unpaired" (capacity short), or mentor slots bid
+    # on mentees + "idle" (capacity to spare). Benefit is -cost.
+    if n_slots < n_mentees:
+        by = cand.T.tocsr()                                  # mentees × mentors
+        bidder_owner = np.arange(n_mentees)
+        filler_cap = n_mentees - n_slots
+        obj_cap = np.append(cap, filler_cap)
+    else:
+        by = cand[np.repeat(np.arange(n_mentors), cap)]      # slots × mentees
+        bidder_owner = np.repeat(np.arange(n_mentors), cap)
+        filler_cap = n_slots - n_mentees
+        obj_cap = np.append(np.ones(n_mentees, dtype=np.int64), filler_cap)
+    by.sort_indices()
+    filler = len(obj_cap) - 1
+
+    # Append the filler edge to every bidder row.
+    n_bidders = by.shape[0]
+    deg = np.diff(by.indptr) + (filler_cap > 0)
+    indptr = np.concatenate(([0], np.cumsum(deg)))
+    edge_obj = np.full(indptr[-1], filler, dtype=np.int64)
+    edge_val = np.zeros(indptr[-1])
+    real = np.ones(indptr[-1], dtype=bool)
+    if filler_cap > 0:
+        real[indptr[1:] - 1] = False
+    edge_obj[real] = by.indices
+    edge_val[real] = -by.data
+
+    # Mentors with capacity 0 have no slots to bid on.
+    usable = obj_cap[edge_obj] > 0
+    if not usable.all():
+        edge_obj, edge_val = edge_obj[usable], edge_val[usable]
+        owner = np.repeat(np.arange(n_bidders), deg)[usable]
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(owner, minlength=n_bidders))))
+
+    # ε schedule from the spread of the candidate costs (backup pairs excluded).
+    eps_final = epsilon if epsilon is not None else max(scale, 1e-12) / (10 * max(n_bidders, 1))
+    eps_final = max(eps_final, 1e-12)
+    epsilons = [eps_final]
+    while epsilons[-1] * theta < scale / 2:
+        epsilons.append(epsilons[-1] * theta)
+    epsilons = np.array(epsilons[::-1])
+
+    with span("solve.auction.bidding", rows=n_bidders, edges=len(edge_obj)) as s:
+        bidder_slot, price, rounds = _auction(indptr, edge_obj, edge_val, obj_cap, epsilons)
+        s.add(phases=len(epsilons), rounds=rounds)
+
+    slot_obj = np.repeat(np.arange(len(obj_cap)), obj_cap)
+    obj_of = slot_obj[bidder_slot]
+    paired = obj_of != filler
+    if n_slots < n_mentees:
+        pairs = _sorted_pairs(obj_of[paired], bidder_owner[paired])
+    else:
+        pairs = _sorted_pairs(bidder_owner[paired], obj_of[paired])
+
+    # --- dual certificate: Σ bidder profits + Σ slot prices ≥ max benefit ---
+    slot_start = np.concatenate(([0], np.cumsum(obj_cap)[:-1]))
+    min_price = np.full(len(obj_cap), np.inf)
+    has_slots = obj_cap > 0
+    if has_slots.any():
+        min_price[has_slots] = np.minimum.reduceat(price, slot_start[has_slots])
+    filler_profit = -min_price[filler] if filler_cap > 0 else -np.inf
+
+    if dense is not None:
+        if n_slots < n_mentees:
+            live = cap > 0
+            profit = (-dense[live] - min_price[:-1][live][:, None]).max(axis=0, initial=-np.inf)
+            dual = np.maximum(profit, filler_profit).sum()
+        else:
+            profit = (-dense - min_price[:-1][None, :]).max(axis=1, initial=-np.inf)
+            dual = (cap * np.maximum(profit, filler_profit))[cap > 0].sum()
+    else:
+        val = edge_val - min_price[edge_obj]
+        dual = np.maximum.reduceat(val, indptr[:-1]).sum() if n_bidders else 0.0
+    dual += price.sum()
+
+    cost = float(cand[pairs[0], pairs[1]].sum()) if dense is None else pairing_cost(dense, pairs)
+    return AuctionResult(
+        pairs=pairs,
+        cost=cost,
+        lower_bound=float(-dual),
+        epsilon=float(eps_final),
+        phases=len(epsilons),
+        rounds=rounds,
+    )
+
+
+def solve_auction(
+    C,
+    capacity: Union[int, np.ndarray] = 1,
+    *,
+    k: Optional[int] = None,
+    epsilon: Optional[float] = None,
+    theta: float = 5.0,
+) -> Pairs:
+    """
+    Approximate assignment via the ε-scaling auction (see auction_assignment).
+
+    The optimality gap is recorded on the "solve.auction.certificate" span.
+    """
+    result = auction_assignment(C, capacity, k=k, epsilon=epsilon, theta=theta)
+    with span("solve.auction.certificate") as s:
+        s.add(
+            cost=result.cost,
+            lower_bound=result.lower_bound,
+            gap=result.gap,
+            rel_gap=result.rel_gap,
+        )
+    return result.pairs
+
+
+# ------------------------------------------------------------
+# Stable matching (deferred acceptance)
+# ------------------------------------------------------------
+
+def _preference_chunk(
+    costs: np.ndarray,
+    k: int,
+    after: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    # Next k mentors of each mentee (rows of `costs`, one per mentee) in
+    # (cost, mentor index) order, strictly after the (cost, index) pairs
+    # in `after`. Unacceptable (non-finite) and exhausted entries are -1.
+    n_mentors = costs.shape[1]
+    k = min(k, n_mentors)
+    idx = np.arange(n_mentors)[None, :]
+
+    vals = np.asarray(costs, dtype=np.float64)
+    if after is not None:
+        after_cost, after_idx = after[0][:, None], after[1][:, None]
+        vals = np.where((vals < after_cost) | ((vals == after_cost) & (idx <= after_idx)), np.inf, vals)
+
+    sel = np.argpartition(vals, k - 1, axis=1)[:, :k]
+    sel_cost = np.take_along_axis(vals, sel, axis=1)
+
+    # Rows where the cut at the k-th value split a tie: redo them so the
+    # tie is broken by mentor index (everything cheaper, then lowest idx).
+    kth = sel_cost.max(axis=1, keepdims=True)
+    split = np.isfinite(kth[:, 0]) & ((vals == kth).sum(axis=1) > (sel_cost == kth).sum(axis=1))
+    if split.any():
+        v, t = vals[split], kth[split]
+        # 0 below the cut, 1 tied with it, 2 above; then mentor index.
+        key = ((v >= t).astype(np.int64) + (v > t)) * n_mentors + idx
+        sel[split] = np.argpartition(key, k - 1, axis=1)[:, :k]
+        sel_cost[split] = np.take_along_axis(v, sel[split], axis=1)
+
+    order = np.lexsort((sel, sel_cost), axis=1)
+    sel = np.take_along_axis(sel, order, axis=1)
+    sel[~np.isfinite(np.take_along_axis(sel_cost, order, axis=1))] = -1
+    return sel
+
+
+def stable_matching(
+    C: np.ndarray,
+    capacity: Union[int, np.ndarray] = 1,
+    *,
+    maximize: bool = False,
+    chunk: int = 32,
+    block_size: int = 1024,
+) -> Pairs:
+    """
+    Mentee-proposing deferred acceptance (Gale–Shapley) with capacities.
+
+    Both sides rank partners by C (lower is better; higher with
+    maximize=True, e.g. similarity scores), ties broken by index. All free
+    mentees propose at once in each round; every mentor then keeps its
+    `capacity` best proposals so far and rejects the rest. The result is
+    the mentee-optimal stable matching. Pairs with non-finite cost are
+    unacceptable to both sides.
+
+    Mentee preference lists are produced lazily by partial argsorts of
+    each column: the first `chunk` mentors, then chunks growing 4× for
+    mentees that run out (most settle within their first few choices).
+    Mentors compare proposals on C directly, so their side needs no sort.
+    """
+
+    C = np.asarray(C, dtype=np.float64)
+    if maximize:
+        C = -C
+    n_mentors, n_mentees = C.shape
+    cap = mentor_capacities(capacity, n_mentors)
+    if n_mentors == 0 or n_mentees == 0:
+        return _sorted_pairs([], [])
+
+    # Each mentee's current preference chunk is pref[ptr:end] of a flat,
+    # append-only buffer.
+    k = min(chunk, n_mentors)
+    pref = np.empty(n_mentees * k, dtype=np.int64)
+    for start in range(0, n_mentees, block_size):
+        stop = min(start + block_size, n_mentees)
+        pref[start * k:stop * k] = _preference_chunk(np.ascontiguousarray(C[:, start:stop].T), k).ravel()
+    ptr = np.arange(n_mentees) * k
+    end = ptr + k
+    size = np.full(n_mentees, k, dtype=np.int64)
+    used = len(pref)
+
+    # Current holds: mentor i's accepted mentees live in slots
+    # [slot_start[i], slot_start[i] + cap[i]), -1 when empty.
+    cap = np.minimum(cap, n_mentees)
+    slot_start = np.cumsum(cap) - cap
+    slots = np.full(int(cap.sum()), -1, dtype=np.int64)
+
+    free = np.arange(n_mentees)
+    rounds = 0
+    with span("solve.stable.rounds", mentors=n_mentors, rows=n_mentees) as s:
+        while len(free):
+            # Next chunk (4× larger) for mentees that used theirs up.
+            refill = free[ptr[free] == end[free]]
+            size[refill] = np.minimum(size[refill] * 4, n_mentors)
+            for width in np.unique(size[refill]):
+                group = refill[size[refill] == width]
+                for start in range(0, len(group), block_size):
+                    J = group[start:start + block_size]
+                    last = pref[end[J] - 1]
+                    new = _preference_chunk(C[:, J].T, int(width), after=(C[last, J], last)).ravel()
+                    if used + len(new) > len(pref):
+                        pref = np.concatenate((pref[:used], np.empty(max(len(pref), len(new)), dtype=np.int64)))
+                    pref[used:used + len(new)] = new
+                    ptr[J] = used + np.arange(len(J)) * width
+                    end[J] = ptr[J] + width
+                    used += len(new)
+
+            target = pref[ptr[free]]
+            ptr[free] += 1
+            # Mentees out of acceptable mentors stay unmatched.
+            free, target = free[target >= 0], target[target >= 0]
+            if not len(free):
+                break
+            rounds += 1
+
+            # Each proposed-to mentor keeps its best `cap` among current
+            # holds and new proposals, ordered by (cost, mentee index).
+            touched = np.unique(target)
+            flat, seg, _ = _segments(slot_start[touched], cap[touched])
+            held = slots[flat]
+            cand_j = np.concatenate((held[held >= 0], free))
+            cand_i = np.concatenate((touched[seg[held >= 0]], target))
+            order = np.lexsort((cand_j, C[cand_i, cand_j], cand_i))
+            cand_i, cand_j = cand_i[order], cand_j[order]
+
+            starts = _first_per_segment(cand_i)
+            rank = np.arange(len(cand_i)) - np.repeat(starts, np.diff(np.append(starts, len(cand_i))))
+            keep = rank < cap[cand_i]
+
+            slots[flat] = -1
+            slots[slot_start[cand_i[keep]] + rank[keep]] = cand_j[keep]
+            free = cand_j[~keep]
+
+        s.add(rounds=rounds)
+
+    holder = np.repeat(np.arange(n_mentors), cap)
+    filled = slots >= 0
+    return _sorted_pairs(holder[filled], slots[filled])
+
+
+def solve_stable(
+    C,
+    capacity: Union[int, np.ndarray] = 1,
+    *,
+    maximize: bool = False,
+    chunk: int = 32,
+) -> Pairs:
+    """
+    Stable (not minimum-cost) assignment; see stable_matching.
+    """
+    return stable_matching(C, capacity, maximize=maximize, chunk=chunk)
+
+
+# ------------------------------------------------------------
+# Bottleneck (min-max) assignment
+# ------------------------------------------------------------
+
+def _slot_matching(feasible: np.ndarray, slot_owner: np.ndarray) -> np.ndarray:
+    # Hopcroft–Karp maximum matching of mentor slots to mentees over the
+    # boolean feasible-pair matrix; matched mentee per slot, or -1.
+    from scipy.sparse.csgraph import maximum_bipartite_matching
+
+    graph = sp.csr_matrix(feasible)
+    if len(slot_owner) != graph.shape[0] or (slot_owner != np.arange(len(slot_owner))).any():
+        graph = graph[slot_owner]
+    return maximum_bipartite_matching(graph, perm_type="column")
+
+
+def bottleneck_assignment(
+    C: np.ndarray,
+    capacity: Union[int, np.ndarray] = 1,
+    *,
+    refine: Optional[str] = "hungarian",
+) -> Tuple[Pairs, float]:
+    """
+    Assignment minimizing the largest pair cost.
+
+    Searches the sorted distinct values of C for the smallest threshold t
+    at which pairs with cost ≤ t still admit a maximum-size assignment,
+    each threshold checked by Hopcroft–Karp bipartite matching. The search
+    gallops up from a lower bound (the costliest "cheapest pair" any
+    participant must get), then bisects, so most checks run on sparse
+    threshold graphs. Non-finite costs are never paired.
+
+    Parameters
+    ----------
+    C : array-like, shape (n_mentors, n_mentees)
+        Cost matrix.
+    capacity : int or array-like
+        Mentor capacities.
+    refine : str, optional
+        Solver (see SOLVERS) that then minimizes total cost among
+        assignments with max cost ≤ t. None returns the feasibility
+        matching as found.
+
+    Returns
+    -------
+    (Pairs, float)
+        The pairing and its bottleneck value t (nan when nothing pairs).
+    """
+
+    C = np.asarray(C, dtype=np.float64)
+    n_mentors, n_mentees = C.shape
+    cap = np.minimum(mentor_capacities(capacity, n_mentors), n_mentees)
+    slot_owner = np.repeat(np.arange(n_mentors), cap)
+
+    values = np.unique(C[np.isfinite(C)])
+    if not len(values) or not len(slot_owner):
+        return _sorted_pairs([], []), float("nan")
+
+    # Size of a maximum assignment over all finite pairs.
+    finite = np.isfinite(C)
+    if finite.all():
+        target = min(n_mentees, len(slot_owner))
+    else:
+        target = int((_slot_matching(finite, slot_owner) >= 0).sum())
+
+    # Lower bounds: every mentee (or every slot) that must be paired needs
+    # at least its cheapest pair.
+    lb = values[0]
+    C_inf = np.where(finite, C, np.inf)
+    if target == n_mentees:
+        lb = max(lb, C_inf.min(axis=0).max())
+    if target == len(slot_owner):
+        lb = max(lb, C_inf[cap > 0].min(axis=1).max())
+
+    match = None
+    with span("solve.bottleneck.search", values=len(values)) as s:
+        steps = 0
+
+        def feasible(i: int) -> bool:
+            nonlocal match, steps
+            m = _slot_matching(C <= values[i], slot_owner)
+            steps += 1
+            if (m >= 0).sum() == target:
+                match = m
+                return True
+            return False
+
+        # Gallop: lb, lb+1, lb+3, lb+7, ... until feasible.
+        lo = int(np.searchsorted(values, lb))
+        step, hi = 1, lo
+        while hi < len(values) - 1 and not feasible(hi):
+            lo = hi + 1
+            hi = min(hi + step, len(values) - 1)
+            step *= 2
+
+        # Bisect (lo, hi]; values[hi] is feasible.
+        found = hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if feasible(mid):
+                hi = found = mid
+            else:
+                lo = mid + 1
+        lo = found
+        s.add(steps=steps)
+
+    t = float(values[lo])
+    if refine is None:
+        if match is None:
+            match = _slot_matching(C <= t, slot_owner)
+        ok = match >= 0
+        return _sorted_pairs(slot_owner[ok], match[ok]), t
+
+    # Minimum total cost subject to max ≤ t: costlier pairs get a penalty
+    # above any total of allowed costs, then are dropped.
+    allowed = C <= t
+    penalty = (np.abs(values[: lo + 1]).max() + 1.0) * (min(len(slot_owner), n_mentees) + 1)
+    rows, cols = solve_assignment(np.where(allowed, C, penalty), refine, cap)
+    keep = allowed[rows, cols]
+    return _sorted_pairs(rows[keep], cols[keep]), t
+
+
+def solve_bottleneck(
+    C,
+    capacity: Union[int, np.ndarray] = 1,
+    *,
+    refine: Optional[str] = "hungarian",
+) -> Pairs:
+    """
+    Min-max assignment (see bottleneck_assignment). The bottleneck value
+    is recorded on the "solve.bottleneck.certificate" span.
+    """
+    pairs, t = bottleneck_assignment(C, capacity, refine=refine)
+    with span("solve.bottleneck.certificate") as s:
+        s.add(max_cost=t, pairs=len(pairs[0]))
+    return pairs
+
+
+SOLVERS = {
+    "hungarian": solve_hungarian,
+    "min_cost_flow": solve_min_cost_flow,
+    "milp": solve_milp,
+    "auction": solve_auction,
+    "stable": solve_stable,
+    "bottleneck": solve_bottleneck,
+}
+
+
+def solve_assignment(
+    C: np.ndarray,
+    method: str = "hungarian",
+    capacity: Union[int, np.ndarray] = 1,
+    **kwargs,
+) -> Pairs:
+    """
+    Dispatch to a solver backend by name (see SOLVERS).
+    """
+    try:
+        solver = SOLVERS[method]
+    except KeyError:
+        raise ValueError(f"Unknown solver '{method}'. Choose from: {sorted(SOLVERS)}") from None
+
+    with span(f"solve.{method}", rows=C.shape[1], mentors=C.shape[0]) as s:
+        pairs = solver(C, capacity, **kwargs)
+        s.add(pairs=len(pairs[0]))
+    return pairs
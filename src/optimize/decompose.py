@@ -0,0 +1,219 @@
+"""
+Problem Decomposition for Mentor–Mentee Matching
+
+OPTIMIZE stage:
+- Splits a cohort into independent subproblems, either by an explicit
+  partition key (college, campus, cohort) or by connected components of
+  the feasible pairing graph (degree pairs with D ≤ max_distance)
+- Solves the subproblems concurrently in a process pool
+- Merges the per-component pairings back into global indices
+
+Pairs across partitions (or with D > max_distance) are prohibited, so
+the merged result is optimal for the whole cohort while solve time
+scales with the largest component instead of the full cohort.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from src.model import Pairs, build_cost_matrix, mentor_capacities, solve_assignment, _sorted_pairs
+from src.utils import span
+
+
+@dataclass
+class Component:
+    """
+    One independent subproblem: global row/column indices of its mentors
+    and mentees.
+    """
+
+    label: int
+    mentors: np.ndarray
+    mentees: np.ndarray
+
+    @property
+    def size(self) -> int:
+        return len(self.mentors) * len(self.mentees)
+
+
+def degree_components(
+    mentor_degree: np.ndarray,
+    mentee_degree: np.ndarray,
+    D: np.ndarray,
+    max_distance: float,
+):
+    """
+    Connected components of the bipartite degree graph with an edge
+    (mentor degree a, mentee degree b) whenever D[a, b] ≤ max_distance.
+
+    Returns component labels (mentor_labels, mentee_labels). Working at
+    degree level keeps this O(#degrees²) regardless of cohort size.
+    """
+
+    D = np.asarray(D)
+    n_deg = D.shape[0]
+    used_a = np.unique(mentor_degree)
+    used_b = np.unique(mentee_degree)
+
+    sub = D[np.ix_(used_a, used_b)] <= max_distance
+    a, b = np.nonzero(sub)
+    graph = coo_matrix(
+        (np.ones(len(a), dtype=np.int8), (used_a[a], n_deg + used_b[b])),
+        shape=(2 * n_deg, 2 * n_deg),
+    )
+    _, labels = connected_components(graph, directed=False)
+    return labels[mentor_degree], labels[n_deg + mentee_degree]
+
+
+def key_components(mentor_key: Sequence, mentee_key: Sequence):
+    """
+    Component labels from an explicit partition key shared by both sides.
+    """
+    codes, _ = pd.factorize(pd.concat([pd.Series(mentor_key), pd.Series(mentee_key)], ignore_index=True))
+    return codes[: len(mentor_key)], codes[len(mentor_key):]
+
+
+def split_components(mentor_labels: np.ndarray, mentee_labels: np.ndarray) -> List[Component]:
+    """
+    Group participants by label; components missing either side are
+    dropped (nothing to pair). Largest components come first.
+    """
+
+    mentor_labels = np.asarray(mentor_labels)
+    mentee_labels = np.asarray(mentee_labels)
+
+    m_order = np.argsort(mentor_labels, kind="stable")
+    e_order = np.argsort(mentee_labels, kind="stable")
+    m_lab, m_start = np.unique(mentor_labels[m_order], return_index=True)
+    e_lab, e_start = np.unique(mentee_labels[e_order], return_index=True)
+    m_groups = dict(zip(m_lab, np.split(m_order, m_start[1:])))
+    e_groups = dict(zip(e_lab, np.split(e_order, e_start[1:])))
+
+    comps = [
+        Component(int(lab), m_groups[lab], e_groups[lab])
+        for lab in m_lab
+        if lab in e_groups
+    ]
+    return sorted(comps, key=lambda c: c.size, reverse=True)
+
+
+# --- worker side (state set once per process) ---
+_D: Optional[np.ndarray] = None
+
+
+def _init_worker(D: np.ndarray) -> None:
+    global _D
+    _D = D
+
+
+def _solve_component(
+    mentor_degree: np.ndarray,
+    mentee_degree: np.ndarray,
+    capacity: np.ndarray,
+    method: str,
+    max_distance: Optional[float],
+    kwargs: Dict,
+) -> Pairs:
+    C = build_cost_matrix(mentor_degree, mentee_degree, _D)
+
+    if max_distance is not None:
+        # Prohibitive pairs: costlier than any complete feasible pairing,
+        # then dropped from the result.
+        blocked = C > max_distance
+        if blocked.any():
+            C = C.copy()
+            C[blocked] = (max_distance + 1.0) * (min(C.shape) + 1)
+
+    rows, cols = solve_assignment(C, method, capacity, **kwargs)
+    if max_distance is not None:
+        keep = C[rows, cols] <= max_distance
+        rows, cols = rows[keep], cols[keep]
+    return rows, cols
+
+
+def solve_partitioned(
+    mentor_degree,
+    mentee_degree,
+    D,
+    *,
+    capacity: Union[int, np.ndarray] = 1,
+    method: str = "hungarian",
+    max_distance: Optional[float] = None,
+    partition: Optional[tuple] = None,
+    workers: Optional[int] = None,
+    **kwargs,
+) -> Pairs:
+    """
+    Solve the matching component by component, in parallel.
+
+    Parameters
+    ----------
+    mentor_degree, mentee_degree : array-like of int
+        Row/column index of each participant's degree in D.
+    D : array-like, shape (n_degrees, n_degrees)
+        Degree distance matrix.
+    capacity : int or array-like
+        Mentor capacities.
+    method : str
+        Solver backend (see src.model.SOLVERS).
+    max_distance : float, optional
+        Degree pairs farther apart than this are prohibited; they also
+        define the components when no partition is given.
+    partition : (mentor_key, mentee_key), optional
+        Explicit partition labels; pairs never cross partitions.
+    workers : int, optional
+        Process count (default: os.cpu_count()); 1 solves in-process.
+
+    Returns
+    -------
+    Pairs
+        (mentor_idx, mentee_idx) in global indices, sorted by mentor.
+    """
+
+    mentor_degree = np.asarray(mentor_degree, dtype=np.int64)
+    mentee_degree = np.asarray(mentee_degree, dtype=np.int64)
+    D = np.asarray(D, dtype=np.float64)
+    cap = mentor_capacities(capacity, len(mentor_degree))
+
+    with span("optimize.partition", mentors=len(mentor_degree), rows=len(mentee_degree)) as s:
+        if partition is not None:
+            m_lab, e_lab = key_components(*partition)
+        elif max_distance is not None:
+            m_lab, e_lab = degree_components(mentor_degree, mentee_degree, D, max_distance)
+        else:
+            m_lab = np.zeros(len(mentor_degree), dtype=np.int64)
+            e_lab = np.zeros(len(mentee_degree), dtype=np.int64)
+
+        comps = split_components(m_lab, e_lab)
+        s.add(
+            components=len(comps),
+            largest=max((len(c.mentors) + len(c.mentees) for c in comps), default=0),
+        )
+
+    tasks = [
+        (mentor_degree[c.mentors], mentee_degree[c.mentees], cap[c.mentors], method, max_distance, kwargs)
+        for c in comps
+    ]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    with span("optimize.solve_components", components=len(tasks), workers=workers):
+        if workers <= 1:
+            _init_worker(D)
+            results = [_solve_component(*t) for t in tasks]
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(D,)) as pool:
+                futures = [pool.submit(_solve_component, *t) for t in tasks]
+                results = [f.result() for f in futures]
+
+    rows = [c.mentors[r] for c, (r, _) in zip(comps, results)]
+    cols = [c.mentees[k] for c, (_, k) in zip(comps, results)]
+    if not rows:
+        return _sorted_pairs([], [])
+    return _sorted_pairs(np.concatenate(rows), np.concatenate(cols))
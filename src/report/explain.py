@@ -0,0 +1,202 @@
+"""
+Match Explanations
+
+REPORT stage (on demand):
+- Explains selected pairs only: the shared courses of the two degrees,
+  the weighted course differences that make up d_w(i,k), and (when
+  participant TF-IDF rows are given) the terms behind their text
+  similarity
+- Works on the sparse rows of the two participants involved, never on
+  the full pair space
+- Memoizes results in bounded LRU caches: per degree pair (shared by
+  every participant pair with those degrees) and per participant pair
+
+Cached results are shared between callers; treat them as read-only.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def _top(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Indices of the n largest values, largest first (ties by position).
+    """
+    if n >= len(values):
+        return np.argsort(-values, kind="stable")
+    part = np.argpartition(-values, n - 1)[:n]
+    return part[np.argsort(-values[part], kind="stable")]
+
+
+class PairExplainer:
+    """
+    Per-pair explanations over the degree–course matrix and, optionally,
+    participant text vectors.
+
+    Parameters
+    ----------
+    X : sparse matrix or ndarray, shape (n_degrees, n_courses)
+        Degree–course incidence matrix.
+    w : ndarray, shape (n_courses,)
+        Course weights used for d_w (IDF × λ).
+    courses : sequence of str
+        Course code per column of X.
+    mentor_degree, mentee_degree : array-like of int
+        Row of X for each mentor / mentee (-1 when unknown).
+    degrees : sequence of str, optional
+        Degree label per row of X.
+    mentor_text, mentee_text : sparse matrix, optional
+        TF-IDF rows per mentor / mentee in one shared vocabulary.
+    terms : sequence of str, optional
+        Vocabulary term per column of the text matrices.
+    top_n : int
+        Courses/terms listed per section.
+    cache_size : int
+        Entries kept by each LRU cache.
+    """
+
+    def __init__(
+        self,
+        X,
+        w: np.ndarray,
+        courses: Sequence[str],
+        mentor_degree,
+        mentee_degree,
+        *,
+        degrees: Optional[Sequence[str]] = None,
+        mentor_text=None,
+        mentee_text=None,
+        terms: Optional[Sequence[str]] = None,
+        top_n: int = 5,
+        cache_size: int = 4096,
+    ):
+        self.X = sp.csr_matrix(X, dtype=np.float64)
+        self.w = np.asarray(w, dtype=np.float64)
+        self.courses = np.asarray(courses, dtype=object)
+        self.degrees = None if degrees is None else np.asarray(degrees, dtype=object)
+        self.mentor_degree = np.asarray(mentor_degree, dtype=np.int64)
+        self.mentee_degree = np.asarray(mentee_degree, dtype=np.int64)
+        self.top_n = top_n
+
+        self.mentor_text = None if mentor_text is None else sp.csr_matrix(mentor_text)
+        self.mentee_text = None if mentee_text is None else sp.csr_matrix(mentee_text)
+        self.terms = None if terms is None else np.asarray(terms, dtype=object)
+        if (self.mentor_text is None) != (self.mentee_text is None):
+            raise ValueError("Provide both mentor_text and mentee_text, or neither.")
+
+        self._degree_pair = lru_cache(maxsize=cache_size)(self._explain_degrees)
+        self._pair = lru_cache(maxsize=cache_size)(self._explain_pair)
+
+    # --------------------------------------------------------
+    # Degree level (courses)
+    # --------------------------------------------------------
+
+    def _row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        lo, hi = self.X.indptr[i], self.X.indptr[i + 1]
+        return self.X.indices[lo:hi], self.X.data[lo:hi]
+
+    def _explain_degrees(self, i: int, k: int) -> Dict[str, Any]:
+        cols_i, vals_i = self._row(i)
+        cols_k, vals_k = self._row(k)
+
+        cols = np.union1d(cols_i, cols_k)
+        x_i = np.zeros(len(cols))
+        x_k = np.zeros(len(cols))
+        x_i[np.searchsorted(cols, cols_i)] = vals_i
+        x_k[np.searchsorted(cols, cols_k)] = vals_k
+
+        shared = (x_i != 0) & (x_k != 0)
+        contrib = (self.w[cols] * (x_i - x_k)) ** 2
+        total = float(contrib.sum())
+
+        s_cols = cols[shared]
+        top_shared = s_cols[_top(self.w[s_cols], self.top_n)]
+
+        differs = np.flatnonzero(contrib > 0)
+        top_diff = differs[_top(contrib[differs], self.top_n)]
+
+        return {
+            "distance": float(np.sqrt(total)),
+            "n_shared": int(shared.sum()),
+            "n_different": int(len(differs)),
+            "shared_courses": [
+                {"course": str(self.courses[j]), "weight": float(self.w[j])} for j in top_shared
+            ],
+            "top_differences": [
+                {
+                    "course": str(self.courses[cols[j]]),
+                    "side": "mentor" if x_i[j] > x_k[j] else "mentee",
+                    "contribution": float(contrib[j]),
+                    "share": float(contrib[j] / total) if total else 0.0,
+                }
+                for j in top_diff
+            ],
+        }
+
+    # --------------------------------------------------------
+    # Participant level (text)
+    # --------------------------------------------------------
+
+    def _explain_terms(self, mentor: int, mentee: int) -> Dict[str, Any]:
+        a, b = self.mentor_text[mentor], self.mentee_text[mentee]
+        na = float(np.sqrt(a.multiply(a).sum()))
+        nb = float(np.sqrt(b.multiply(b).sum()))
+        prod = a.multiply(b).tocsr()
+        if not prod.nnz or not na or not nb:
+            return {"cosine": 0.0, "shared_terms": []}
+
+        contrib = prod.data / (na * nb)
+        top = _top(contrib, self.top_n)
+        return {
+            "cosine": float(contrib.sum()),
+            "shared_terms": [
+                {
+                    "term": str(self.terms[prod.indices[j]]) if self.terms is not None else int(prod.indices[j]),
+                    "contribution": float(contrib[j]),
+                }
+                for j in top
+            ],
+        }
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+
+    def _explain_pair(self, mentor: int, mentee: int) -> Dict[str, Any]:
+        i, k = int(self.mentor_degree[mentor]), int(self.mentee_degree[mentee])
+        out: Dict[str, Any] = {"mentor": mentor, "mentee": mentee}
+        if i < 0 or k < 0:
+            out["courses"] = None
+        else:
+            if self.degrees is not None:
+                out["mentor_degree"] = str(self.degrees[i])
+                out["mentee_degree"] = str(self.degrees[k])
+            out["courses"] = self._degree_pair(i, k)
+        if self.mentor_text is not None:
+            out["text"] = self._explain_terms(mentor, mentee)
+        return out
+
+    def explain(self, mentor: int, mentee: int) -> Dict[str, Any]:
+        """
+        Explanation for one (mentor, mentee) pair, by participant index.
+        """
+        if not (0 <= mentor < len(self.mentor_degree)) or not (0 <= mentee < len(self.mentee_degree)):
+            raise IndexError(f"Pair ({mentor}, {mentee}) is out of range.")
+        return self._pair(int(mentor), int(mentee))
+
+    def explain_pairs(self, rows, cols) -> List[Dict[str, Any]]:
+        """
+        Explanations for the selected pairs (e.g. a solver's (rows, cols)).
+        """
+        return [self.explain(int(m), int(e)) for m, e in zip(rows, cols)]
+
+    def cache_info(self) -> Dict[str, Any]:
+        return {"degree_pairs": self._degree_pair.cache_info()._asdict(),
+                "pairs": self._pair.cache_info()._asdict()}
+
+    def cache_clear(self) -> None:
+        self._degree_pair.cache_clear()
+        self._pair.cache_clear()
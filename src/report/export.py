@@ -0,0 +1,162 @@
+"""
+Result Export
+
+REPORT stage:
+- Canonical outputs (pairings, cost and distance matrices, report
+  tables) are written to Parquet only
+- Excel is an optional view: openpyxl write-only mode streams rows to
+  disk in constant memory, at most max_rows × max_cols per sheet, floats
+  rounded, with a note row when a sheet is cut
+- Every write is timed under a report.* span
+
+Excel is for people reading a subset; anything downstream reads the
+Parquet files.
+"""
+
+from pathlib import Path
+from typing import Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.utils import file_size, span
+
+
+DEFAULT_MAX_ROWS = 5_000
+DEFAULT_MAX_COLS = 100
+
+# Hard sheet limits of the .xlsx format.
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_COLS = 16_384
+
+
+def write_parquet(df: pd.DataFrame, path: Union[str, Path], *, index: bool = False) -> Path:
+    """
+    Write a result table to Parquet (the canonical format).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with span("report.parquet", path=str(path), rows=len(df)) as s:
+        df.to_parquet(path, index=index)
+        s.add(bytes_written=file_size(path))
+    return path
+
+
+def matrix_frame(
+    M,
+    row_labels: Optional[Sequence[str]] = None,
+    col_labels: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Labelled DataFrame view of a 2-D array (no copy for ndarrays).
+    """
+    if isinstance(M, pd.DataFrame):
+        return M
+    return pd.DataFrame(np.asarray(M), index=row_labels, columns=col_labels)
+
+
+def write_matrix(
+    M,
+    path: Union[str, Path],
+    *,
+    row_labels: Optional[Sequence[str]] = None,
+    col_labels: Optional[Sequence[str]] = None,
+) -> Path:
+    """
+    Write a cost or distance matrix to Parquet, row labels kept as the
+    index (read back with pd.read_parquet, as degree_distance is).
+    """
+    df = matrix_frame(M, row_labels, col_labels)
+    df.columns = df.columns.astype(str)
+    return write_parquet(df, path, index=True)
+
+
+def _sheet_rows(df: pd.DataFrame, index: bool, decimals: Optional[int]):
+    num = df.select_dtypes("number").columns
+    if decimals is not None and len(num):
+        df = df.copy()
+        df[num] = df[num].round(decimals)
+    obj = df.astype(object).where(df.notna(), None)
+    if index:
+        obj.insert(0, df.index.name or "", df.index.astype(str))
+    yield [str(c) for c in obj.columns]
+    yield from obj.itertuples(index=False, name=None)
+
+
+def write_excel(
+    sheets: Mapping[str, pd.DataFrame],
+    path: Union[str, Path],
+    *,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_cols: int = DEFAULT_MAX_COLS,
+    decimals: Optional[int] = 4,
+) -> Path:
+    """
+    Streaming, capped Excel export.
+
+    Parameters
+    ----------
+    sheets : mapping of sheet name → DataFrame
+        A DataFrame with a non-default index (e.g. a labelled matrix) is
+        written with the index as its first column.
+    path : str or Path
+        Output .xlsx file.
+    max_rows, max_cols : int
+        Cap per sheet (data rows / data columns); larger frames are cut
+        and get a trailing note with their full size.
+    decimals : int, optional
+        Round floats to this many places (None keeps full precision).
+    """
+
+    try:
+        from openpyxl import Workbook
+    except ImportError as exc:
+        raise ImportError("Excel export needs openpyxl (pip install openpyxl).") from exc
+
+    max_rows = min(max_rows, EXCEL_MAX_ROWS - 3)
+    max_cols = min(max_cols, EXCEL_MAX_COLS - 1)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with span("report.excel", path=str(path), sheets=len(sheets)) as s:
+        wb = Workbook(write_only=True)
+        cells = 0
+        for name, df in sheets.items():
+            ws = wb.create_sheet(title=str(name)[:31])
+            index = not isinstance(df.index, pd.RangeIndex)
+            part = df.iloc[:max_rows, :max_cols]
+
+            for row in _sheet_rows(part, index, decimals):
+                ws.append(row)
+            cells += part.size
+
+            if part.shape != df.shape:
+                ws.append([])
+                ws.append([
+                    f"Truncated: {part.shape[0]} of {df.shape[0]} rows, "
+                    f"{part.shape[1]} of {df.shape[1]} columns. Full data is in the Parquet output."
+                ])
+
+        wb.save(path)
+        s.add(cells=cells, bytes_written=file_size(path))
+    return path
+
+
+def export_pairings(
+    pairings: pd.DataFrame,
+    path: Union[str, Path],
+    *,
+    excel: bool = False,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_cols: int = DEFAULT_MAX_COLS,
+    decimals: Optional[int] = 4,
+) -> Path:
+    """
+    Pairings to Parquet, plus an optional capped .xlsx next to it.
+    """
+    out = write_parquet(pairings, path)
+    if excel:
+        write_excel({"pairings": pairings}, out.with_suffix(".xlsx"),
+                    max_rows=max_rows, max_cols=max_cols, decimals=decimals)
+    return out
@@ -0,0 +1,520 @@
+"""
+Matching Service
+
+Long-lived local HTTP/JSON API over in-memory artifacts:
+- Loads the domain vectors, degree distance matrix, cleaned participant
+  tables and their codebook once, and fits the domain TF-IDF space once
+- Hot-reloads an artifact when its content hash changes (checked at most
+  every reload_interval_s, and only hashed when size/mtime moved)
+- Serves requests concurrently (one thread per request)
+
+Endpoints:
+    GET  /health                         artifact paths, hashes, load times
+    POST /score    {"text": ...} | {"texts": [...]}      domain scores
+    POST /suggest  {"mentee_id": ...} | {"degree": ...}, "k": 5
+    POST /solve    {"mentor_ids": [...], "mentee_ids": [...],
+                    "solver": ..., "capacity": ..., "max_distance": ...}
+    POST /explain  {"mentor_id": ..., "mentee_id": ...} | {"pairs": [{...}, ...]}
+                   shared courses, top weighted differences and, when the
+                   domain vectors are loaded, the top TF-IDF terms shared
+                   by the two participants' free text (cached)
+
+Run from the repo root:
+    python -m src.service
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.ingest.parsers import pretokenized_vectorizer, tokenize_series
+from src.ingest.workbook import file_sha256
+from src.optimize.decompose import solve_partitioned
+from src.similarity import blocked_cosine_similarity
+from src.analyze.degree_matrix import DegreeCourseMatrix
+from src.analyze.domain_docs import load_domain_docs
+from src.clean.encoding import CodeBook, code_positions
+from src.clean.entity_resolution import EntityResolver, degree_aliases
+from src.report.explain import PairExplainer
+from src.config import Config, get_config
+from src.utils import configure_instrumentation, span
+
+
+# Free-text columns of the cleaned tables behind /explain's term section
+# (the channels the domain scoring scripts use).
+MENTOR_TEXT_COLS = ("Job Title", "Current Role", "Field of Interest", "Program Goals")
+MENTEE_TEXT_COLS = ("Career Goals", "Program Goals", "Fields of Interest", "additional_info_to_consider")
+
+
+def participant_text(df: pd.DataFrame, cols) -> Optional[pd.Series]:
+    """
+    Space-joined text columns per row; None when none are present.
+    """
+    present = [c for c in cols if c in df.columns]
+    if not present:
+        return None
+    return df[present].astype("string").fillna("").agg(" ".join, axis=1)
+
+
+class ArtifactMismatch(RuntimeError):
+    """
+    Loaded artifacts that cannot be used together (answered with 503).
+    """
+
+
+def align_degrees(
+    degrees,
+    vocab: pd.Index,
+    dictionary: Optional[pd.DataFrame] = None,
+    **resolver_kwargs,
+) -> pd.Index:
+    """
+    Degree labels of the degree–course matrix in the codebook's label
+    space. Labels already in `vocab` are kept; the others go through the
+    degree resolver over `vocab` (and the degree dictionary, when given).
+    Unresolved degrees, and any whose label another row already holds,
+    keep their own label.
+    """
+    degrees = pd.Index(list(map(str, degrees)), dtype=object)
+    vocab = pd.Index(list(map(str, vocab)), dtype=object)
+    todo = ~degrees.isin(vocab)
+    if not todo.any() or (vocab.empty and dictionary is None):
+        return degrees
+
+    resolver = EntityResolver(degree_aliases(vocab, dictionary), **resolver_kwargs)
+    resolved = resolver.resolve(pd.Series(degrees[todo], dtype=object).str.replace("-", " ", regex=False))
+
+    out = degrees.to_numpy(copy=True)
+    held = set(degrees[~todo])
+    for i, label in zip(np.flatnonzero(todo), resolved["label"]):
+        if pd.notna(label) and label not in held:
+            out[i] = label
+            held.add(label)
+    return pd.Index(out, dtype=object)
+
+
+class Artifact:
+    """
+    A file-backed value, reloaded when the file's content hash changes.
+    """
+
+    def __init__(self, path: Path, loader: Callable[[Path], Any], reload_interval: float = 2.0):
+        self.path = Path(path)
+        self.loader = loader
+        self.reload_interval = reload_interval
+
+        self.sha256: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.version = 0
+        self._value: Any = None
+        self._stat = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        now = time.monotonic()
+        if self._value is not None and now - self._checked < self.reload_interval:
+            return self._value
+
+        with self._lock:
+            if self._value is None or now - self._checked >= self.reload_interval:
+                self._refresh()
+                self._checked = time.monotonic()
+            return self._value
+
+    def _refresh(self) -> None:
+        st = self.path.stat()
+        stat = (st.st_size, st.st_mtime_ns)
+        if self._value is not None and stat == self._stat:
+            return
+
+        digest = file_sha256(self.path)
+        if self._value is None or digest != self.sha256:
+            with span("service.load", path=str(self.path), bytes_read=st.st_size):
+                # Requests already holding the old value keep using it.
+                self._value = self.loader(self.path)
+            self.sha256 = digest
+            self.loaded_at = time.time()
+            self.version += 1
+        self._stat = stat
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "sha256": self.sha256,
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+        }
+
+
+@dataclass
+class DomainModel:
+    """
+    Domain documents (top-k terms per domain) and their fitted TF-IDF space.
+    """
+
+    domains: List[str]
+    vectorizer: Any
+    X_dom: Any
+
+
+def load_domain_model(
+    path: Path,
+    top_k: int = 80,
+    cache_dir: Optional[Path] = None,
+    weighting: str = "text",
+) -> DomainModel:
+    docs = load_domain_docs(path, top_k, cache_dir=cache_dir)
+    vec = pretokenized_vectorizer(min_df=1)
+    X_dom = vec.fit_transform(tokenize_series(pd.Series(docs.docs, dtype="string")))
+    if weighting == "centroid":
+        X_dom = docs.matrix(vec.vocabulary_, vec.idf_)
+    return DomainModel(domains=docs.domains, vectorizer=vec, X_dom=X_dom)
+
+
+class MatchingService:
+    """
+    Request handlers over the in-memory artifacts.
+    """
+
+    def __init__(self, cfg: Config):
+        svc, opt, paths = cfg.service, cfg.optimize, cfg.paths
+        interval = float(svc.reload_interval_s)
+        top_k = svc.domain_top_k
+
+        self.mentor_degree_col = opt.mentor_degree_col
+        self.mentee_degree_col = opt.mentee_degree_col
+        self.solver = opt.solver
+        self.max_distance = opt.max_distance
+        self.explain_cache_size = svc.explain_cache_size
+        self.resolver_kwargs = {
+            "min_confidence": cfg.clean.min_confidence,
+            "min_margin": cfg.clean.min_margin,
+            "min_fuzzy_length": cfg.clean.min_fuzzy_length,
+        }
+
+        self.artifacts: Dict[str, Artifact] = {
+            "domain_vectors": Artifact(
+                paths.domain_vectors,
+                lambda p: load_domain_model(p, top_k, cfg.cache.domain_docs, cfg.scoring.domain_weighting),
+                interval,
+            ),
+            "distance": Artifact(paths.degree_distance, pd.read_parquet, interval),
+            "degree_courses": Artifact(paths.degree_course_matrix, DegreeCourseMatrix.load, interval),
+            "mentors": Artifact(paths.mentor_ids, pd.read_parquet, interval),
+            "mentees": Artifact(paths.student_ids, pd.read_parquet, interval),
+            "codebook": Artifact(paths.codebook, CodeBook.load, interval),
+            "degree_dictionary": Artifact(paths.degree_dictionary, pd.read_parquet, interval),
+        }
+
+        self._cohort_key = None
+        self._cohort: Dict[str, Any] = {}
+        self._cohort_lock = threading.Lock()
+
+        self._explainer_key = None
+        self._explainer: Dict[str, Any] = {}
+        self._explainer_lock = threading.Lock()
+
+    def warm(self) -> None:
+        """
+        Load every artifact whose file exists.
+        """
+        for art in self.artifacts.values():
+            if art.path.exists():
+                art.get()
+
+    # --- shared derived state ---
+    def cohort(self) -> Dict[str, Any]:
+        """
+        Distance matrix and participants mapped onto its rows, rebuilt only
+        when one of the underlying artifacts changed.
+        """
+        D_df = self.artifacts["distance"].get()
+        mentors = self.artifacts["mentors"].get()
+        mentees = self.artifacts["mentees"].get()
+        codebook = self.artifacts["codebook"].get()
+        key = tuple(self.artifacts[n].version for n in ("distance", "mentors", "mentees", "codebook"))
+
+        with self._cohort_lock:
+            if key != self._cohort_key:
+                labels = pd.Index(D_df.index.astype(str))
+                self._cohort = {
+                    "labels": labels,
+                    "D": D_df.to_numpy(dtype=float),
+                    "mentors": mentors,
+                    "mentees": mentees,
+                    "mentor_degree": code_positions(mentors[self.mentor_degree_col + "_code"], codebook, labels),
+                    "mentee_degree": code_positions(mentees[self.mentee_degree_col + "_code"], codebook, labels),
+                }
+                self._cohort_key = key
+            return self._cohort
+
+    def explainer(self) -> Dict[str, Any]:
+        """
+        PairExplainer over the degree–course matrix plus id → row maps,
+        rebuilt (dropping its cache) only when an input artifact changed.
+
+        Participant text is vectorized in the domain TF-IDF space when the
+        domain vectors exist; otherwise explanations are course-only. The
+        matrix's degrees are aligned with the codebook labels
+        (align_degrees); ArtifactMismatch when no participant degree maps
+        onto a row.
+        """
+        m: DegreeCourseMatrix = self.artifacts["degree_courses"].get()
+        mentors = self.artifacts["mentors"].get()
+        mentees = self.artifacts["mentees"].get()
+        codebook = self.artifacts["codebook"].get()
+        model: Optional[DomainModel] = None
+        dictionary: Optional[pd.DataFrame] = None
+        names = ["degree_courses", "mentors", "mentees", "codebook"]
+        if self.artifacts["domain_vectors"].path.exists():
+            model = self.artifacts["domain_vectors"].get()
+            names.append("domain_vectors")
+        if self.artifacts["degree_dictionary"].path.exists():
+            dictionary = self.artifacts["degree_dictionary"].get()
+            names.append("degree_dictionary")
+        key = tuple(self.artifacts[n].version for n in names)
+
+        with self._explainer_lock:
+            if key != self._explainer_key:
+                text: Dict[str, Any] = {}
+                mentor_text = participant_text(mentors, MENTOR_TEXT_COLS)
+                mentee_text = participant_text(mentees, MENTEE_TEXT_COLS)
+                if model is not None and mentor_text is not None and mentee_text is not None:
+                    text = {
+                        "mentor_text": model.vectorizer.transform(tokenize_series(mentor_text)),
+                        "mentee_text": model.vectorizer.transform(tokenize_series(mentee_text)),
+                        "terms": model.vectorizer.get_feature_names_out(),
+                    }
+
+                vocab = codebook.labels("degree") if "degree" in codebook else pd.Index([])
+                degrees = align_degrees(m.degrees, vocab, dictionary, **self.resolver_kwargs)
+                mentor_degree = code_positions(mentors[self.mentor_degree_col + "_code"], codebook, degrees)
+                mentee_degree = code_positions(mentees[self.mentee_degree_col + "_code"], codebook, degrees)
+                if (mentor_degree < 0).all() and (mentee_degree < 0).all():
+                    raise ArtifactMismatch(
+                        f"No participant degree maps onto the {len(degrees)} degrees of "
+                        f"{self.artifacts['degree_courses'].path}; rebuild it against the degree labels."
+                    )
+
+                mentor_ids = mentors["mentor_id"].astype(str).to_numpy()
+                mentee_ids = mentees["student_id"].astype(str).to_numpy()
+                self._explainer = {
+                    "explainer": PairExplainer(
+                        m.X, m.w, m.courses,
+                        mentor_degree,
+                        mentee_degree,
+                        degrees=degrees,
+                        cache_size=self.explain_cache_size,
+                        **text,
+                    ),
+                    "mentor_row": {mid: i for i, mid in enumerate(mentor_ids)},
+                    "mentee_row": {sid: i for i, sid in enumerate(mentee_ids)},
+                }
+                self._explainer_key = key
+            return self._explainer
+
+    # --- endpoints ---
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "artifacts": {name: art.info() for name, art in self.artifacts.items()},
+        }
+
+    def score(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        texts = body.get("texts")
+        if texts is None:
+            if "text" not in body:
+                raise ValueError("Provide 'text' or 'texts'.")
+            texts = [body["text"]]
+
+        model: DomainModel = self.artifacts["domain_vectors"].get()
+        X = model.vectorizer.transform(tokenize_series(pd.Series(texts, dtype="string")))
+        sims = blocked_cosine_similarity(X, model.X_dom)
+
+        results = []
+        for row in sims:
+            order = np.argsort(-row, kind="stable")
+            results.append([
+                {"domain": model.domains[i], "score": float(row[i])} for i in order
+            ])
+        return {"results": results}
+
+    def suggest(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        c = self.cohort()
+        k = int(body.get("k", 5))
+
+        if "mentee_id" in body:
+            match = np.flatnonzero(c["mentees"]["student_id"].astype(str).to_numpy() == str(body["mentee_id"]))
+            if not len(match):
+                raise KeyError(f"Unknown mentee_id: {body['mentee_id']}")
+            deg = int(c["mentee_degree"][match[0]])
+        elif "degree" in body:
+            deg = int(c["labels"].get_indexer([str(body["degree"])])[0])
+        else:
+            raise ValueError("Provide 'mentee_id' or 'degree'.")
+        if deg < 0:
+            raise KeyError("Degree not in the distance matrix.")
+
+        known = np.flatnonzero(c["mentor_degree"] >= 0)
+        dist = c["D"][c["mentor_degree"][known], deg]
+        k = min(k, len(known))
+        if k == 0:
+            return {"degree": c["labels"][deg], "mentors": []}
+
+        top = np.argpartition(dist, k - 1)[:k]
+        top = top[np.argsort(dist[top], kind="stable")]
+        mentors = c["mentors"].iloc[known[top]]
+        return {
+            "degree": c["labels"][deg],
+            "mentors": [
+                {"mentor_id": str(mid), "degree": str(d), "distance": float(x)}
+                for mid, d, x in zip(mentors["mentor_id"], mentors[self.mentor_degree_col], dist[top])
+            ],
+        }
+
+    def solve(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        c = self.cohort()
+        m_mask = c["mentor_degree"] >= 0
+        e_mask = c["mentee_degree"] >= 0
+        if body.get("mentor_ids") is not None:
+            m_mask &= c["mentors"]["mentor_id"].astype(str).isin(map(str, body["mentor_ids"])).to_numpy()
+        if body.get("mentee_ids") is not None:
+            e_mask &= c["mentees"]["student_id"].astype(str).isin(map(str, body["mentee_ids"])).to_numpy()
+
+        m_idx, e_idx = np.flatnonzero(m_mask), np.flatnonzero(e_mask)
+        rows, cols = solve_partitioned(
+            c["mentor_degree"][m_idx],
+            c["mentee_degree"][e_idx],
+            c["D"],
+            capacity=body.get("capacity", 1),
+            method=body.get("solver", self.solver),
+            max_distance=body.get("max_distance", self.max_distance),
+            workers=int(body.get("workers", 1)),
+        )
+        mentor_ids = c["mentors"]["mentor_id"].astype(str).to_numpy()[m_idx[rows]]
+        mentee_ids = c["mentees"]["student_id"].astype(str).to_numpy()[e_idx[cols]]
+        dist = c["D"][c["mentor_degree"][m_idx[rows]], c["mentee_degree"][e_idx[cols]]]
+        return {
+            "objective": float(dist.sum()),
+            "pairs": [
+                {"mentor_id": m, "mentee_id": e, "distance": float(d)}
+                for m, e, d in zip(mentor_ids, mentee_ids, dist)
+            ],
+        }
+
+    def explain(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        pairs = body.get("pairs")
+        if pairs is None:
+            if "mentor_id" not in body or "mentee_id" not in body:
+                raise ValueError("Provide 'mentor_id' and 'mentee_id', or 'pairs'.")
+            pairs = [body]
+
+        ex = self.explainer()
+        results = []
+        for p in pairs:
+            mid, sid = str(p["mentor_id"]), str(p["mentee_id"])
+            if mid not in ex["mentor_row"]:
+                raise KeyError(f"Unknown mentor_id: {mid}")
+            if sid not in ex["mentee_row"]:
+                raise KeyError(f"Unknown mentee_id: {sid}")
+
+            out = ex["explainer"].explain(ex["mentor_row"][mid], ex["mentee_row"][sid])
+            results.append({
+                "mentor_id": mid,
+                "mentee_id": sid,
+                **{k: v for k, v in out.items() if k not in ("mentor", "mentee")},
+            })
+        return {"results": results}
+
+
+def make_handler(service: MatchingService):
+    routes = {
+        ("GET", "/health"): lambda body: service.health(),
+        ("POST", "/score"): service.score,
+        ("POST", "/suggest"): service.suggest,
+        ("POST", "/solve"): service.solve,
+        ("POST", "/explain"): service.explain,
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, payload: Dict[str, Any]) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _dispatch(self, method: str) -> None:
+            path = self.path.split("?", 1)[0]
+            route = routes.get((method, path))
+            if route is None:
+                self._send(404, {"error": f"No route for {method} {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                with span(f"service{path}"):
+                    result = route(body)
+            except (ValueError, KeyError, json.JSONDecodeError) as exc:
+                self._send(400, {"error": str(exc)})
+            except FileNotFoundError as exc:
+                self._send(503, {"error": f"Missing artifact: {exc.filename}"})
+            except ArtifactMismatch as exc:
+                self._send(503, {"error": str(exc)})
+            except Exception as exc:
+                # Never drop the connection without a response.
+                self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+            else:
+                self._send(200, result)
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+        def log_message(self, fmt: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+def serve(cfg: Config, host: Optional[str] = None, port: Optional[int] = None) -> None:
+    host = host or cfg.service.host
+    port = int(port or cfg.service.port)
+
+    service = MatchingService(cfg)
+    service.warm()
+
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    print(f"Serving on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main() -> None:
+    cfg = get_config()
+    configure_instrumentation(cfg.raw)
+    serve(cfg)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,222 @@
 Similarity computation between mentors and mentees.
 """
 
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize as l2_normalize
+
+from src.utils import span
+
+
 def compute_similarity(mentors, mentees, method="tfidf"):
     # TODO: implement similarity scoring
     pass
+
+
+# Academic-level scaling λ for 1000-, 2000-, 3000- and 4000-level courses.
+LEVEL_TIERS = (1.0, 1.5, 3.5, 4.0)
+
+# Lowest course number of tiers 1–3.
+LEVEL_BOUNDS = (2000, 3000, 4000)
+
+
+def level_tier(code: str) -> int:
+    """
+    Index into LEVEL_TIERS for a course code (0 when no 4-digit number).
+    """
+    match = re.search(r"(\d{4})", code)
+    if not match:
+        return 0
+
+    num = int(match.group(1))
+    if num >= 4000:
+        return 3
+    elif num >= 3000:
+        return 2
+    elif num >= 2000:
+        return 1
+    else:
+        return 0
+
+
+def level_weight(code: str) -> float:
+    """
+    Assign academic level scaling λ_j based on course number.
+    """
+    return LEVEL_TIERS[level_tier(code)]
+
+
+def level_tiers(course_codes: Sequence[str]) -> np.ndarray:
+    """
+    level_tier() for a whole sequence of course codes at once.
+    """
+    num = pd.Series(course_codes, dtype="string").str.extract(r"(\d{4})", expand=False)
+    num = pd.to_numeric(num, errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    return np.searchsorted(LEVEL_BOUNDS, num, side="right")
+
+
+def level_weights(course_codes: Sequence[str]) -> np.ndarray:
+    """
+    λ_j for each course code (vectorized level_weight()).
+    """
+    return np.asarray(LEVEL_TIERS, dtype=float)[level_tiers(course_codes)]
+
+
+def idf_weights(X) -> np.ndarray:
+    """
+    Smoothed IDF per course over the degree–course incidence matrix X (n×m).
+    """
+    n = X.shape[0]
+    df_j = np.asarray(X.sum(axis=0)).ravel()
+    return np.log((n + 1) / (df_j + 1)) + 1
+
+
+def course_weights(X, course_codes: Sequence[str]) -> np.ndarray:
+    """
+    Composite course weight w_j = IDF_j × λ_j (rarity × academic level).
+    """
+    return idf_weights(X) * level_weights(course_codes)
+
+
+def weighted_distance_matrix(X, w: np.ndarray) -> np.ndarray:
+    """
+    d_w(i,k) = sqrt( Σ_j [ w_j^2 (x_ij − x_kj)^2 ] ) for all degree pairs.
+
+    Computed with the identity ||a−b||² = ||a||² + ||b||² − 2 a·b on the
+    weighted rows, so the cost is one (n×m)·(m×n) product instead of an
+    O(n²) Python loop.
+    """
+    with span("similarity.d_idf", rows=X.shape[0], courses=X.shape[1]):
+        if sp.issparse(X):
+            W = sp.csr_matrix(X, dtype=np.float64).multiply(w).tocsr()
+            gram = (W @ W.T).toarray()
+        else:
+            W = np.asarray(X, dtype=np.float64) * w
+            gram = W @ W.T
+
+        sq = np.diag(gram)
+        D_sq = sq[:, None] + sq[None, :] - 2.0 * gram
+
+        # Numerical cleanup (tiny negatives and asymmetry from floating error)
+        D_sq = 0.5 * (D_sq + D_sq.T)
+        np.maximum(D_sq, 0.0, out=D_sq)
+        D = np.sqrt(D_sq)
+        np.fill_diagonal(D, 0.0)
+        return D
+
+
+def _row_blocks(n_rows: int, block_size: int):
+    for start in range(0, n_rows, block_size):
+        yield start, min(start + block_size, n_rows)
+
+
+def _top_k_block(S: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k column indices and scores per row of a dense block, best first.
+    """
+
+    if k < S.shape[1]:
+        part = np.argpartition(-S, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(S.shape[1]), S.shape).copy()
+
+    part_scores = np.take_along_axis(S, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+
+    return (
+        np.take_along_axis(part, order, axis=1),
+        np.take_along_axis(part_scores, order, axis=1),
+    )
+
+
+def blocked_cosine_similarity(
+    A,
+    B,
+    *,
+    top_k: Optional[int] = None,
+    block_size: int = 4096,
+    n_jobs: Optional[int] = None,
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Cosine similarity between the rows of A and the rows of B.
+
+    Both inputs are L2-normalized once, then A is processed in row blocks
+    of `block_size` over a thread pool; each block is a single sparse dot
+    product against the pre-transposed B.
+
+    Parameters
+    ----------
+    A : sparse matrix or ndarray, shape (n, d)
+    B : sparse matrix or ndarray, shape (m, d)
+    top_k : int, optional
+        If given, keep only the k most similar rows of B for each row of A.
+        Memory then stays O(n·k) instead of O(n·m).
+    block_size : int
+        Rows of A per block.
+    n_jobs : int, optional
+        Worker threads (defaults to os.cpu_count()).
+
+    Returns
+    -------
+    np.ndarray
+        Dense (n, m) similarity matrix, same as
+        sklearn.metrics.pairwise.cosine_similarity, when top_k is None.
+    Tuple[np.ndarray, np.ndarray]
+        (indices, scores), both (n, k) and sorted best first, when top_k
+        is given.
+    """
+
+    if A.shape[1] != B.shape[1]:
+        raise ValueError(
+            f"Incompatible dimensions: A has {A.shape[1]} columns, B has {B.shape[1]}."
+        )
+
+    n, m = A.shape[0], B.shape[0]
+
+    with span("similarity.cosine", rows=n, cols=m, top_k=top_k):
+        A_n = l2_normalize(A, norm="l2", copy=True)
+        B_t = l2_normalize(B, norm="l2", copy=True).T
+        if sp.issparse(A_n):
+            A_n = A_n.tocsr()
+        if sp.issparse(B_t):
+            B_t = B_t.tocsc()
+
+        def block_product(start: int, stop: int) -> np.ndarray:
+            S = A_n[start:stop] @ B_t
+            return S.toarray() if sp.issparse(S) else np.asarray(S)
+
+        blocks = list(_row_blocks(n, max(1, block_size)))
+        workers = max(1, min(n_jobs or os.cpu_count() or 1, len(blocks)))
+
+        if top_k is None:
+            out = np.empty((n, m), dtype=np.float64)
+
+            def fill(bounds):
+                start, stop = bounds
+                out[start:stop] = block_product(start, stop)
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(fill, blocks))
+            return out
+
+        k = max(0, min(int(top_k), m))
+        indices = np.empty((n, k), dtype=np.int64)
+        scores = np.empty((n, k), dtype=np.float64)
+
+        def fill_top_k(bounds):
+            start, stop = bounds
+            if k == 0:
+                return
+            idx, val = _top_k_block(block_product(start, stop), k)
+            indices[start:stop] = idx
+            scores[start:stop] = val
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(fill_top_k, blocks))
+        return indices, scores
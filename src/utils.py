@@ -1,10 +1,358 @@
 """
 Utility functions.
+
+- Config loading (load_config)
+- Zero-copy sharing of NumPy arrays with worker processes
+  (share_arrays / attach_arrays)
+- Stage instrumentation: nested timing spans with peak-RSS sampling, row
+  counts and bytes read/written, written out as a JSON trace (plus an
+  optional cProfile dump for one chosen stage)
+
+    from src.utils import span
+
+    with span("clean.students", rows=len(df)) as s:
+        ...
+        s.add(bytes_written=path.stat().st_size)
+
+Spans always measure wall time (s.duration); they are only recorded in
+the trace when instrumentation is enabled in the config:
+
+    instrumentation:
+      enabled: true
+      trace_path: outputs/trace.json
+      profile_stage: solve.hungarian      # optional
+      profile_path: outputs/profile.prof
 """
 
-import yaml
+import atexit
+import cProfile
+import itertools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:  # numpy is imported lazily to keep CLI startup fast
+    import numpy as np
+
+
+DEFAULT_CONFIG_PATH = "config/default.yaml"
 
 
 def load_config(path):
+    import yaml
+
     with open(path, "r") as f:
         return yaml.safe_load(f)
+
+
+# ------------------------------------------------------------
+# Instrumentation
+# ------------------------------------------------------------
+
+def current_rss_bytes() -> int:
+    """
+    Resident set size of this process (falls back to the lifetime peak).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """
+    Lifetime peak RSS of this process.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Span:
+    """
+    One timed stage. Counters accumulate via add().
+    """
+
+    __slots__ = (
+        "id", "parent", "name", "thread", "start", "duration",
+        "rows", "bytes_read", "bytes_written", "peak_rss", "attrs",
+    )
+
+    def __init__(self, id: int, parent: Optional[int], name: str, attrs: Dict[str, Any]):
+        self.id = id
+        self.parent = parent
+        self.name = name
+        self.thread = threading.get_ident()
+        self.start = 0.0
+        self.duration = 0.0
+        self.rows = attrs.pop("rows", None)
+        self.bytes_read = attrs.pop("bytes_read", 0)
+        self.bytes_written = attrs.pop("bytes_written", 0)
+        self.peak_rss = 0
+        self.attrs = attrs
+
+    def add(self, *, rows: Optional[int] = None, bytes_read: int = 0, bytes_written: int = 0, **attrs) -> None:
+        if rows is not None:
+            self.rows = (self.rows or 0) + int(rows)
+        self.bytes_read += int(bytes_read)
+        self.bytes_written += int(bytes_written)
+        self.attrs.update(attrs)
+
+    def to_dict(self, t0: float) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "parent": self.parent,
+            "name": self.name,
+            "thread": self.thread,
+            "start_s": round(self.start - t0, 6),
+            "duration_s": round(self.duration, 6),
+            "rows": self.rows,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "peak_rss_mb": round(self.peak_rss / 2**20, 2),
+            "attrs": self.attrs,
+        }
+
+
+class Tracer:
+    """
+    Collects spans for one run. Disabled tracers only time spans.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        trace_path: Optional[str] = None,
+        profile_stage: Optional[str] = None,
+        profile_path: Optional[str] = None,
+        sample_interval: float = 0.05,
+    ):
+        self.enabled = enabled
+        self.trace_path = Path(trace_path) if trace_path else None
+        self.profile_stage = profile_stage
+        self.profile_path = Path(profile_path) if profile_path else None
+        self.sample_interval = sample_interval
+
+        self.t0 = time.perf_counter()
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._open: Dict[int, Span] = {}
+        self._lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        if enabled:
+            self._start_sampler()
+
+    # --- RSS sampling ---
+    def _start_sampler(self) -> None:
+        def run():
+            while not self._stop.wait(self.sample_interval):
+                self._sample()
+
+        self._sampler = threading.Thread(target=run, name="rss-sampler", daemon=True)
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        rss = current_rss_bytes()
+        with self._lock:
+            for s in self._open.values():
+                if rss > s.peak_rss:
+                    s.peak_rss = rss
+
+    # --- spans ---
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        stack = self._stack()
+        s = Span(next(self._ids), stack[-1].id if stack else None, name, attrs)
+
+        profiler = None
+        if self.enabled:
+            s.peak_rss = current_rss_bytes()
+            with self._lock:
+                self._open[s.id] = s
+            if name == self.profile_stage:
+                profiler = cProfile.Profile()
+                profiler.enable()
+
+        stack.append(s)
+        s.start = time.perf_counter()
+        try:
+            yield s
+        finally:
+            s.duration = time.perf_counter() - s.start
+            stack.pop()
+
+            if self.enabled:
+                if profiler is not None:
+                    profiler.disable()
+                    self._dump_profile(profiler)
+                self._sample()
+                with self._lock:
+                    self._open.pop(s.id, None)
+                    self.spans.append(s)
+
+    def _dump_profile(self, profiler: cProfile.Profile) -> None:
+        path = self.profile_path or Path("outputs") / f"profile_{self.profile_stage}.prof"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+
+    # --- output ---
+    def trace(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return {
+            "meta": {
+                "pid": os.getpid(),
+                "argv": sys.argv,
+                "wall_s": round(time.perf_counter() - self.t0, 6),
+                "peak_rss_mb": round(peak_rss_bytes() / 2**20, 2),
+                "profile_stage": self.profile_stage,
+            },
+            "spans": [s.to_dict(self.t0) for s in spans],
+        }
+
+    def write(self, path: Optional[Path] = None) -> Optional[Path]:
+        path = Path(path) if path else self.trace_path
+        if not self.enabled or path is None:
+            return None
+        self._stop.set()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.trace(), indent=2, default=str))
+        return path
+
+
+_TRACER: Optional[Tracer] = None
+
+
+def configure_instrumentation(cfg: Optional[Dict[str, Any]]) -> Tracer:
+    """
+    Install the process-wide tracer from the `instrumentation` config
+    section. The trace is written when the process exits.
+    """
+    global _TRACER
+
+    section = (cfg or {}).get("instrumentation") or {}
+    if _TRACER is not None and _TRACER.enabled:
+        _TRACER.write()
+        _TRACER._stop.set()
+
+    _TRACER = Tracer(
+        enabled=bool(section.get("enabled", False)),
+        trace_path=section.get("trace_path", "outputs/trace.json"),
+        profile_stage=section.get("profile_stage"),
+        profile_path=section.get("profile_path"),
+        sample_interval=float(section.get("sample_interval_s", 0.05)),
+    )
+    if _TRACER.enabled:
+        atexit.register(_TRACER.write)
+    return _TRACER
+
+
+def get_tracer() -> Tracer:
+    """
+    The process-wide tracer. On first use it is configured from the file
+    named by $MENTOR_CONFIG (default config/default.yaml) if present, so
+    scripts are traced without code changes.
+    """
+    if _TRACER is None:
+        path = os.environ.get("MENTOR_CONFIG", DEFAULT_CONFIG_PATH)
+        cfg = load_config(path) if Path(path).exists() else None
+        configure_instrumentation(cfg)
+    return _TRACER
+
+
+def span(name: str, **attrs):
+    """
+    Context manager timing a named stage on the process-wide tracer.
+    """
+    return get_tracer().span(name, **attrs)
+
+
+def file_size(path) -> int:
+    """
+    Size of a file in bytes (0 if missing), for bytes_read/bytes_written.
+    """
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return 0
+
+
+# ------------------------------------------------------------
+# Shared memory
+# ------------------------------------------------------------
+
+# name → (shared memory block name, shape, dtype)
+ArraySpec = Dict[str, Tuple[str, Tuple[int, ...], str]]
+
+
+@contextmanager
+def share_arrays(arrays: Dict[str, "np.ndarray"]) -> Iterator[ArraySpec]:
+    """
+    Copy arrays into shared memory once; yields a picklable spec that
+    worker processes pass to attach_arrays. Blocks are freed on exit.
+    """
+    from multiprocessing import shared_memory
+
+    import numpy as np
+
+    blocks = []
+    spec: ArraySpec = {}
+    try:
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            blocks.append(shm)
+            np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[...] = arr
+            spec[name] = (shm.name, arr.shape, arr.dtype.str)
+        yield spec
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+
+_ATTACHED: Dict[str, Any] = {}
+
+
+def attach_arrays(spec: ArraySpec) -> Dict[str, "np.ndarray"]:
+    """
+    Read-only views of arrays published by share_arrays. Handles are kept
+    open for the life of the (worker) process.
+    """
+    from multiprocessing import shared_memory
+
+    import numpy as np
+
+    out = {}
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = _ATTACHED.get(shm_name)
+        if shm is None:
+            # Pool workers share the parent's resource tracker, so the
+            # block is still unlinked exactly once (by share_arrays).
+            shm = shared_memory.SharedMemory(name=shm_name)
+            _ATTACHED[shm_name] = shm
+        view = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+        view.flags.writeable = False
+        out[name] = view
+    return out
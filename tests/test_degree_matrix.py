@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+from bs4 import BeautifulSoup
+
+from src.analyze.degree_matrix import build_degree_course_matrix
+from src.ingest.utsa_undergraduate_crawler import scrape_course_inventory
+
+BASE = "https://catalog.utsa.edu/undergraduate/business"
+INVENTORY = {
+    f"{BASE}/accounting/#courseinventory": ["ACC 2013. Principles I.", "ACC 3023. Auditing."],
+    f"{BASE}/finance/#courseinventory": ["FIN 3014. Managerial Finance.", "ACC 2013. Principles I."],
+}
+
+
+class _Page:
+    def __init__(self, titles):
+        self.html = "".join(
+            f'<div class="courseblock"><p class="courseblocktitle">{t}</p>'
+            f'<p class="courseblockdesc">About {t}</p></div>'
+            for t in titles
+        )
+
+    def raise_for_status(self):
+        pass
+
+    def soup(self):
+        return BeautifulSoup(self.html, "html.parser")
+
+
+class _Frontier:
+    def page(self, url):
+        return _Page(INVENTORY[url])
+
+
+def test_sibling_department_pages_are_separate_degrees():
+    records = pd.DataFrame([
+        r for url in INVENTORY for r in scrape_course_inventory(url, _Frontier())
+    ])
+    assert sorted(records["program"].unique()) == ["accounting", "finance"]
+
+    m = build_degree_course_matrix(records)
+    assert list(m.degrees) == ["accounting", "finance"]
+    assert m.shape == (2, 3)
+
+
+def test_degree_labels_map_programs():
+    records = pd.DataFrame([
+        r for url in INVENTORY for r in scrape_course_inventory(url, _Frontier())
+    ])
+    m = build_degree_course_matrix(records, degree_labels={"accounting": "i01"})
+    assert list(m.degrees) == ["finance", "i01"]
+
+
+def test_pages_collapsing_to_one_degree_are_rejected():
+    records = pd.DataFrame({
+        "program": ["business", "business"],
+        "source_url": list(INVENTORY),
+        "title": ["ACC 2013. Principles I.", "FIN 3014. Managerial Finance."],
+    })
+    with pytest.raises(ValueError, match="collapse"):
+        build_degree_course_matrix(records)
@@ -0,0 +1,12 @@
+import pandas as pd
+
+from src.clean.entity_resolution import EntityResolver, code_aliases
+
+
+def test_code_aliases_keep_names_and_pad_codes():
+    values = ["Business Analytics", "B.B.A. Finance", "I12", "i1_", "i01", "Business_Analytics"]
+    resolver = EntityResolver(code_aliases(values), min_fuzzy_length=10**6)
+    labels = resolver.resolve(pd.Series(values))["label"]
+    assert list(labels) == [
+        "Business Analytics", "B.B.A. Finance", "I12", "i01", "i01", "Business Analytics",
+    ]
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from src.service import align_degrees
+
+DICTIONARY = pd.DataFrame({
+    "Kᵢ": [1, 2, 4],
+    "Full_Name": ["B.B.A. Degree in Accounting", "B.A. Degree in Economics", "B.B.A. Degree in Finance"],
+    "Short_Name": ["Accounting", "BA Economics", "Finance"],
+})
+VOCAB = pd.Index(["i01", "i02", "i04"])
+
+
+def test_codebook_labels_are_kept():
+    assert list(align_degrees(["i01", "i04"], VOCAB, DICTIONARY)) == ["i01", "i04"]
+
+
+def test_program_slugs_resolve_to_codebook_labels():
+    aligned = align_degrees(["accounting", "finance", "zoology"], VOCAB, DICTIONARY)
+    assert list(aligned) == ["i01", "i04", "zoology"]
+
+
+def test_label_already_held_is_not_duplicated():
+    aligned = align_degrees(["i04", "finance"], VOCAB, DICTIONARY)
+    assert list(aligned) == ["i04", "finance"]